@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+'''
+Times building the PhotoImage data for bitmap previews in memory the way
+PhotoImageHandler does, against having arbytmap save each sub-bitmap and
+mip level to a temp png and reading it back, like the previews used to.
+Tk decoding the data into a PhotoImage isn't included.
+
+If PIL is installed, the images are also checked to be pixel for pixel
+the same as arbytmap's pngs for each format and channel mode.
+
+Needs no display. Run from a checkout with:
+    python benchmarks/bench_bitmap_preview.py [size ...]
+'''
+import array
+import io
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from binilla.widgets import bitmap_display_frame
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+if not bitmap_display_frame.import_arbytmap():
+    sys.exit("arbytmap is required to run this benchmark.")
+
+ab = bitmap_display_frame.arbytmap
+
+
+def make_texture(fmt, width, height, sub_bitmap_count, mipmap_count,
+                 seed=1):
+    rand = random.Random(seed)
+    typecode, bits = {
+        ab.FORMAT_A8R8G8B8: ("I", 32), ab.FORMAT_X8R8G8B8: ("I", 32),
+        ab.FORMAT_A8L8: ("H", 16)}.get(fmt, ("B", 8))
+
+    blocks = []
+    for m in range(mipmap_count + 1):
+        pixel_count = max(width >> m, 1) * max(height >> m, 1)
+        for b in range(sub_bitmap_count):
+            blocks.append(array.array(
+                typecode, (rand.getrandbits(bits)
+                           for _ in range(pixel_count))))
+
+    tex_info = dict(
+        width=width, height=height, depth=1, format=fmt,
+        texture_type=ab.TYPE_CUBEMAP, mipmap_count=mipmap_count,
+        sub_bitmap_count=sub_bitmap_count, packed=True)
+    return blocks, tex_info
+
+
+def save_temp_pngs(handler, temp_dir):
+    return handler.arby.save_to_file(
+        bitmap_indexes="all", mip_levels="all",
+        keep_alpha=handler.channels.get("A"),
+        channel_mapping=handler.channel_mapping, intensity_to_rgb=True,
+        swizzle_mode=False, tile_mode=False, ext="png",
+        output_path=os.path.join(temp_dir, "preview"),
+        png_compress_level=0)
+
+
+def check_format(fmt, channel_mode, temp_dir, sub_bitmap_count=6):
+    blocks, tex_info = make_texture(fmt, 32, 16, sub_bitmap_count, 2)
+    handler = bitmap_display_frame.PhotoImageHandler(blocks, tex_info)
+    handler.set_channel_mode(channel_mode)
+    image_data = handler.make_photoimage_data()
+
+    # arbytmap names the files mip level major, sub-bitmap minor
+    filepaths = iter(save_temp_pngs(handler, temp_dir))
+    for m in range(tex_info["mipmap_count"] + 1):
+        for b in range(sub_bitmap_count):
+            ref = Image.open(next(filepaths))
+            ext, data = image_data[(b, m)]
+            img = Image.open(io.BytesIO(data))
+            if ref.mode == "LA":
+                # tk can't display LA pngs, so they're made as RGBA
+                ref = ref.convert("RGBA")
+
+            assert ref.size == img.size, (ref.size, img.size)
+            assert ref.convert(img.mode).tobytes() == img.tobytes(), (
+                fmt, channel_mode, b, m)
+
+
+def time_cubemap(size, channel_mode, temp_dir):
+    blocks, tex_info = make_texture(ab.FORMAT_A8R8G8B8, size, size, 6, 0)
+    handler = bitmap_display_frame.PhotoImageHandler(blocks, tex_info)
+    handler.set_channel_mode(channel_mode)
+
+    start = time.perf_counter()
+    for filepath in save_temp_pngs(handler, temp_dir):
+        with open(filepath, "rb") as f:
+            f.read()
+        os.remove(filepath)
+    temp_png_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    handler.make_photoimage_data()
+    in_memory_time = time.perf_counter() - start
+
+    print("%4dx%-4d cubemap, channel mode %d: "
+          "temp png %.3fs  in memory %.3fs" %
+          (size, size, channel_mode, temp_png_time, in_memory_time))
+
+
+def main(sizes=(512, 1024)):
+    temp_dir = tempfile.mkdtemp()
+    try:
+        if Image is None:
+            print("PIL isn't installed. Skipping the pixel comparison.")
+        else:
+            for fmt in (ab.FORMAT_A8R8G8B8, ab.FORMAT_X8R8G8B8,
+                        ab.FORMAT_A8L8, ab.FORMAT_L8, ab.FORMAT_A8):
+                for channel_mode in range(6):
+                    check_format(fmt, channel_mode, temp_dir)
+            print("Images match arbytmap's pngs in every format and mode.")
+
+        for size in sizes:
+            for channel_mode in (0, 2):
+                time_cubemap(size, channel_mode, temp_dir)
+    finally:
+        shutil.rmtree(temp_dir, True)
+
+
+if __name__ == "__main__":
+    main(*([[int(arg) for arg in sys.argv[1:]]] if sys.argv[1:] else []))
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+'''
+Times planning the FieldWidgets for every element of a large array of a
+repeated struct with LayoutPlan, which is what a TagWindow does before it
+builds widgets, with the DescMetadata cache on and off. With the cache off,
+every lookup derives the metadata from its descriptor again, like the
+FieldWidgets did before it was added.
+
+Only this pure python part of building the widgets is measured. Building
+the tkinter widgets themselves needs a display, and takes far longer than
+either, so this shows what the cache saves rather than how much faster
+populating a ContainerFrame or ArrayFrame becomes.
+
+Needs no display. Run from a checkout with:
+    python benchmarks/bench_desc_metadata.py [element_count]
+'''
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from supyr_struct.defs.block_def import BlockDef
+from supyr_struct.field_types import Struct, Array, UInt32, UEnum16, Bool32
+
+from binilla import constants
+from binilla.desc_metadata import DescMetadata, clear_desc_metadata
+from binilla.widgets.field_widget_picker import def_widget_picker
+from binilla.widgets.field_widgets import layout_plan
+
+
+def get_visible(visibility_level):
+    return (visibility_level is None or
+            visibility_level >= constants.VISIBILITY_SHOWN)
+
+
+def make_block(element_count):
+    elem = Struct("elem",
+        *(UInt32("field_%d" % i, GUI_NAME="field %d" % i, TOOLTIP="tip")
+          for i in range(12)),
+        UEnum16("kind", *("opt_%d" % i for i in range(24))),
+        Bool32("flags", *("flag_%d" % i for i in range(20))),
+        )
+    block = BlockDef("bench",
+        UInt32("element_count"),
+        Array("array", SIZE=".element_count", SUB_STRUCT=elem),
+        ).build()
+    block.array.extend(element_count)
+    return block
+
+
+def plan_elements(nodes):
+    plans = []
+    for node in nodes:
+        plan = layout_plan.LayoutPlan(get_visible, def_widget_picker)
+        plans.append(plan.plan(node).get_field_indices(node))
+    return plans
+
+
+def main(element_count=500, number=5, repeat=5):
+    nodes = list(make_block(element_count).array)
+    cached_get_desc_metadata = layout_plan.get_desc_metadata
+
+    results = {}
+    for name, get_desc_metadata in (("uncached", DescMetadata),
+                                    ("cached", cached_get_desc_metadata)):
+        clear_desc_metadata()
+        layout_plan.get_desc_metadata = get_desc_metadata
+        try:
+            results[name] = plan_elements(nodes)
+            t = min(timeit.repeat(lambda: plan_elements(nodes),
+                                  number=number, repeat=repeat)) / number
+        finally:
+            layout_plan.get_desc_metadata = cached_get_desc_metadata
+
+        print("%-8s %8.2f ms to plan %d elements (%.1f us each)" %
+              (name, t*1000, element_count, t*1e6 / element_count))
+
+    assert results["cached"] == results["uncached"]
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+'''
+Times escaping and unescaping the control characters in a large string
+the way TextFrame does, comparing the single pass TextEscaper against
+calling str.replace once for each character in the replace map.
+
+Needs no display. Run from a checkout with:
+    python benchmarks/bench_text_escape.py [size_in_mib]
+'''
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from supyr_struct.field_types import StrUtf8, StrUtf16
+
+from binilla.widgets.field_widgets.text_frame import get_text_escaper,\
+     make_replace_map
+
+
+def make_text(size_in_mib, seed=1):
+    rand = random.Random(seed)
+    chunk = "".join(
+        rand.choice("abcdefgh ij\n\t\x00\x01\x1f\x10\x07")
+        if rand.random() < 0.05 else "a" for _ in range(1 << 16))
+    return chunk * max(1, int(size_in_mib * 16))
+
+
+def main(size_in_mib=4, repeat=5):
+    text = make_text(size_in_mib)
+    for field_type in (StrUtf8, StrUtf16):
+        desc = {'TYPE': field_type, 'NAME': 'text'}
+        replace_map = make_replace_map(desc)
+        escaper = get_text_escaper(desc)
+
+        def replace_escape(string):
+            for b in sorted(replace_map):
+                string = string.replace(b, replace_map[b])
+            return string
+
+        def replace_unescape(string):
+            for b in sorted(replace_map):
+                string = string.replace(replace_map[b], b)
+            return string
+
+        escaped = escaper.escape(text)
+        assert escaped == replace_escape(text)
+        assert escaper.unescape(escaped) == replace_unescape(escaped) == text
+
+        for name, func, arg in (
+                ("str.replace escape",   replace_escape,   text),
+                ("TextEscaper escape",   escaper.escape,   text),
+                ("str.replace unescape", replace_unescape, escaped),
+                ("TextEscaper unescape", escaper.unescape, escaped)):
+            t = min(timeit.repeat(lambda: func(arg), number=1, repeat=repeat))
+            print("%-8s %5.1f MiB %-21s %8.1f ms" % (
+                field_type.name, len(arg) / 2**20, name, t*1000))
+
+
+if __name__ == "__main__":
+    main(*(float(arg) for arg in sys.argv[1:2]))
@@ -8,7 +8,9 @@
 __website__ = "https://github.com/Sigmmma/binilla"
 __all__ = (
     'defs', 'widgets', 'windows',
-    'app_window', 'constants', 'edit_manager', 'editor_constants', 'handler',
+    'app_window', 'constants', 'desc_metadata', 'dyn_name_path',
+    'edit_manager',
+    'editor_constants', 'handler',
     )
 
 from binilla import constants
@@ -26,8 +26,11 @@
 from binilla import editor_constants as e_c
 from binilla.widgets.field_widget_picker import WidgetPicker
 from binilla.widgets.binilla_widget import BinillaWidget
+from binilla.widgets.bitmap_cache import bitmap_cache, bitmap_disk_cache
+from binilla.widgets.field_widgets import FieldWidget
 from binilla.widgets.tooltip_handler import ToolTipHandler
 from binilla.handler import Handler
+from binilla.tag_printer import TagPrinter
 from binilla.util import IORedirecter, is_path_empty
 from binilla.windows.about_window import AboutWindow
 from binilla.windows.def_selector_window import DefSelectorWindow
@@ -104,6 +107,10 @@ class Binilla(tk.Tk, BinillaWidget):
     tag_windows = None
     # map of the id of each tag to the id of the window displaying it
     tag_id_to_window_id = None
+    # dict of closed TagWindow instances being held onto to display other
+    # tags with. keys are the def_id of the tag each window last displayed
+    recycled_tag_windows = None
+    max_recycled_tag_windows = e_c.MAX_RECYCLED_TAG_WINDOWS
 
     '''Directories/filepaths'''
     curr_dir = this_curr_dir
@@ -196,7 +203,13 @@ class Binilla(tk.Tk, BinillaWidget):
     scroll_increment_x = 50
     scroll_increment_y = 50
 
+    console_max_lines = e_c.IO_MAX_LINES
+    bitmap_cache_size = e_c.BITMAP_CACHE_SIZE  # in megabytes
+    bitmap_disk_cache_size = e_c.BITMAP_DISK_CACHE_SIZE  # in megabytes
+
     terminal_out = None
+    # the TagPrinter printing a tag a little at a time while idle
+    tag_printer = None
 
     sync_window_movement = True  # Whether or not to sync the movement of
     #                              the TagWindow instances with the app.
@@ -219,6 +232,7 @@ def __init__(self, *args, **kwargs):
         self.debug = kwargs.pop('debug', self.debug)
         self.tag_windows = {}
         self.tag_id_to_window_id = {}
+        self.recycled_tag_windows = {}
 
         if 'handler' in kwargs:
             self.handler = kwargs.pop('handler')
@@ -370,8 +384,14 @@ def __init__(self, *args, **kwargs):
             label="Reset style", command=self.reset_style)
 
         self.debug_menu.add_command(label="Print tag", command=self.print_tag)
+        self.debug_menu.add_command(label="Print tag to file",
+                                    command=self.print_tag_to_file)
+        self.debug_menu.add_command(label="Print focused node",
+                                    command=self.print_focused_node)
         self.debug_menu.add_command(label="Clear console",
                                     command=self.clear_console)
+        self.debug_menu.add_command(label="Print bitmap cache stats",
+                                    command=self.print_bitmap_cache_stats)
         self.debug_menu.add_separator()
         self.debug_menu.add_command(
             label="Force big endian", command=self.force_big_endian)
@@ -549,7 +569,8 @@ def make_io_text(self, master=None):
             edit_log, disable = True, False
 
         self.terminal_out = IORedirecter(self.io_text, edit_log=edit_log,
-                                         log_file=self.log_file)
+                                         log_file=self.log_file,
+                                         max_lines=self.console_max_lines)
         sys.stdout = self.orig_stdout if disable else self.terminal_out
 
     def bind_hotkeys(self, new_hotkeys=None):
@@ -704,6 +725,8 @@ def exit(self, e=None):
             except Exception:
                 pass
 
+        self.clear_recycled_tag_windows()
+
         try:
             # need to save before destroying the
             # windows or bindings wont be saved
@@ -902,6 +925,10 @@ def apply_config(self, e=None):
             except Exception:
                 print(format_exc())
 
+        # the widget settings may have changed, so the
+        # closed windows can't be reused as they are.
+        self.clear_recycled_tag_windows()
+
         self.handler.tagsdir = dir_paths.tags_dir.path
         self.handler.backup_dir_basename = config_data.tag_backup.folder_basename
 
@@ -931,6 +958,19 @@ def apply_config(self, e=None):
                 else:
                     self.terminal_out.log_file = None
 
+        if self.terminal_out is not None:
+            self.terminal_out.max_lines = self.console_max_lines
+
+        bitmap_cache.set_max_size(
+            (self.bitmap_cache_size or e_c.BITMAP_CACHE_SIZE) << 20)
+        bitmap_disk_cache.set_max_size(
+            (self.bitmap_disk_cache_size or e_c.BITMAP_DISK_CACHE_SIZE) << 20)
+        if app_window.flags.disable_bitmap_disk_cache:
+            bitmap_disk_cache.set_directory(None)
+        else:
+            bitmap_disk_cache.set_directory(
+                self.config_path.parent.joinpath("bitmap_cache"))
+
         self.load_style(style_file=self.config_file)
 
     def load_config(self, filepath=None):
@@ -1068,6 +1108,7 @@ def load_style(self, filepath=None, style_file=None):
         except Exception:
             pass
 
+        self.invalidate_style()
         if self._initialized:
             self.update_config()
             self.apply_style()
@@ -1295,9 +1336,23 @@ def make_tag_window(self, tag, *, focus=True, window_cls=None,
             self.curr_step_y = self.curr_step_x = 0
         if window_cls is None:
             window_cls = self.def_tag_window_cls
-        window = window_cls(
-            self, tag, app_root=self, handler=self.handler,
-            is_new_tag=is_new_tag, widget_picker=self.widget_picker)
+
+        # try to reuse a closed window that displayed the same kind of tag
+        window = self.recycled_tag_windows.pop(tag.def_id, None)
+        if window is not None:
+            try:
+                if type(window) is not window_cls:
+                    raise TypeError("Recycled window is the wrong type.")
+                window.load_tag(tag, app_root=self, is_new_tag=is_new_tag)
+            except Exception:
+                print(format_exc())
+                tk.Toplevel.destroy(window)
+                window = None
+
+        if window is None:
+            window = window_cls(
+                self, tag, app_root=self, handler=self.handler,
+                is_new_tag=is_new_tag, widget_picker=self.widget_picker)
         window.update()  # make sure the window gets a chance to update its size
 
         # reposition the window
@@ -1331,6 +1386,38 @@ def make_tag_window(self, tag, *, focus=True, window_cls=None,
 
         return window
 
+    def recycle_tag_window(self, window):
+        '''
+        Unloads the tag from the closing TagWindow and holds onto the window
+        so the next tag opened with the same definition can be displayed in
+        it without rebuilding all of its widgets. Returns True if the window
+        was recycled, or False if it should be destroyed instead.
+        '''
+        try:
+            def_id = window.tag_def.def_id
+            if (type(window) is not self.def_tag_window_cls or
+                def_id in self.recycled_tag_windows or
+                len(self.recycled_tag_windows) >= self.max_recycled_tag_windows):
+                return False
+
+            window.unload_tag()
+        except Exception:
+            print(format_exc())
+            return False
+
+        self.recycled_tag_windows[def_id] = window
+        return True
+
+    def clear_recycled_tag_windows(self):
+        '''Destroys all TagWindows being held onto for reuse.'''
+        windows = self.recycled_tag_windows
+        self.recycled_tag_windows = {}
+        for w in windows.values():
+            try:
+                tk.Toplevel.destroy(w)
+            except Exception:
+                print(format_exc())
+
     def minimize_all(self, e=None):
         '''Minimizes all open TagWindows.'''
         windows = self.tag_windows
@@ -1366,44 +1453,128 @@ def save_as(self, e=None):
 
     def print_tag(self, e=None):
         '''Prints the currently selected tag to the console.'''
+        if self.selected_tag is not None:
+            self.print_node(self.selected_tag)
+
+    def print_bitmap_cache_stats(self, e=None):
+        '''Prints how full the bitmap preview caches are, and their hit rates.'''
+        print(bitmap_cache.get_stats_string())
+        print(bitmap_disk_cache.get_stats_string())
+
+    def print_tag_to_file(self, e=None):
+        '''Prints the currently selected tag to a text file.'''
+        tag = self.selected_tag
+        if tag is None:
+            return
+
+        filepath = asksaveasfilename(
+            initialdir=self.last_load_dir, defaultextension=".txt",
+            title="Print tag to...", filetypes=[
+                ("text", "*.txt"), ('All', '*')])
+
+        filepath = Path(filepath)
+        if is_path_empty(filepath):
+            return
+
         try:
-            if self.selected_tag is None:
-                return
+            out = filepath.open('w', encoding='utf-8', errors='replace')
+        except Exception:
+            print(format_exc())
+            print("Could not open '%s' to print to." % filepath)
+            return
 
-            precision = indent = None
-            try:
-                show = set()
-                app_window = self.config_file.data.app_window
-                tag_printing = self.config_file.data.tag_printing
-                precision = tag_printing.print_precision
-                indent = tag_printing.print_indent
+        self.print_node(tag, out)
 
-                for name in tag_printing.block_print.NAME_MAP:
-                    if tag_printing.block_print.get(name):
-                        show.add(name.split('show_')[-1])
+    def print_focused_node(self, e=None):
+        '''
+        Prints the node displayed by the field widget that has focus(or
+        the closest one above it displaying a block) to the console.
+        '''
+        try:
+            widget = self.focus_get()
+        except Exception:
+            widget = None
 
-                if not app_window.flags.log_tag_print:
-                    self.terminal_out.edit_log = False
-            except Exception:
-                show = s_c.MOST_SHOW
+        while widget is not None:
+            if (isinstance(widget, FieldWidget) and
+                    hasattr(widget.node, "desc")):
+                break
+            widget = getattr(widget, "f_widget_parent", None) or widget.master
+
+        if widget is None:
+            print("No field is focused to print.")
+            return
 
-            tag_str = self.selected_tag.pprint(
-                show=show, precision=precision, indent=indent)
+        self.print_node(widget.node)
 
+    def get_tag_print_kwargs(self):
+        '''Returns the keyword arguments to print tags with.'''
+        try:
+            show = set()
+            tag_printing = self.config_file.data.tag_printing
+            for name in tag_printing.block_print.NAME_MAP:
+                if tag_printing.block_print.get(name):
+                    show.add(name.split('show_')[-1])
+
+            return dict(show=show, precision=tag_printing.print_precision,
+                        indent=tag_printing.print_indent)
+        except Exception:
+            return dict(show=s_c.MOST_SHOW)
+
+    def print_node(self, node, out=None):
+        '''
+        Prints the tag or node to out(or the console if None) a little at a
+        time while the ui is idle. Cancels any printing still in progress.
+        '''
+        self.cancel_tag_print()
+        if out is None:
+            out = sys.stdout
             try:
-                self.terminal_out.edit_log = bool(app_window.flags.log_output)
+                if not self.config_file.data.app_window.flags.log_tag_print:
+                    self.terminal_out.edit_log = False
             except Exception:
                 pass
 
-            # print the string line by line
-            for line in tag_str.split('\n'):
-                try:
-                    print(line)
-                except Exception:
-                    print(' '*(len(line)-len(line.lstrip(' ')))+s_c.UNPRINTABLE)
-                self.io_text.update()
+        self.tag_printer = TagPrinter(node, out, **self.get_tag_print_kwargs())
+        self.after_idle(self._print_node_batch)
+
+    def _print_node_batch(self):
+        printer = self.tag_printer
+        if printer is None:
+            return
+
+        try:
+            done = printer.print_batch(e_c.TAG_PRINT_TIME_BUDGET)
         except Exception:
             print(format_exc())
+            done = True
+
+        if done:
+            self.finish_tag_print()
+        else:
+            self.after_idle(self._print_node_batch)
+
+    def cancel_tag_print(self):
+        if self.tag_printer is not None:
+            self.tag_printer.cancel()
+            self.finish_tag_print()
+
+    def finish_tag_print(self):
+        printer, self.tag_printer = self.tag_printer, None
+        if printer is None:
+            return
+
+        try:
+            self.terminal_out.edit_log = bool(
+                self.config_file.data.app_window.flags.log_output)
+        except Exception:
+            pass
+
+        if printer.out is not sys.stdout and hasattr(printer.out, "close"):
+            try:
+                printer.out.close()
+            except Exception:
+                print(format_exc())
 
     def restore_all(self, e=None):
         '''Restores all open TagWindows to being visible.'''
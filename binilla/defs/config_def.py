@@ -63,6 +63,8 @@
     {NAME: "debug_mode",    TOOLTIP: ttip.main_window_debug_mode},
     {NAME: "disable_io_redirect", TOOLTIP: ttip.main_window_disable_io_redirect,
      VISIBLE: VISIBILITY_HIDDEN},
+    {NAME: "disable_bitmap_disk_cache",
+     TOOLTIP: ttip.main_window_disable_bitmap_disk_cache},
 
     DEFAULT=sum([1<<i for i in (1, 2)])
     )
@@ -107,6 +109,9 @@
     {NAME: "scroll_unselected", TOOLTIP: ttip.field_widget_scroll_unselected}, # RENAMED
     {NAME: "evaluate_entry_fields", TOOLTIP: ttip.field_widget_evaluate_entry_fields},
     {NAME: "show_structure_meta", TOOLTIP: ttip.field_widget_show_structure_meta},
+    {NAME: "virtualize_widgets", TOOLTIP: ttip.field_widget_virtualize_widgets},
+    {NAME: "show_arrays_as_tables", TOOLTIP: ttip.field_widget_show_arrays_as_tables},
+    {NAME: "preview_large_text", TOOLTIP: ttip.field_widget_preview_large_text},
     DEFAULT=(
         # These are the indices of the flags we want on in the default config
         # setup. By left shifting 1 by the indices and summing the results we
@@ -148,8 +153,16 @@
     main_window_flags,
     UInt16("recent_tag_max", DEFAULT=20,
         TOOLTIP=ttip.app_window_recent_tag_max),
-
-    Pad(32 - 4*1 - 2*1),
+    UInt16("console_max_lines", DEFAULT=10000,
+        TOOLTIP=ttip.app_window_console_max_lines),
+    UInt16("bitmap_cache_size", DEFAULT=256,
+        TOOLTIP=ttip.app_window_bitmap_cache_size,
+        GUI_NAME="bitmap preview cache size(MB)"),
+    UInt16("bitmap_disk_cache_size", DEFAULT=512,
+        TOOLTIP=ttip.app_window_bitmap_disk_cache_size,
+        GUI_NAME="bitmap preview disk cache size(MB)"),
+
+    Pad(32 - 4*1 - 2*4),
 
     UInt16("app_width", DEFAULT=640, VISIBLE=VISIBILITY_HIDDEN),
     UInt16("app_height", DEFAULT=480, VISIBLE=VISIBILITY_HIDDEN),
@@ -12,6 +12,10 @@
     "Whether to be in debug mode or not.\nDoesnt do much right now.")
 main_window_disable_io_redirect = (
     "Whether to disable redirecting sys.stdout to the io text frame.")
+main_window_disable_bitmap_disk_cache = (
+    "Whether to disable saving decoded bitmap previews to disk.\n"
+    "When enabled, reopening a bitmap shows its preview without\n"
+    "decoding it again.")
 
 
 # file handling
@@ -67,9 +71,34 @@
     "Whether to evaluate the contents of a number entry field, rather\n"
     "than directly converting it to a float. Allows user to type in\n"
     "simple functions for a number, such as '(log10(50) + 1) / 2'")
+field_widget_virtualize_widgets = (
+    "Whether to only build the widgets that are scrolled into view in a tag\n"
+    "window, rather than every widget in the tag. Makes opening huge tags\n"
+    "much faster, but widgets will be built and destroyed while scrolling.")
+field_widget_show_arrays_as_tables = (
+    "Whether to display arrays of simple structs as a table of every\n"
+    "element, rather than displaying one element at a time. Cells are\n"
+    "edited by double clicking them. Ctrl+Enter applies the value\n"
+    "to that column of every selected row as a single undo.")
+field_widget_preview_large_text = (
+    "Whether to only display a read-only preview of the start of very\n"
+    "large text fields, rather than loading all of the text. The full\n"
+    "text can be loaded for editing with the button under the preview.")
 
 # main window
 app_window_recent_tag_max = "Max number of files in the 'recent' menu."
+app_window_console_max_lines = (
+    "Max number of lines of output to keep in the console.\n"
+    "Older lines are deleted as new ones are printed.\n"
+    "0 uses the default of 10000.")
+app_window_bitmap_cache_size = (
+    "Max number of megabytes of decoded bitmap previews to keep cached.\n"
+    "The least recently displayed previews are removed past this.\n"
+    "0 uses the default of 256.")
+app_window_bitmap_disk_cache_size = (
+    "Max number of megabytes of decoded bitmap previews to save on disk.\n"
+    "The least recently displayed previews are deleted past this.\n"
+    "0 uses the default of 512.")
 app_window_window_menu_max_len = (
     "Max number of entries to display in the 'windows' menu.\n"
     "After this, a 'window manager' button will be added.")
@@ -162,4 +162,6 @@
     {GUI_NAME: "apply config", NAME: "apply_config"},
     {GUI_NAME: "exit program", NAME: "exit"},
     {GUI_NAME: "clear console", NAME: "clear_console"},
+    {GUI_NAME: "print tag to file", NAME: "print_tag_to_file"},
+    {GUI_NAME: "print focused node", NAME: "print_focused_node"},
     )
@@ -0,0 +1,177 @@
+'''
+FieldWidgets derive a lot of layout information from their descriptors,
+such as their names, how many fields they contain, and which of those
+fields can be shown. This information is the same for every node sharing
+a descriptor, so this module computes it once per descriptor and caches
+it for every FieldWidget that displays a node with that descriptor.
+'''
+import math
+
+from binilla import editor_constants as e_c
+
+__all__ = ("DescMetadata", "get_desc_metadata", "clear_desc_metadata", )
+
+# metadata keyed by id(desc). each DescMetadata holds onto
+# the desc it was compiled for, so the id can't be reused.
+_desc_metadata = {}
+
+
+class DescMetadata:
+    '''
+    The layout information of a descriptor that FieldWidgets read rather
+    than rederiving it from the descriptor every time they're built.
+    Anything that depends on the settings of the TagWindow displaying the
+    node, like whether gui names are used, is stored for each setting.
+    '''
+    __slots__ = (
+        "desc", "name", "tooltip", "orient", "widget_width",
+        "field_indices", "field_visibility", "_gui_names",
+        "_enum_options", "_flag_options", "_cache",
+        )
+
+    def __init__(self, desc):
+        self.desc = desc
+        self.name = desc.get('NAME', e_c.UNNAMED_FIELD)
+        self.tooltip = desc.get('TOOLTIP')
+        self.orient = desc.get('ORIENT', 'v')[:1].lower()
+        self.widget_width = desc.get('WIDGET_WIDTH', 0)
+
+        field_indices = tuple(range(desc.get('ENTRIES', 0)))
+        if 'STEPTREE' in desc:
+            field_indices += ('STEPTREE', )
+
+        # the visibility level of each field as defined in the descriptor
+        field_visibility = []
+        for i in field_indices:
+            try:
+                sub_desc = desc[i]
+                field_visibility.append(sub_desc.get('VISIBLE', True))
+            except (AttributeError, KeyError, IndexError):
+                field_visibility.append(True)
+
+        self.field_indices = field_indices
+        self.field_visibility = tuple(field_visibility)
+        self._gui_names = {}
+        self._enum_options = {}
+        self._flag_options = None
+        self._cache = {}
+
+    @property
+    def field_count(self):
+        return len(self.field_indices)
+
+    def get_gui_name(self, use_gui_names=True):
+        '''The name to display for nodes with this descriptor.'''
+        use_gui_names = bool(use_gui_names)
+        name = self._gui_names.get(use_gui_names)
+        if name is None:
+            name = self.name.replace('_', ' ')
+            if use_gui_names:
+                name = self.desc.get('GUI_NAME', name)
+
+            if self.tooltip and name:
+                name += " �"
+
+            self._gui_names[use_gui_names] = name
+
+        return name
+
+    def get_visible_fields(self, get_visible, node=None):
+        '''
+        Returns a list of the indices of the fields that should be shown.
+        get_visible is called once for each distinct visibility level.
+        If a node is provided, fields whose nodes are described by a
+        different descriptor than the one in this descriptor(such as
+        the selected case of a switch) use the visibility of that one.
+        '''
+        visible = {}
+        indices = []
+        can_index = hasattr(node, "__getitem__")
+        for i, level in zip(self.field_indices, self.field_visibility):
+            if can_index:
+                try:
+                    sub_desc = node[i].desc
+                    if sub_desc is not self.desc[i]:
+                        level = sub_desc.get('VISIBLE', True)
+                except (AttributeError, KeyError, IndexError):
+                    pass
+
+            try:
+                shown = visible[level]
+            except KeyError:
+                shown = visible[level] = get_visible(level)
+            except TypeError:
+                # unhashable visibility level
+                shown = get_visible(level)
+
+            if shown:
+                indices.append(i)
+
+        return indices
+
+    def get_enum_options(self, use_gui_names=True):
+        '''Returns a dict mapping each enum options index to its name.'''
+        use_gui_names = bool(use_gui_names)
+        options = self._enum_options.get(use_gui_names)
+        if options is None:
+            desc = self.desc
+            options = {}
+            for i in range(desc.get('ENTRIES', 0)):
+                opt = desc[i]
+                if use_gui_names and 'GUI_NAME' in opt:
+                    options[i] = opt['GUI_NAME']
+                else:
+                    options[i] = opt.get('NAME', '<UNNAMED %s>' % i)\
+                                 .replace('_', ' ')
+
+            self._enum_options[use_gui_names] = options
+
+        return options
+
+    def get_flag_options(self):
+        '''
+        Returns a tuple of (bit, visibility, opt) for each flag defined
+        in the descriptor, sorted by bit. Each opt is a copy of the flags
+        descriptor with its GUI_NAME filled in.
+        '''
+        if self._flag_options is None:
+            desc = self.desc
+            flag_options = []
+            for mask in sorted(desc.get('VALUE_MAP', ())):
+                bit = int(math.log(mask, 2.0))
+                opt = desc.get(desc['VALUE_MAP'].get(mask))
+                if opt is None:
+                    flag_options.append((bit, True, None))
+                    continue
+
+                opt = dict(opt)
+                defname = opt.get('NAME', e_c.UNNAMED_FIELD).replace('_', ' ')
+                opt.setdefault('GUI_NAME', defname)
+                flag_options.append((bit, opt.get("VISIBLE", True), opt))
+
+            self._flag_options = tuple(flag_options)
+
+        return self._flag_options
+
+    def get_cached(self, key, builder):
+        '''
+        Returns the value cached under the given key, calling
+        builder with the descriptor to create it if it doesn't exist.
+        '''
+        try:
+            return self._cache[key]
+        except KeyError:
+            value = self._cache[key] = builder(self.desc)
+            return value
+
+
+def get_desc_metadata(desc):
+    '''Returns the DescMetadata for the given descriptor, compiling it once.'''
+    metadata = _desc_metadata.get(id(desc))
+    if metadata is None or metadata.desc is not desc:
+        metadata = _desc_metadata[id(desc)] = DescMetadata(desc)
+    return metadata
+
+
+def clear_desc_metadata():
+    _desc_metadata.clear()
@@ -0,0 +1,280 @@
+'''
+DYN_NAME_PATH strings are followed once for every element of the array they
+name the elements of. This module compiles those paths once per descriptor
+into a tuple of parent hops and attribute indices, and caches the names they
+resolve to for each array so they only need regenerating after an edit.
+'''
+from binilla import editor_constants as e_c
+from binilla.constants import DYN_I
+
+__all__ = (
+    "DynNamePath", "DynNameCache",
+    "compile_dyn_name_path", "split_dyn_enum_path", "dyn_name_to_str",
+    )
+
+# the types of steps a compiled path can take
+PARENT, ITEM, ATTR = range(3)
+
+# compiled paths keyed by (id(desc), path). each compiled path holds
+# onto the desc it was compiled for, so the id can't be reused. cleared
+# once it holds e_c.MAX_COMPILED_DYN_NAME_PATHS, so it can't grow forever.
+_compiled_paths = {}
+
+
+class DynNamePath:
+    '''
+    A compiled version of a nodepath string as used by Block.get_neighbor.
+    Calling it with a node returns the same node that get_neighbor would.
+
+    element_relative is whether the path never leaves the node it is
+    followed from, so what it leads to can only be changed by edits to
+    that node. Paths that are absolute or go above it are not.
+    '''
+    __slots__ = ("path", "desc", "absolute", "steps", "element_relative")
+
+    def __init__(self, path, desc=None):
+        self.path = path
+        self.desc = desc
+
+        names = path.split('.') if path else []
+        # if the first name isn't "go to parent", the path
+        # is absolute and starts at the root of the data.
+        self.absolute = bool(names and names[0])
+        if names and not names[0]:
+            del names[0]
+        else:
+            desc = None
+
+        steps = []
+        depth = 0
+        self.element_relative = not self.absolute
+        for name in names:
+            if not name:
+                steps.append((PARENT, None, None, None))
+                depth -= 1
+                if depth < 0:
+                    self.element_relative = False
+                # there's no telling what the parent's descriptor is
+                desc = None
+                continue
+            depth += 1
+            if name[0] == "[" and name[-1] == "]":
+                try:
+                    steps.append((ITEM, int(name[1: -1]), None, None))
+                    desc = None
+                    continue
+                except ValueError:
+                    pass
+
+            # if the descriptor is known, find the index of the attribute
+            # so it can be indexed into rather than looked up by name.
+            index = None
+            try:
+                if not hasattr(desc['TYPE'].node_cls, name):
+                    index = desc['NAME_MAP'].get(name)
+            except Exception:
+                pass
+
+            steps.append((ATTR, name, desc, index))
+            try:
+                desc = None if index is None else desc[index]
+                if not isinstance(desc, dict):
+                    desc = None
+            except Exception:
+                desc = None
+
+        self.steps = tuple(steps)
+
+    def __call__(self, node):
+        start = node
+        if self.absolute:
+            node = node.get_root().data
+
+        try:
+            for kind, arg, desc, index in self.steps:
+                if kind is PARENT:
+                    node = node.parent
+                elif kind is ITEM:
+                    node = node[arg]
+                elif index is not None and node.desc is desc:
+                    node = node[index]
+                else:
+                    node = node.__getattr__(arg)
+        except Exception:
+            # let get_neighbor raise a descriptive exception
+            return start.get_neighbor(self.path)
+
+        return node
+
+
+def compile_dyn_name_path(path, desc=None):
+    '''
+    Returns a DynNamePath for the given path. The desc is the descriptor
+    of the nodes the path will be followed from, and is used for resolving
+    attribute names to indices. Compiled paths are cached and reused.
+    '''
+    key = (id(desc), path)
+    compiled = _compiled_paths.get(key)
+    if compiled is None:
+        if len(_compiled_paths) >= e_c.MAX_COMPILED_DYN_NAME_PATHS:
+            _compiled_paths.clear()
+        compiled = _compiled_paths[key] = DynNamePath(path, desc)
+    return compiled
+
+
+def split_dyn_enum_path(dyn_name_path):
+    '''
+    Splits a dynamic enumerators DYN_NAME_PATH into the path from
+    the parent of the enumerator to the array, and the path from
+    each array element to its name.
+    '''
+    p_out, p_in = dyn_name_path.split(DYN_I)
+
+    # We are ALWAYS going to go to the parent, so we need to slice
+    if p_out.startswith('..'): p_out = p_out.split('.', 1)[-1]
+    return p_out, p_in
+
+
+def dyn_name_to_str(name):
+    '''Converts the node a DYN_NAME_PATH leads to into a single line name.'''
+    if isinstance(name, list):
+        name = repr(name).strip("[").strip("]")
+    else:
+        name = str(name)
+    return name.split('\n')[0]
+
+
+class DynNameCache:
+    '''
+    Caches the names each element of an array resolves to with a given
+    DYN_NAME_PATH. Names for an array are regenerated after the cache is
+    told that the array or any node above it has been edited.
+
+    The names dropped by the most recent invalidation are set aside, so if
+    the edit only added, removed or moved elements of the array, they can
+    be patched with patch_names rather than regenerated for every element.
+
+    Names from paths that aren't element relative can lead to any node, so
+    they are dropped on every invalidation rather than being set aside.
+    '''
+    def __init__(self):
+        # {id(array): {path: (array, names)}}
+        self._names = {}
+        # the entries dropped by the last call to invalidate
+        self._invalidated = {}
+        # {id(array): set(paths)} of the cached paths that
+        # aren't element relative, and so can't be patched.
+        self._non_relative = {}
+
+    def get_accessor(self, array, path):
+        try:
+            sub_desc = array.desc['SUB_STRUCT']
+        except Exception:
+            sub_desc = None
+        return compile_dyn_name_path(path, sub_desc)
+
+    def get_name(self, array, index, path):
+        '''
+        Returns the name of the element at index in the array, or
+        None if it couldn't be resolved. Nothing is cached.
+        '''
+        try:
+            return dyn_name_to_str(self.get_accessor(array, path)(array[index]))
+        except Exception:
+            return None
+
+    def _cache_names(self, array, path, names):
+        cached = self._names.get(id(array))
+        if cached is None or any(e[0] is not array for e in cached.values()):
+            cached = self._names[id(array)] = {}
+            self._non_relative.pop(id(array), None)
+
+        cached[path] = (array, names)
+        try:
+            element_relative = self.get_accessor(array, path).element_relative
+        except Exception:
+            element_relative = False
+
+        if not element_relative:
+            self._non_relative.setdefault(id(array), set()).add(path)
+
+    def get_names(self, array, path):
+        '''
+        Returns a list of the names of each element in the array. Elements
+        whose name couldn't be resolved are given a name of None.
+        '''
+        cached = self._names.get(id(array))
+        entry = None if cached is None else cached.get(path)
+        if (entry is not None and entry[0] is array and
+                len(entry[1]) == len(array)):
+            return entry[1]
+
+        names = [self.get_name(array, i, path) for i in range(len(array))]
+        self._cache_names(array, path, names)
+        return names
+
+    def patch_names(self, array, path, edit_type, index):
+        '''
+        Updates the cached names of the array in place for an edit that
+        shifted, inserted, or deleted the element at index, resolving only
+        the name of an inserted element. Returns whether it was patched.
+        If the names aren't cached, or were set aside by an invalidation
+        other than the one made by this edit, nothing is done and they
+        will be regenerated the next time they're requested.
+        '''
+        entry = self._names.get(id(array), {}).get(path)
+        if entry is None or entry[0] is not array:
+            entry = self._invalidated.get(id(array), {}).get(path)
+        if entry is None or entry[0] is not array:
+            return False
+
+        names = list(entry[1])
+        if edit_type == 'shift_up':
+            names[index], names[index - 1] = names[index - 1], names[index]
+        elif edit_type == 'shift_down':
+            names[index], names[index + 1] = names[index + 1], names[index]
+        elif edit_type == 'insert':
+            names.insert(index, self.get_name(array, index, path))
+        elif edit_type == 'delete':
+            del names[index]
+        elif edit_type == 'delete_all':
+            del names[:]
+        else:
+            return False
+
+        if len(names) != len(array):
+            return False
+
+        self._cache_names(array, path, names)
+        return True
+
+    def invalidate(self, nodes, set_aside=True):
+        '''
+        Drops the cached names of any of the given array nodes, along with
+        every cached name whose path isn't element relative. If set_aside
+        is False, the names set aside by the last invalidation are kept,
+        and the names of the given nodes are dropped from them instead.
+        '''
+        if set_aside:
+            self._invalidated = {}
+
+        for array_id, paths in tuple(self._non_relative.items()):
+            cached = self._names.get(array_id)
+            if cached is not None:
+                for path in paths:
+                    cached.pop(path, None)
+                if not cached:
+                    del self._names[array_id]
+            del self._non_relative[array_id]
+
+        for node in nodes:
+            cached = self._names.pop(id(node), None)
+            if not set_aside:
+                self._invalidated.pop(id(node), None)
+            elif cached is not None:
+                self._invalidated[id(node)] = cached
+
+    def clear(self):
+        self._names.clear()
+        self._non_relative.clear()
+        self._invalidated = {}
@@ -43,6 +43,84 @@
 SCROLL_MENU_MAX_WIDTH = 35
 SCROLL_MENU_MAX_HEIGHT = 15
 
+# The estimated number of pixels tall a single row of fields is. Used
+# for sizing the placeholders of widgets that haven't been built yet.
+VIRTUAL_ROW_HEIGHT = 24
+# The number of pixels above and below the visible region of a TagWindow
+# to keep field widgets built within when widget virtualization is on.
+VIRTUAL_VIEW_MARGIN = 256
+# The number of seconds a TagWindow spends building field widgets each
+# time the ui is idle while populating, before letting the ui update.
+REALIZE_TIME_BUDGET = 0.016
+
+# The minimum number of milliseconds between a TagWindow applying scrolls.
+# Mousewheel events received in between are added up and applied together.
+SCROLL_FRAME_MS = 16
+# The number of seconds a TagWindow remembers whether it should scroll when
+# the mouse is over a spot, as long as the mouse stays still and keeps
+# scrolling. Keeps the widget being scrolled from changing mid-scroll.
+SCROLL_TARGET_TIMEOUT = 0.25
+
+# The max number of released field widgets a TagWindow holds onto for reuse
+FIELD_WIDGET_POOL_MAX = 64
+# The max number of compiled DYN_NAME_PATHs to hold onto before clearing them
+MAX_COMPILED_DYN_NAME_PATHS = 1024
+# The max number of closed TagWindows to hold onto for displaying other tags
+MAX_RECYCLED_TAG_WINDOWS = 4
+
+# The number of rows an ArrayTableFrame displays before it needs to scroll
+ARRAY_TABLE_MAX_ROWS = 15
+# The number of pixels tall each row of an ArrayTableFrame is
+ARRAY_TABLE_ROW_HEIGHT = 20
+# The min and max number of pixels wide each column of an ArrayTableFrame is
+ARRAY_TABLE_MIN_COLUMN_WIDTH = 40
+ARRAY_TABLE_MAX_COLUMN_WIDTH = 240
+
+# The number of characters a TextFrame inserts into its text box at a time
+# when loading text too large to insert at once without freezing the window
+TEXT_LOAD_CHUNK_SIZE = 1 << 16
+# The number of characters past which a TextFrame only displays a read-only
+# preview of its text(if previewing large text is enabled), and how many
+# characters of the text that preview contains.
+TEXT_PREVIEW_THRESHOLD = 1 << 20
+TEXT_PREVIEW_SIZE = 1 << 14
+
+# The number of rows of 16 bytes a HexView displays before it needs to scroll
+HEX_VIEW_ROWS = 16
+
+# The min number of milliseconds between the console inserting printed text.
+# Text printed in between is buffered and inserted all at once.
+IO_FLUSH_MS = 50
+# The default max number of lines the console keeps, and how many lines
+# past that it can grow before the oldest ones are deleted all at once.
+IO_MAX_LINES = 10000
+IO_TRIM_LINES = 1000
+# The number of seconds spent printing a tag each time the ui is idle
+TAG_PRINT_TIME_BUDGET = 0.02
+# The zlib compression level of the PNGs bitmap previews are made from.
+# They're only decoded right away, so compressing them is wasted time.
+PNG_COMPRESS_LEVEL = 0
+# The default number of megabytes of decoded bitmap previews to keep cached
+BITMAP_CACHE_SIZE = 256
+# The default number of megabytes of decoded bitmap previews to save on disk
+BITMAP_DISK_CACHE_SIZE = 512
+# The zlib compression level of the bitmap previews saved on disk.
+# They're saved in the background, so favor speed over size.
+BITMAP_DISK_CACHE_COMPRESS_LEVEL = 1
+# The number of milliseconds between checking if the bitmap
+# preview being decoded in the background is ready to display
+BITMAP_DECODE_POLL_MS = 50
+# The width and height of the tiles bitmap previews are displayed in.
+# Only the tiles in view are made, so large bitmaps don't need to be
+# made into one huge image to display them.
+BITMAP_TILE_SIZE = 256
+# The range of zoom levels bitmap previews can be displayed at, as
+# powers of 2. -2 is a quarter of the size, and 2 is four times it.
+BITMAP_MIN_ZOOM = -4
+BITMAP_MAX_ZOOM = 4
+# The smallest width and height the bitmap preview viewport is shrunk to
+BITMAP_VIEWPORT_MIN_SIZE = 128
+
 # default colors for the widgets
 IO_FG_COLOR = '#%02x%02x%02x' % (255, 255, 255)  # Really white
 IO_BG_COLOR = '#%02x%02x%02x' % (50, 50, 50)  # dark grey
@@ -0,0 +1,241 @@
+'''
+Streams the printout of a tag or node in chunks rather than building the
+whole string at once like the pprint methods of supyr_struct Tags and Blocks.
+The chunks are the same text those would produce, but only one container
+is formatted at a time, so printing a large tag doesn't need to hold its
+entire printout in memory, and the printing can be spread across idle time.
+'''
+import time
+
+from traceback import format_exc
+
+from supyr_struct.blocks.list_block import ListBlock
+from supyr_struct.defs.constants import DEF_SHOW, ALL_SHOW, SHOW_SETS,\
+     NODE_PRINT_INDENT, POINTER, UNNAMED, NAME_MAP, STEPTREE,\
+     UNPRINTABLE, SIZE_CALC_FAIL
+
+__all__ = ("TagPrinter", "iter_tag_str", "iter_node_str", "get_show_set", )
+
+
+def get_show_set(show=DEF_SHOW):
+    '''Returns a set of what to show, the same way pprint interprets it.'''
+    if isinstance(show, str):
+        show = SHOW_SETS.get(show, [show])
+    show = set(show)
+    if 'all' in show:
+        show.update(ALL_SHOW)
+    return show
+
+
+def iter_node_str(node, **kwargs):
+    '''
+    Yields the same string node.__str__(**kwargs) returns, in chunks.
+    ListBlocks(and ArrayBlocks, which share their __str__) are streamed a
+    field at a time. Any other node is formatted by its own __str__.
+    '''
+    if type(node).__str__ is not ListBlock.__str__:
+        yield node.__str__(**kwargs)
+        return
+
+    # everything below mirrors ListBlock.__str__
+    seen = kwargs['seen'] = set(kwargs.get('seen', ()))
+    seen.add(id(node))
+
+    show = kwargs.get('show', DEF_SHOW)
+    if isinstance(show, str):
+        show = SHOW_SETS.get(show, [show])
+    show = set(show)
+
+    indent = kwargs.get('indent', NODE_PRINT_INDENT)
+    attr_index = kwargs.get('attr_index', None)
+    kwargs.setdefault('level', 0)
+
+    if 'all' in show:
+        show.remove('all')
+        show.update(ALL_SHOW)
+    kwargs['show'] = show
+
+    indent_str0 = ' '*indent*kwargs['level']
+    indent_str1 = ' '*indent*(kwargs['level'] + 1)
+    kwargs['level'] += 1
+
+    desc = object.__getattribute__(node, 'desc')
+    tempstr = ''
+    if "index" in show and attr_index is not None:
+        tempstr = ', %s' % attr_index
+    if "type" in show and hasattr(node, 'TYPE'):
+        tempstr += ', %s' % desc['TYPE'].name
+    if "offset" in show:
+        if hasattr(node, POINTER):
+            tempstr += ', pointer:%s' % node.get_meta('POINTER')
+        else:
+            try:
+                tempstr += (', offset:%s' %
+                            node.parent['ATTR_OFFS'][attr_index])
+            except Exception:
+                pass
+    if "parent_id" in show:
+        tempstr += ', parent_id:%s' % id(node.parent)
+    if "node_id" in show:
+        tempstr += ', node_id:%s' % id(node)
+    if "node_cls" in show:
+        tempstr += ', node_cls:%s' % desc['TYPE'].node_cls
+    if "size" in show:
+        if hasattr(node, 'SIZE') and not desc['TYPE'].is_container:
+            tempstr += ', size:%s' % node.get_size()
+        tempstr += ', entries:%s' % len(node)
+    if "name" in show and 'NAME' in desc:
+        attr_name = kwargs.get('attr_name', UNNAMED)
+        if attr_name == UNNAMED:
+            attr_name = desc.get('NAME', UNNAMED)
+        tempstr += ', %s' % attr_name
+
+    yield indent_str0 + '[' + tempstr.replace(',', '', 1) + '\n'
+
+    inv_name_map = {v: k for k, v in desc.get(NAME_MAP, {}).items()}
+    attr_indices = list(range(len(node)))
+    if hasattr(node, 'STEPTREE') and (node.STEPTREE is not None and
+                                     "steptrees" in show):
+        attr_indices.append(STEPTREE)
+
+    for i in attr_indices:
+        kwargs['attr_name'] = inv_name_map.get(i, UNNAMED)
+        kwargs['attr_index'] = i
+        sub_node = node.STEPTREE if i == STEPTREE else node[i]
+        if (type(sub_node).__str__ is ListBlock.__str__ and
+                id(sub_node) not in seen):
+            # mirrors Block.attr_to_str for an unseen Block
+            try:
+                yield from iter_node_str(sub_node, **kwargs)
+            except Exception:
+                yield '\n' + format_exc()
+            yield '\n'
+        else:
+            yield node.attr_to_str(**kwargs)
+
+    yield indent_str1 + ']'
+
+
+def iter_tag_str(tag, **kwargs):
+    '''
+    Yields the same string tag.pprint(**kwargs) returns, in chunks.
+    tag may also be a Block, in which case the chunks match Block.pprint.
+    '''
+    show = get_show_set(kwargs.get('show', DEF_SHOW))
+    precision = kwargs.get('precision', None)
+    is_tag = hasattr(tag, "data") and hasattr(tag, "definition")
+
+    kwargs.setdefault('level', 0)
+    kwargs.setdefault('indent', NODE_PRINT_INDENT)
+    if is_tag:
+        if 'filepath' in show:
+            yield str(tag.filepath) + '\n'
+
+        if tag.data is None:
+            # let the tag raise the error it normally would
+            yield tag.__str__(**kwargs)
+        else:
+            yield from iter_node_str(tag.data, **kwargs)
+    else:
+        yield from iter_node_str(tag, **kwargs)
+    yield '\n'
+
+    if "ramsize" in show:
+        objsize = tag.__sizeof__()
+        if is_tag:
+            datasize = objsize - tag.__sizeof__(include_data=False)
+            yield ('"In-memory tag"  is %s bytes\n' % objsize +
+                   '"In-memory data" is %s bytes\n' % datasize)
+        else:
+            yield '"In-memory block" is %s bytes\n' % objsize
+
+    if "binsize" in show:
+        try:
+            binsize = tag.data.binsize if is_tag else tag.binsize
+            yield '"Packed structure" is %s bytes\n' % binsize
+            if "ramsize" in show:
+                sizes = ((objsize, datasize) if is_tag else (objsize, ))
+                ratios = []
+                for size in sizes:
+                    ratio = "∞"
+                    if binsize:
+                        ratio = size / binsize
+                        if isinstance(precision, int):
+                            fmt = "{:.%sf}" % precision
+                            ratio = fmt.format(round(ratio, precision))
+                    ratios.append(ratio)
+
+                if is_tag:
+                    yield ('"In-memory tag"  is %s times as large.\n' % ratios[0] +
+                           '"In-memory data" is %s times as large.\n' % ratios[1])
+                else:
+                    yield ('"In-memory block" is %s times as large.\n' %
+                           ratios[0])
+        except Exception:
+            yield SIZE_CALC_FAIL + '\n'
+
+
+class TagPrinter:
+    '''
+    Writes the printout of a tag or node to a writable object(such as a file
+    or the console) in batches, so it can be printed a little at a time.
+    '''
+    # the number of characters to join into each write
+    write_size = 1 << 16
+
+    def __init__(self, tag, out, **kwargs):
+        self.out = out
+        self.chunks = iter_tag_str(tag, **kwargs)
+        self.done = False
+
+    def write(self, string):
+        try:
+            self.out.write(string)
+        except Exception:
+            # some character can't be written. write each line on its
+            # own, and replace the ones that can't be written
+            for line in string.split('\n')[:-1]:
+                try:
+                    self.out.write(line + '\n')
+                except Exception:
+                    self.out.write(' '*(len(line) - len(line.lstrip(' '))) +
+                                   UNPRINTABLE + '\n')
+
+            line = string.split('\n')[-1]
+            try:
+                self.out.write(line)
+            except Exception:
+                self.out.write(UNPRINTABLE)
+
+    def print_batch(self, time_budget=None):
+        '''
+        Writes chunks of the printout until it's finished or time_budget
+        seconds have passed. Returns True when everything has been written.
+        '''
+        end = None if time_budget is None else time.perf_counter() + time_budget
+        pending = []
+        pending_len = 0
+        try:
+            for chunk in self.chunks:
+                pending.append(chunk)
+                pending_len += len(chunk)
+                if pending_len >= self.write_size:
+                    self.write(''.join(pending))
+                    pending, pending_len = [], 0
+
+                if end is not None and time.perf_counter() >= end:
+                    break
+            else:
+                self.done = True
+        except Exception:
+            pending.append('\n' + format_exc())
+            self.done = True
+
+        if pending:
+            self.write(''.join(pending))
+
+        return self.done
+
+    def cancel(self):
+        self.chunks.close()
+        self.done = True
@@ -11,6 +11,7 @@
 
 from math import log, ceil
 from pathlib import Path
+from threading import Lock
 from time import sleep
 from traceback import format_exc
 
@@ -51,15 +52,29 @@ def float_to_str(f, max_sig_figs=FLOAT_PREC):
 
 
 class IORedirecter(StringIO):
+    '''
+    Redirects text written to it into a tkinter Text widget. Writes are
+    buffered and inserted into the widget at most every IO_FLUSH_MS, so
+    printing many small messages doesn't redraw the widget for each one.
+    Writing is safe from any thread, and only the last max_lines lines
+    are kept in the widget, with older ones being deleted in bulk.
+    '''
     text_out = None   # a Tkinter text widget to display output
     log_file = None   # a writable file to log input/output to
     edit_log = False  # whether or not to log text input/output to the log_file
+    max_lines = e_c.IO_MAX_LINES  # the max number of lines to keep displayed
+    flush_rate = e_c.IO_FLUSH_MS  # milliseconds between inserting text
+
+    _flush_scheduled = False
 
     def __init__(self, text_out, *args, **kwargs):
         self.log_file = kwargs.pop('log_file', None)
         self.edit_log = kwargs.pop('edit_log', False)
+        self.max_lines = kwargs.pop('max_lines', self.max_lines)
         StringIO.__init__(self, *args, **kwargs)
         self.text_out = text_out
+        self._pending = []
+        self._pending_lock = Lock()
 
     def write(self, string):
         if self.edit_log and self.log_file is not None:
@@ -67,10 +82,50 @@ def write(self, string):
                 self.log_file.write(string)
             except Exception:
                 pass
-        self.text_out.config(state=tk.NORMAL)
-        self.text_out.insert(tk.END, string)
-        self.text_out.see(tk.END)
-        self.text_out.config(state=tk.DISABLED)
+
+        with self._pending_lock:
+            self._pending.append(string)
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+
+        try:
+            self.text_out.after(self.flush_rate, self.flush_text)
+        except Exception:
+            self._flush_scheduled = False
+
+    def flush_text(self):
+        '''
+        Inserts all buffered text into the text widget, and deletes the
+        oldest lines if it has grown too far past max_lines.
+        Must be called from the thread tkinter runs in.
+        '''
+        with self._pending_lock:
+            pending, self._pending = self._pending, []
+            self._flush_scheduled = False
+
+        if not pending:
+            return
+
+        string = "".join(pending)
+        max_lines = self.max_lines if self.max_lines > 0 else e_c.IO_MAX_LINES
+        if string.count("\n") > max_lines:
+            # no need to insert lines that would be deleted right away
+            string = "\n".join(string.split("\n")[-max_lines - 1:])
+
+        text_out = self.text_out
+        try:
+            text_out.config(state=tk.NORMAL)
+            text_out.insert(tk.END, string)
+
+            line_count = int(text_out.index(tk.END).split(".")[0]) - 1
+            if line_count > max_lines + e_c.IO_TRIM_LINES:
+                text_out.delete("1.0", "%s.0" % (line_count - max_lines + 1))
+
+            text_out.see(tk.END)
+            text_out.config(state=tk.DISABLED)
+        except Exception:
+            pass
 
 
 class ProcController():
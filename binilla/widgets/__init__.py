@@ -1,8 +1,9 @@
 from binilla import editor_constants as e_c
 
 __all__ = (
-    "binilla_widget", "bitmap_display_frame", "field_widget_picker",
-    "field_widgets", "font_config", "scroll_menu",
+    "binilla_widget", "bitmap_cache", "bitmap_display_frame",
+    "field_widget_picker",
+    "field_widgets", "font_config", "hex_view", "scroll_menu",
     "style_change_lock", "tooltip_handler",
     )
 
@@ -32,6 +32,12 @@ class BinillaWidget():
     _filedialog_style_fix = None
     style_change_lock = None
 
+    # incremented whenever the style is invalidated. widgets remember
+    # the generation they were last styled with so they can be skipped.
+    _style_generation = 0
+    _applied_style_generation = None
+    _style_options = {}
+
     # Define class defaults here so they can be easily reset if needed.
     @staticmethod
     def set_style_defaults(dark=False):
@@ -105,6 +111,8 @@ def set_style_defaults(dark=False):
         BinillaWidget.io_bg_color = e_c.IO_BG_COLOR
         BinillaWidget.invalid_path_color = e_c.INVALID_PATH_COLOR
 
+        BinillaWidget.invalidate_style()
+
         # FONTS
         BinillaWidget._fonts = {}
         BinillaWidget._ttk_style = None
@@ -266,8 +274,12 @@ def reload_fonts(self, font_types=None):
                 continue
 
             try:
-                if typ not in self._fonts or self._fonts[typ].actual() != settings:
+                if typ not in self._fonts:
                     self._fonts[typ] = tkinter.font.Font(root, **settings)
+                elif self._fonts[typ].actual() != settings:
+                    self._fonts[typ] = tkinter.font.Font(root, **settings)
+                    # widgets using the old font need to be restyled
+                    self.invalidate_style()
             except Exception:
                 pass
 
@@ -366,7 +378,119 @@ def enter_style_change(self):
     def exit_style_change(self):
         pass
 
+    @staticmethod
+    def invalidate_style():
+        '''
+        Marks every widget as needing its style reapplied. Call this
+        after changing the colors, depths, or fonts of BinillaWidget.
+        '''
+        BinillaWidget._style_generation += 1
+        BinillaWidget._style_options = {}
+
+    @property
+    def style_is_current(self):
+        return self._applied_style_generation == self._style_generation
+
+    def should_defer_style(self):
+        '''
+        Returns True if this widget should be skipped when an ancestor is
+        applying its style. Widgets that defer must restyle themselves.
+        '''
+        return False
+
+    def get_style_options(self, widget_cls, font_type=None):
+        '''
+        Returns a dict of the config options to style instances of the
+        given tkinter widget class with, or None if it isnt styled.
+        The dicts are built once per class and font type and then reused
+        until the style is invalidated.
+        '''
+        if font_type is None:
+            font_type = self.font_type
+
+        key = (widget_cls, font_type)
+        try:
+            return self._style_options[key]
+        except KeyError:
+            pass
+
+        font = self.get_font(font_type)
+        if issubclass(widget_cls, tk.Menu):
+            options = dict(
+                fg=self.text_normal_color, bg=self.default_bg_color,
+                font=font, highlightthickness=0,)
+        elif issubclass(widget_cls, tk.PanedWindow):
+            options = dict(
+                bd=self.frame_depth, bg=self.default_bg_color,
+                highlightthickness=0,)
+        elif issubclass(widget_cls, tk.Listbox):
+            options = dict(
+                bg=self.enum_normal_color, fg=self.text_normal_color,
+                selectbackground=self.enum_highlighted_color,
+                selectforeground=self.text_highlighted_color,
+                font=font, highlightthickness=0,)
+        elif issubclass(widget_cls, tk.Text):
+            options = dict(
+                bd=self.entry_depth, font=font,
+                bg=self.entry_normal_color, fg=self.text_normal_color,
+                selectbackground=self.entry_highlighted_color,
+                selectforeground=self.text_highlighted_color,
+                highlightthickness=0,)
+        elif issubclass(widget_cls, tk.Spinbox):
+            options = dict(
+                bd=self.entry_depth, font=font,
+                bg=self.entry_normal_color, fg=self.text_normal_color,
+                disabledbackground=self.entry_disabled_color,
+                disabledforeground=self.text_disabled_color,
+                selectbackground=self.entry_highlighted_color,
+                selectforeground=self.text_highlighted_color,
+                activebackground=self.default_bg_color,
+                readonlybackground=self.entry_disabled_color,
+                buttonbackground=self.default_bg_color,
+                highlightthickness=0,)
+        elif issubclass(widget_cls, (tk.LabelFrame, tk.Label)):
+            options = dict(
+                fg=self.text_normal_color, bg=self.default_bg_color,
+                font=font, highlightthickness=0,)
+        elif issubclass(widget_cls, (tk.Frame, tk.Canvas, tk.Toplevel)):
+            options = dict(bg=self.default_bg_color, highlightthickness=0,)
+        elif issubclass(widget_cls, (tk.Radiobutton, tk.Checkbutton)):
+            options = dict(
+                disabledforeground=self.text_disabled_color,
+                bg=self.default_bg_color, fg=self.text_normal_color,
+                activebackground=self.default_bg_color,
+                activeforeground=self.text_normal_color,
+                selectcolor=self.entry_normal_color, font=font,
+                highlightthickness=0,)
+        elif issubclass(widget_cls, tk.Button):
+            options = dict(
+                bg=self.button_color, activebackground=self.button_color,
+                fg=self.text_normal_color, bd=self.button_depth,
+                disabledforeground=self.text_disabled_color, font=font,
+                highlightthickness=0,)
+        elif issubclass(widget_cls, tk.Entry):
+            options = dict(
+                bd=self.entry_depth, font=font,
+                bg=self.entry_normal_color, fg=self.text_normal_color,
+                disabledbackground=self.entry_disabled_color,
+                disabledforeground=self.text_disabled_color,
+                selectbackground=self.entry_highlighted_color,
+                selectforeground=self.text_highlighted_color,
+                readonlybackground=self.entry_disabled_color,
+                highlightthickness=0,)
+        else:
+            options = None
+
+        self._style_options[key] = options
+        return options
+
     def apply_style(self, seen=None):
+        '''
+        Styles this widget and any of its descendants that havent been
+        styled since the style was last invalidated. Descendant
+        BinillaWidgets that are already styled are skipped along with
+        their children, as they restyle themselves when they add widgets.
+        '''
         if not isinstance(self, (tk.BaseWidget, tk.Tk)):
             return
 
@@ -374,6 +498,7 @@ def apply_style(self, seen=None):
         if seen is None:
             seen = set()
 
+        generation = self._style_generation
         while widgets:
             next_widgets = []
             for w in widgets:
@@ -384,91 +509,44 @@ def apply_style(self, seen=None):
                     if w.style_change_lock is None:
                         raise TypeError("TELL MOSES HE FUCKED UP: " + str(type(w)))
 
-                    if w is not self:
+                    if w is self:
+                        pass
+                    elif w.style_is_current or w.should_defer_style():
+                        seen.add(id(w))
+                        continue
+                    else:
                         with w.style_change_lock as depth:
                             w.apply_style(seen)
+                elif getattr(w, "_applied_style_generation", None) == generation:
+                    # already styled, but its children may not be
+                    seen.add(id(w))
+                    if hasattr(w, "children"):
+                        next_widgets.extend(w.children.values())
+                    continue
 
                 seen.add(id(w))
 
-                font_type = getattr(w, "font_type", self.font_type)
-                font = self.get_font(font_type)
-
+                options = self.get_style_options(
+                    type(w), getattr(w, "font_type", self.font_type))
                 try:
-                    if isinstance(w, tk.Menu):
-                        w.config(
-                            fg=self.text_normal_color, bg=self.default_bg_color,
-                            font=font, highlightthickness=0,)
-                    elif isinstance(w, tk.PanedWindow):
-                        w.config(
-                            bd=self.frame_depth, bg=self.default_bg_color,
-                            highlightthickness=0,)
-                    elif isinstance(w, tk.Listbox):
-                        w.config(
-                            bg=self.enum_normal_color, fg=self.text_normal_color,
-                            selectbackground=self.enum_highlighted_color,
-                            selectforeground=self.text_highlighted_color,
-                            font=font, highlightthickness=0,)
-                    elif isinstance(w, tk.Text):
-                        w.config(
-                            bd=self.entry_depth, font=font,
-                            bg=self.entry_normal_color, fg=self.text_normal_color,
-                            selectbackground=self.entry_highlighted_color,
-                            selectforeground=self.text_highlighted_color,
-                            highlightthickness=0,)
-                    elif isinstance(w, tk.Spinbox):
-                        w.config(
-                            bd=self.entry_depth, font=font,
-                            bg=self.entry_normal_color, fg=self.text_normal_color,
-                            disabledbackground=self.entry_disabled_color,
-                            disabledforeground=self.text_disabled_color,
-                            selectbackground=self.entry_highlighted_color,
-                            selectforeground=self.text_highlighted_color,
-                            activebackground=self.default_bg_color,
-                            readonlybackground=self.entry_disabled_color,
-                            buttonbackground=self.default_bg_color,
-                            highlightthickness=0,)
-                    elif isinstance(w, tk.LabelFrame):
-                        w.config(
-                            fg=self.text_normal_color, bg=self.default_bg_color,
-                            font=font, highlightthickness=0,)
-                    elif isinstance(w, tk.Label):
-                        w.config(
-                            fg=self.text_normal_color, bg=self.default_bg_color,
-                            font=font, highlightthickness=0,)
-                    elif isinstance(w, (tk.Frame, tk.Canvas, tk.Toplevel)):
-                        w.config(bg=self.default_bg_color, highlightthickness=0,)
-                    elif isinstance(w, (tk.Radiobutton, tk.Checkbutton)):
-                        w.config(
-                            disabledforeground=self.text_disabled_color,
-                            bg=self.default_bg_color, fg=self.text_normal_color,
-                            activebackground=self.default_bg_color,
-                            activeforeground=self.text_normal_color,
-                            selectcolor=self.entry_normal_color, font=font,
-                            highlightthickness=0,)
-                    elif isinstance(w, tk.Button):
-                        w.config(
-                            bg=self.button_color, activebackground=self.button_color,
-                            fg=self.text_normal_color, bd=self.button_depth,
-                            disabledforeground=self.text_disabled_color, font=font,
-                            highlightthickness=0,)
-                    elif isinstance(w, tk.Entry):
-                        w.config(
-                            bd=self.entry_depth, font=font,
-                            bg=self.entry_normal_color, fg=self.text_normal_color,
-                            disabledbackground=self.entry_disabled_color,
-                            disabledforeground=self.text_disabled_color,
-                            selectbackground=self.entry_highlighted_color,
-                            selectforeground=self.text_highlighted_color,
-                            readonlybackground=self.entry_disabled_color,
-                            highlightthickness=0,)
+                    if options is not None:
+                        w.config(**options)
                 except tk.TclError:
                     pass
 
+                if w is not self and not isinstance(w, BinillaWidget):
+                    try:
+                        w._applied_style_generation = generation
+                    except AttributeError:
+                        pass
+
                 if hasattr(w, "children"):
                     next_widgets.extend(w.children.values())
 
             widgets = next_widgets
 
+        self._applied_style_generation = generation
+
     def update_ttk_style(self):
         # TButton
         self.configure_ttk_style(
@@ -0,0 +1,376 @@
+'''
+A cache of the decoded bitmap previews shown by BitmapDisplayFrames. It's
+shared by all of them, so flipping through the mips and channels of several
+large bitmaps is limited to a set amount of memory, rather than keeping
+everything they've displayed until their windows are closed.
+
+Decoded previews are also saved to a size-capped cache on disk, so
+reopening a bitmap can display it without decoding it again.
+'''
+import os
+import struct
+import threading
+import zlib
+
+from collections import OrderedDict
+from pathlib import Path
+from traceback import format_exc
+
+from binilla import editor_constants as e_c
+
+__all__ = ("BitmapCache", "BitmapDiskCache",
+           "bitmap_cache", "bitmap_disk_cache", )
+
+
+class BitmapCache:
+    '''
+    A least-recently-used cache that evicts the items that were used longest
+    ago once the total size of what's cached is over max_size bytes. Items
+    are added from multiple threads, so everything is done under a lock.
+
+    Keys are tuples that start with the id of the owner that cached them,
+    so everything cached by an owner can be discarded at once. Owners are
+    done with the cache once discarded, so anything they put in it after
+    that(such as an image finished decoding in another thread) is dropped.
+
+    Removed items are only released after the lock is, since releasing a
+    PhotoImage calls into tkinter, which may have to wait on the ui thread.
+    '''
+    def __init__(self, max_size=e_c.BITMAP_CACHE_SIZE << 20):
+        self._items = OrderedDict()  # (item, size) tuples keyed by key
+        self._lock = threading.Lock()
+        # ids of the owners that have been discarded
+        self._discarded_owners = set()
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(self, key, default=None, count=True):
+        '''
+        Returns the item cached under the key and marks it as the most
+        recently used. If count is False, the lookup isn't counted as a
+        hit or a miss. Use record_lookup to count it instead.
+        '''
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is not None:
+                self._items.move_to_end(key)
+
+            if count:
+                self._record_lookup(entry is not None)
+
+        return default if entry is None else entry[0]
+
+    def pop(self, key, default=None):
+        '''Removes and returns the item cached under the key.'''
+        with self._lock:
+            entry = self._items.pop(key, None)
+            if entry is None:
+                return default
+
+            self.size -= entry[1]
+            return entry[0]
+
+    def put(self, key, item, size):
+        '''
+        Caches the item as the most recently used, then evicts the least
+        recently used items until the cache is within its max size.
+        '''
+        with self._lock:
+            if key[0] in self._discarded_owners:
+                return
+
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.size -= old[1]
+
+            self._items[key] = (item, size)
+            self.size += size
+            evicted = self._evict()
+
+        # release the removed items now that the lock isn't held
+        del evicted
+
+    def discard_owner(self, owner_id):
+        '''
+        Removes everything cached with keys starting with owner_id, and
+        drops anything put in the cache under that owner_id afterward.
+        '''
+        with self._lock:
+            self._discarded_owners.add(owner_id)
+            removed = [self._items.pop(k) for k in tuple(self._items)
+                       if k[0] == owner_id]
+            self.size -= sum(entry[1] for entry in removed)
+
+        # release the removed items now that the lock isn't held
+        del removed
+
+    def clear(self):
+        with self._lock:
+            removed, self._items = self._items, OrderedDict()
+            self.size = 0
+
+        # release the removed items now that the lock isn't held
+        del removed
+
+    def record_lookup(self, hit):
+        with self._lock:
+            self._record_lookup(hit)
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = self.misses = self.evictions = 0
+
+    def set_max_size(self, max_size):
+        with self._lock:
+            self.max_size = max_size
+            evicted = self._evict()
+
+        # release the removed items now that the lock isn't held
+        del evicted
+
+    def get_stats_string(self):
+        return (
+            "Bitmap cache: %s items using %.1f of %.1f MB\n"
+            "    %s hits, %s misses, %.1f%% hit rate, %s evicted" % (
+                len(self), self.size / (1 << 20), self.max_size / (1 << 20),
+                self.hits, self.misses, self.hit_rate*100, self.evictions))
+
+    def _record_lookup(self, hit):
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def _evict(self):
+        # never evict the most recently used item, even if it's
+        # larger than the max size, as it's likely still needed
+        evicted = []
+        while self.size > self.max_size and len(self._items) > 1:
+            evicted.append(self._items.popitem(last=False)[1])
+            self.size -= evicted[-1][1]
+            self.evictions += 1
+        return evicted
+
+
+class BitmapDiskCache:
+    '''
+    A least-recently-used cache of decoded bitmap previews saved as files in
+    a directory, which deletes the files used longest ago once they total
+    more than max_size bytes. A file's modified time is updated whenever
+    it's read, so the order they were used in carries over between sessions.
+
+    Each file holds the width, height, and zlib compressed RGBA bytes of
+    one preview. Keys are tuples of strings and ints, which are joined to
+    make the name of the file. Nothing is cached until a directory is set.
+    '''
+    magic = b"BPRV"
+    version = 1
+    # magic, version, width, height
+    header = struct.Struct("<4sHII")
+    extension = ".bprv"
+
+    def __init__(self, directory=None,
+                 max_size=e_c.BITMAP_DISK_CACHE_SIZE << 20):
+        # the sizes of the files keyed by name, least recently used first.
+        # None until the directory is scanned for the files already in it.
+        self._files = None
+        self._lock = threading.Lock()
+        self.directory = None if directory is None else Path(directory)
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self):
+        return self.directory is not None
+
+    def get_filename(self, key):
+        return "_".join(str(k) for k in key) + self.extension
+
+    def get(self, key):
+        '''
+        Returns the width, height, and RGBA bytes saved under the key, or
+        None if nothing is saved under it or it can't be read.
+        '''
+        filename = self.get_filename(key)
+        with self._lock:
+            if not self._scan():
+                return None
+            elif filename not in self._files:
+                self.misses += 1
+                return None
+
+            self._files.move_to_end(filename)
+            filepath = self.directory.joinpath(filename)
+
+        try:
+            with filepath.open("rb") as f:
+                data = f.read()
+
+            magic, version, width, height = self.header.unpack_from(data)
+            if magic != self.magic or version != self.version:
+                raise ValueError("Not a version %s bitmap preview." %
+                                 self.version)
+
+            rgba = zlib.decompress(data[self.header.size:])
+            if len(rgba) != width*height*4:
+                raise ValueError("Bitmap preview is the wrong size.")
+
+            os.utime(filepath)
+        except Exception:
+            # deleted or corrupt. forget about it so it's saved again
+            with self._lock:
+                self.misses += 1
+                self._remove(filename)
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return width, height, rgba
+
+    def put(self, key, rgba):
+        '''
+        Saves the width, height, and RGBA bytes under the key, then deletes
+        the least recently used files until the cache is within its max size.
+        '''
+        filename = self.get_filename(key)
+        with self._lock:
+            if not self._scan():
+                return
+            directory = self.directory
+
+        width, height, pixels = rgba
+        data = self.header.pack(self.magic, self.version, width, height) +\
+               zlib.compress(pixels, e_c.BITMAP_DISK_CACHE_COMPRESS_LEVEL)
+
+        # write to a temp file first so partially written files are never
+        # read, as the same preview may be saved from several threads
+        filepath = directory.joinpath(filename)
+        temppath = directory.joinpath(
+            "%s.%s.temp" % (filename, threading.get_ident()))
+        try:
+            with temppath.open("wb") as f:
+                f.write(data)
+            os.replace(str(temppath), str(filepath))
+        except Exception:
+            print(format_exc())
+            try:
+                temppath.unlink()
+            except Exception:
+                pass
+            return
+
+        with self._lock:
+            if self._files is None or self.directory != directory:
+                return
+
+            self.size += len(data) - self._files.pop(filename, 0)
+            self._files[filename] = len(data)
+            self.writes += 1
+            self._evict()
+
+    def clear(self):
+        '''Deletes every file in the cache.'''
+        with self._lock:
+            if self._scan():
+                for filename in tuple(self._files):
+                    self._remove(filename)
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = self.misses = self.writes = self.evictions = 0
+
+    def set_directory(self, directory):
+        '''
+        Sets the directory to save previews in, or disables the cache if
+        directory is None. The directory is created when it's first used.
+        '''
+        directory = None if directory is None else Path(directory)
+        with self._lock:
+            if directory != self.directory:
+                self.directory = directory
+                self._files = None
+                self.size = 0
+
+    def set_max_size(self, max_size):
+        with self._lock:
+            self.max_size = max_size
+            if self._files is not None:
+                self._evict()
+
+    def get_stats_string(self):
+        lookups = self.hits + self.misses
+        return (
+            "Bitmap disk cache: %s files using %.1f of %.1f MB in %s\n"
+            "    %s hits, %s misses, %.1f%% hit rate, %s written, %s evicted" % (
+                len(self._files or ()), self.size / (1 << 20),
+                self.max_size / (1 << 20), self.directory,
+                self.hits, self.misses,
+                (self.hits / lookups if lookups else 0.0)*100,
+                self.writes, self.evictions))
+
+    def _scan(self):
+        # finds the files already saved in the directory, ordered by
+        # when they were last used. returns whether the cache is enabled
+        if self._files is not None:
+            return True
+        elif self.directory is None:
+            return False
+
+        files = []
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            for entry in os.scandir(str(self.directory)):
+                if entry.name.endswith(self.extension) and entry.is_file():
+                    stat = entry.stat()
+                    files.append((stat.st_mtime, entry.name, stat.st_size))
+        except Exception:
+            print(format_exc())
+            print("Could not use '%s' for the bitmap disk cache." %
+                  self.directory)
+            self.directory = None
+            return False
+
+        self._files = OrderedDict(
+            (filename, size) for _, filename, size in sorted(files))
+        self.size = sum(self._files.values())
+        self._evict()
+        return True
+
+    def _remove(self, filename):
+        if self._files is None or filename not in self._files:
+            return
+
+        self.size -= self._files.pop(filename)
+        try:
+            self.directory.joinpath(filename).unlink()
+        except Exception:
+            pass
+
+    def _evict(self):
+        while self.size > self.max_size and self._files:
+            self._remove(next(iter(self._files)))
+            self.evictions += 1
+
+
+# the caches shared by every BitmapDisplayFrame. the disk cache
+# isn't given a directory until the AppWindow configures it
+bitmap_cache = BitmapCache()
+bitmap_disk_cache = BitmapDiskCache()
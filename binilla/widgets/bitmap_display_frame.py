@@ -1,8 +1,13 @@
 import gc
+import hashlib
+import itertools
 import os
-import random
-import tempfile
+import struct
+import sys
+import threading
 import weakref
+import zlib
+from copy import copy
 from traceback import format_exc
 
 import threadsafe_tkinter as tk
@@ -10,6 +15,7 @@
 
 from binilla import editor_constants as e_c
 from binilla.widgets.binilla_widget import BinillaWidget
+from binilla.widgets.bitmap_cache import bitmap_cache, bitmap_disk_cache
 from binilla.widgets.scroll_menu import ScrollMenu
 from binilla.widgets import get_mouse_delta
 from binilla.windows.filedialog import asksaveasfilename
@@ -30,21 +36,223 @@ def import_arbytmap(force=False):
     return bool(arbytmap)
 
 
+def new_texture_hasher():
+    # blake2b is faster, but only exists in python 3.6 and higher
+    if hasattr(hashlib, "blake2b"):
+        return hashlib.blake2b(digest_size=16)
+    return hashlib.sha256()
+
+
+def get_callable_key(func):
+    '''
+    Returns a hashable key of the code a callable runs, so two callables
+    with the same key calculate the same things. Returns None if the
+    callable isn't plain python code, or reads variables from a closure,
+    since there's no telling from its code alone what it will do.
+    '''
+    code = getattr(func, "__code__", None)
+    if code is None or getattr(func, "__closure__", None):
+        return None
+
+    def get_code_key(code):
+        return (code.co_code, code.co_names, tuple(
+            get_code_key(c) if hasattr(c, "co_code") else c
+            for c in code.co_consts))
+
+    return (getattr(func, "__module__", None),
+            getattr(func, "__qualname__", None),
+            getattr(func, "__defaults__", None),
+            get_code_key(code))
+
+
+def pixels_to_bytes(pixels, channel_count):
+    '''
+    Converts packed 8bit pixels, as arbytmap stores them after converting
+    to L8, R8G8B8 or A8R8G8B8, into a bytearray of L, RGB or RGBA bytes.
+    '''
+    if channel_count == 1:
+        return bytearray(pixels)
+
+    if pixels.itemsize != 4:
+        raise ValueError("Expected 32bit pixels, not %sbit." %
+                         (pixels.itemsize*8))
+    elif sys.byteorder == "big":
+        pixels = type(pixels)(pixels.typecode, pixels)
+        pixels.byteswap()
+
+    # each pixel is now stored as B, G, R, A. slicing bytes is
+    # much faster than slicing a memoryview, so copy them out
+    argb = pixels.tobytes()
+    if channel_count == 4:
+        # G and A are already where they belong, so only swap B and R
+        data = bytearray(argb)
+        data[0::4] = argb[2::4]
+        data[2::4] = argb[0::4]
+        return data
+
+    data = bytearray(len(pixels)*channel_count)
+    data[0::channel_count] = argb[2::4]
+    data[1::channel_count] = argb[1::4]
+    data[2::channel_count] = argb[0::4]
+    return data
+
+
+def remap_channels(data, offsets, fills=()):
+    '''
+    Returns a bytearray of the pixels in data, which are 4 bytes each,
+    with the bytes of each pixel rearranged. Each offset is the index of
+    the byte within each pixel to copy to that channel of the output,
+    or None to fill that channel with the corresponding value in fills.
+    If no bytes would be rearranged, data is returned as is.
+    '''
+    channel_count = len(offsets)
+    pixel_count = len(data) // 4
+    if channel_count == 4:
+        if tuple(offsets) == (0, 1, 2, 3):
+            return data
+
+        # copying everything at once is much faster than copying
+        # by channel, so only the channels that moved are copied after
+        out = bytearray(data)
+        for i, offset in enumerate(offsets):
+            if offset is None:
+                fill = fills[i] if i < len(fills) else 0
+                out[i::4] = bytes((fill, ))*pixel_count
+            elif offset != i:
+                out[i::4] = data[offset::4]
+        return out
+
+    out = bytearray(pixel_count*channel_count)
+    for i, offset in enumerate(offsets):
+        if offset is not None:
+            out[i::channel_count] = data[offset::4]
+        elif i < len(fills) and fills[i]:
+            out[i::channel_count] = bytes((fills[i], ))*pixel_count
+    return out
+
+
+def sample_rgba(rgba, width, x, y, w, h, step_x=1, step_y=1,
+                zoom_x=1, zoom_y=1, out_w=None, out_h=None):
+    '''
+    Returns the width, height, and RGBA bytes of the w x h region at (x, y)
+    of the RGBA bytes in rgba, which are width pixels wide. Only every
+    step'th pixel is sampled, and each one is repeated zoom times. The
+    result is cropped to out_w x out_h pixels if given.
+    '''
+    cols = (w + step_x - 1) // step_x
+    rows = (h + step_y - 1) // step_y
+    out_w = cols*zoom_x if out_w is None else min(out_w, cols*zoom_x)
+    out_h = rows*zoom_y if out_h is None else min(out_h, rows*zoom_y)
+    stride = out_w*4
+
+    out = bytearray(stride*out_h)
+    row = bytearray(cols*zoom_x*4)
+    for j in range(min(rows, (out_h + zoom_y - 1) // zoom_y)):
+        start = ((y + j*step_y)*width + x)*4
+        src = rgba[start: start + w*4]
+        if step_x == 1 and zoom_x == 1:
+            row[:] = src
+        else:
+            for c in range(4):
+                channel = src[c::4*step_x]
+                for k in range(zoom_x):
+                    row[4*k + c::4*zoom_x] = channel
+
+        for k in range(j*zoom_y, min((j + 1)*zoom_y, out_h)):
+            out[k*stride: (k + 1)*stride] = row[:stride]
+
+    return out_w, out_h, bytes(out)
+
+
+def get_tile_span(offset, length, scale, src_size, tile_size):
+    '''
+    Returns the start, count, step, and zoom to pass to sample_rgba to make
+    length pixels of a tile, starting offset pixels into an image displayed
+    at scale times its size, along one axis of the image's src_size pixels.
+    '''
+    if scale >= 1:
+        zoom = max(1, min(int(scale), tile_size))
+        start = min(int(offset / scale), src_size - 1)
+        return start, min(-(-length // zoom), src_size - start), 1, zoom
+
+    step = max(1, int(round(1 / scale)))
+    start = offset*step
+    return start, min(length*step, src_size - start), step, 1
+
+
+def make_ppm_data(data, width, height, channel_count):
+    '''
+    Returns a binary PPM(or PGM if channel_count is 1) of the L or RGB bytes.
+    '''
+    magic = b"P5" if channel_count == 1 else b"P6"
+    return b"%s\n%d %d\n255\n" % (magic, width, height) + data
+
+
+def _png_chunk(chunk_type, data):
+    # returned in pieces so the image data is only copied once they're joined
+    crc = zlib.crc32(data, zlib.crc32(chunk_type)) & 0xFFffFFff
+    return (struct.pack(">I", len(data)), chunk_type, data,
+            struct.pack(">I", crc))
+
+
+def make_png_data(data, width, height, channel_count,
+                  compress_level=e_c.PNG_COMPRESS_LEVEL):
+    '''
+    Returns an 8bit PNG of the L, RGB or RGBA bytes. Used for images with
+    alpha, as tkinter PhotoImages can't be given transparency through a PPM.
+    '''
+    color_type = {1: 0, 3: 2, 4: 6}[channel_count]
+    stride = width*channel_count
+
+    # every row must start with the filter type. 0 means unfiltered
+    rows = bytearray(height*(stride + 1))
+    src = memoryview(data)
+    for y in range(height):
+        i = y*(stride + 1) + 1
+        rows[i: i + stride] = src[y*stride: (y + 1)*stride]
+
+    return b"".join((
+        b"\x89PNG\r\n\x1a\n",
+        *_png_chunk(b"IHDR", struct.pack(
+            ">IIBBBBB", width, height, 8, color_type, 0, 0, 0)),
+        *_png_chunk(b"IDAT", zlib.compress(rows, compress_level)),
+        *_png_chunk(b"IEND", b""),
+        ))
+
+
 class PhotoImageHandler():
     # this class utilizes the arbytmap module, but will only
     # import it once an instance of this class is created
     temp_path = ""
     arby = None
-    _images = None  # loaded and cached PhotoImages
+    # PhotoImages, and the decoded pixels they're made from, are cached
+    # in the shared bitmap_cache under keys starting with this id.
+    cache_id = None
+    _cache_ids = itertools.count()
+    # the hex digest of the texture the bitmap_disk_cache keys its
+    # previews by. empty if the texture couldn't be hashed
+    _texture_hash = None
+    _prefetch_queue = ()
+    # incremented whenever prefetching is cancelled, so
+    # anything decoded before that isn't cached
+    _prefetch_generation = 0
+    # the mip level and generation of what's being decoded
+    _prefetching = None
+    _prefetch_lock = None
+    _prefetch_thread = None
     channels = ()
     channel_mapping = None
 
+    # PhotoImages are made in memory now, so temp_path is unused. it's
+    # still accepted so anything passing it doesn't need to change.
     def __init__(self, tex_block=None, tex_info=None, temp_path=""):
         if not import_arbytmap():
             raise ValueError(
                 "Arbytmap is not loaded. Cannot generate PhotoImages.")
         self.arby = arbytmap.Arbytmap()
-        self._images = {}
+        self.cache_id = next(PhotoImageHandler._cache_ids)
+        self._prefetch_queue = []
+        self._prefetch_lock = threading.Lock()
         self.channels = dict(A=False, L=True, R=True, G=True, B=True)
         self.temp_path = temp_path
 
@@ -101,11 +309,283 @@ def set_channel_mode(self, mode=-1):
 
         self.channel_mapping = chan_map
 
-    def load_images(self, mip_levels="all", sub_bitmap_indexes="all"):
-        if not self.temp_path:
-            raise ValueError("Cannot create PhotoImages without a specified "
-                             "temporary filepath to save their PNG's to.")
+    @property
+    def channels_key(self):
+        '''The part of the image cache keys for the channels being shown.'''
+        return frozenset(self.channels.items())
+
+    @property
+    def rgba_sources(self):
+        '''
+        For each channel of the RGBA pixels decode_rgba decodes to, the
+        index of the channel of the texture it holds. The decoding maps
+        the texture's channels to RGBA like so:
+            4 channel:  A, R, G, B  ->  R, G, B, A
+            3 channel:  X, R, G, B  ->  R, G, B
+            2 channel:  A, L        ->  L, L, L, A
+            1 channel:  L(or A)     ->  L, L, L, L
+        3 channel formats have no alpha, so -1 is used for it.
+        '''
+        channel_count = self.channel_count
+        if channel_count == 1:
+            return (0, 0, 0, 0)
+        elif channel_count == 2:
+            return (1, 1, 1, 0)
+        elif channel_count == 3:
+            return (1, 2, 3, -1)
+        return (1, 2, 3, 0)
+
+    def cache_key(self, kind, b, m, c=None):
+        '''
+        Returns the bitmap_cache key of the PhotoImage(if kind is "image")
+        of a sub-bitmap, mip, and channels, or of the decoded RGBA pixels
+        (if kind is "rgba") of a sub-bitmap and mip.
+        '''
+        return (self.cache_id, kind, b, m, c)
+
+    def cache_image(self, b, m, c, fmt, data):
+        '''Makes a PhotoImage from the image data and caches it.'''
+        image = tk.PhotoImage(data=data, format=fmt)
+        # tkinter stores 4 bytes per pixel for every image
+        bitmap_cache.put(self.cache_key("image", b, m, c), image,
+                         image.width()*image.height()*4)
+        return image
+
+    def cache_rgba(self, rgba_data):
+        '''Caches the decoded pixels returned by decode_rgba.'''
+        for (b, m), rgba in rgba_data.items():
+            bitmap_cache.put(self.cache_key("rgba", b, m), rgba, len(rgba[2]))
+
+    @property
+    def texture_hash(self):
+        '''
+        A hash of the texture's pixels, palettes and texture info, used to
+        find its decoded previews in the bitmap_disk_cache when the same
+        texture is opened again. None if the texture can't be hashed, such
+        as when its texture info has callables that read from a closure.
+        '''
+        if self._texture_hash is None:
+            arby = self.arby
+            info = arby.texture_info or {}
+            hashed_info = []
+            for k, v in info.items():
+                if callable(v):
+                    v = get_callable_key(v)
+                    if v is None:
+                        # can't tell this texture apart from others
+                        self._texture_hash = ""
+                        return None
+                elif not isinstance(v, (bool, int, float, str)):
+                    continue
+                hashed_info.append((k, v))
+
+            hasher = new_texture_hasher()
+            # anything that changes how the texture decodes must be hashed
+            hasher.update(repr((
+                getattr(arbytmap, "__version__", None), sorted(hashed_info)
+                )).encode())
+            try:
+                for pixels in arby.texture_block:
+                    hasher.update(pixels)
+                for palette in (arby.palette or ()):
+                    if palette is not None:
+                        hasher.update(palette)
+                self._texture_hash = hasher.hexdigest()[: 32]
+            except TypeError:
+                # pixels aren't stored in a buffer(arrays, bytes, etc)
+                self._texture_hash = ""
+
+        return self._texture_hash or None
+
+    def release_cache(self):
+        '''Cancels prefetching and removes everything this has cached.'''
+        self.cancel_prefetch()
+        bitmap_cache.discard_owner(self.cache_id)
+
+    def get_scoped_texture(self, sub_bitmap_indexes, mip_level):
+        '''
+        Returns the texture block and texture info of a copy of the texture
+        that only contains the requested sub-bitmaps at the requested mip
+        level, so only those need to be converted to display them. Also
+        returns the mip level of the requested images within the copy,
+        and the indexes of the requested sub-bitmaps that exist.
+
+        If the texture info provides its own packed dimension calculations,
+        the larger mip levels are kept, as those calculations may depend
+        on the mip level. Returns None if none of the images exist.
+        '''
+        arby = self.arby
+        tex_info = arby.texture_info
+        tex_block = arby.texture_block
+        sub_bitmap_ct = arby.sub_bitmap_count
+        sub_bitmap_indexes = [
+            sb for sb in sub_bitmap_indexes
+            if sb + mip_level*sub_bitmap_ct < len(tex_block)]
+        if not sub_bitmap_indexes:
+            return None
+
+        first_mip = mip_level
+        if (tex_info.get("packed_width_calc") or
+                tex_info.get("packed_height_calc") or
+                tex_info.get("packed_depth_calc")):
+            first_mip = 0
+
+        palette = None if arby.palette is None else []
+        scoped_block = []
+        for m in range(first_mip, mip_level + 1):
+            for sb in sub_bitmap_indexes:
+                i = sb + m*sub_bitmap_ct
+                # copied since converting may modify them in place
+                scoped_block.append(copy(tex_block[i]))
+                if palette is not None:
+                    pal = arby.palette[i] if i < len(arby.palette) else None
+                    palette.append(None if pal is None else copy(pal))
+
+        scoped_info = dict(
+            tex_info, sub_bitmap_count=len(sub_bitmap_indexes),
+            mipmap_count=mip_level - first_mip,
+            width=max(arby.width >> first_mip, 1),
+            height=max(arby.height >> first_mip, 1),
+            depth=max(arby.depth >> first_mip, 1))
+        if palette is not None:
+            scoped_info["palette"] = palette
+
+        return (scoped_block, scoped_info, mip_level - first_mip,
+                sub_bitmap_indexes)
+
+    def decode_rgba(self, sub_bitmap_indexes="all", mip_levels="all"):
+        '''
+        Converts the requested sub-bitmaps and mip levels to 8bit RGBA and
+        returns them in a dict keyed by (sub_bitmap_index, mip_level). Each
+        value is a tuple of the width, height(times depth), and RGBA bytes.
+        See rgba_sources for which of the texture's channels each holds.
+        Images saved in the bitmap_disk_cache are loaded rather than
+        converted, and converted images are saved to it.
+
+        Nothing on this handler is modified, so this can be called from
+        a separate thread.
+        '''
+        arby = self.arby
+        if arby.texture_block is None:
+            raise TypeError("No bitmap loaded to create PhotoImages of.")
 
+        if sub_bitmap_indexes == "all":
+            sub_bitmap_indexes = range(arby.sub_bitmap_count)
+        if mip_levels == "all":
+            mip_levels = range(arby.mipmap_count + 1)
+
+        chan_map = {1: (0, 0, 0, 0), 2: (0, 1, 1, 1)}.get(
+            self.channel_count, (0, 1, 2, 3))
+
+        texture_hash = self.texture_hash if bitmap_disk_cache.enabled else None
+
+        rgba_data = {}
+        for m in mip_levels:
+            to_convert = []
+            for sb in sub_bitmap_indexes:
+                rgba = None
+                if texture_hash is not None:
+                    rgba = bitmap_disk_cache.get((texture_hash, sb, m))
+
+                if rgba is None:
+                    to_convert.append(sb)
+                else:
+                    rgba_data[(sb, m)] = rgba
+
+            scoped = self.get_scoped_texture(to_convert, m)
+            if scoped is None:
+                continue
+
+            scoped_block, scoped_info, scoped_m, scoped_sbs = scoped
+            conv = arbytmap.Arbytmap()
+            conv.load_new_texture(texture_block=scoped_block,
+                                  texture_info=scoped_info)
+            conv.load_new_conversion_settings(
+                target_format=arbytmap.FORMAT_A8R8G8B8,
+                target_big_endian=False, swizzle_mode=False,
+                tile_mode=False, channel_mapping=chan_map)
+            if not conv.convert_texture():
+                continue
+
+            tex_block = conv.texture_block
+            sub_bitmap_ct = conv.sub_bitmap_count
+            width  = max(conv.width  >> scoped_m, 1)
+            height = (max(conv.height >> scoped_m, 1)*
+                      max(conv.depth  >> scoped_m, 1))
+            for i, sb in enumerate(scoped_sbs):
+                pix = tex_block[i + scoped_m*sub_bitmap_ct]
+                if not conv.packed:
+                    pix = conv.pack_raw(pix)
+
+                rgba = (width, height, bytes(pixels_to_bytes(pix, 4)))
+                rgba_data[(sb, m)] = rgba
+                if texture_hash is not None:
+                    bitmap_disk_cache.put((texture_hash, sb, m), rgba)
+
+        return rgba_data
+
+    def get_image_data(self, rgba, channels=None, channel_mapping=None):
+        '''
+        Returns the PhotoImage format and image data to display the decoded
+        RGBA pixels with, isolating and expanding their channels according
+        to the channel_mapping(the channels currently set by default).
+        '''
+        if channels is None:
+            channels = self.channels
+        if channel_mapping is None:
+            channel_mapping = self.channel_mapping
+
+        # pick which channels to display the same way arbytmap picks
+        # which channels to convert to when saving a texture to a png
+        chan_map = channel_mapping
+        keep_alpha = bool(channels.get("A"))
+        channel_count = len(chan_map) if chan_map else self.channel_count
+        if channel_count == 1:
+            chan_map = (0, ) if chan_map is None else tuple(chan_map)
+        else:
+            if channel_count == 2:
+                a_chan = 0 if keep_alpha else -1
+                chan_map = (a_chan, 1) if chan_map is None else tuple(chan_map)
+                chan_map += (chan_map[1], ) * (4 - len(chan_map))
+            elif chan_map is None:
+                chan_map = (0, 1, 2, 3)
+
+            # reorder from A, R, G, B to R, G, B(, A)
+            a_chan = chan_map[0]
+            chan_map = tuple(chan_map[1: 4])
+            # an alpha channel that's filled in is opaque, so leave it out
+            if keep_alpha and channel_count != 3 and a_chan >= 0:
+                chan_map += (a_chan, )
+            channel_count = len(chan_map)
+
+        # like arbytmap, channels mapped to -1 are filled with 0,
+        # except for alpha(or L if it's the only channel), which is 255
+        fills = {1: (255, ), 4: (0, 0, 0, 255)}.get(channel_count, (0, 0, 0))
+
+        sources = self.rgba_sources
+        offsets = tuple(None if c < 0 or c not in sources else
+                        sources.index(c) for c in chan_map)
+
+        width, height, rgba = rgba
+        data = remap_channels(rgba, offsets, fills)
+        if channel_count == 4:
+            return "png", make_png_data(data, width, height, channel_count)
+        return "ppm", make_ppm_data(data, width, height, channel_count)
+
+    def make_photoimage_data(self, sub_bitmap_indexes="all", mip_levels="all",
+                             channels=None, channel_mapping=None):
+        '''
+        Decodes the requested sub-bitmaps and mip levels and returns the data
+        to create PhotoImages of them from with the channels being shown.
+        The data is returned in a dict keyed by (sub_bitmap_index, mip_level),
+        and each value is a tuple of the PhotoImage format and image data.
+        '''
+        return {
+            key: self.get_image_data(rgba, channels, channel_mapping)
+            for key, rgba in self.decode_rgba(
+                sub_bitmap_indexes, mip_levels).items()}
+
+    def load_images(self, mip_levels="all", sub_bitmap_indexes="all"):
         if not sub_bitmap_indexes and not mip_levels:
             return {}
 
@@ -121,11 +601,7 @@ def load_images(self, mip_levels="all", sub_bitmap_indexes="all"):
 
         new_images = {}
         try:
-            image_list = self.arby.make_photoimages(
-                self.temp_path, bitmap_indexes=sub_bitmap_indexes,
-                keep_alpha=self.channels.get("A"), mip_levels="all",
-                channel_mapping=self.channel_mapping, intensity_to_rgb=True,
-                swizzle_mode=False, tile_mode=False)
+            rgba_data = self.decode_rgba(sub_bitmap_indexes, mip_levels)
         except TypeError:
             print(format_exc())
             print("Could not load texture.")
@@ -135,22 +611,23 @@ def load_images(self, mip_levels="all", sub_bitmap_indexes="all"):
             print(format_exc())
             return {}
 
-        c = frozenset((k, v) for k, v in self.channels.items())
-        mip_ct        = self.max_mipmap + 1
-        sub_bitmap_ct = self.max_sub_bitmap + 1
-        for i in range(mip_ct):
-            for j in range(sub_bitmap_ct):
-                b = sub_bitmap_indexes[j]
-                self._images[(b, i, c)] = image_list[i*sub_bitmap_ct + j]
-
-        for i in range(len(mip_levels)):
-            for j in range(sub_bitmap_ct):
-                key = (sub_bitmap_indexes[j], mip_levels[i], c)
-                new_images[key] = self._images[key]
+        self.cache_rgba(rgba_data)
+        c = self.channels_key
+        for (b, m), rgba in rgba_data.items():
+            try:
+                new_images[(b, m, c)] = self.cache_image(
+                    b, m, c, *self.get_image_data(rgba))
+            except Exception:
+                print(format_exc())
 
         return new_images
 
-    def get_images(self, mip_levels="all", sub_bitmap_indexes="all"):
+    def get_cached_images(self, mip_levels="all", sub_bitmap_indexes="all"):
+        '''
+        Returns the requested images that are cached, making PhotoImages of
+        any that have had their pixels decoded. Images that aren't cached
+        are left as None.
+        '''
         if sub_bitmap_indexes == "all":
             sub_bitmap_indexes = range(self.max_sub_bitmap + 1)
         elif isinstance(sub_bitmap_indexes, int):
@@ -161,29 +638,166 @@ def get_images(self, mip_levels="all", sub_bitmap_indexes="all"):
         elif isinstance(mip_levels, int):
             mip_levels = (mip_levels, )
 
-        sub_bitmap_indexes = list(sub_bitmap_indexes)
-        mip_levels         = list(mip_levels)
-        req_images         = {}
-
-        c = frozenset((k, v) for k, v in self.channels.items())
-        for i in range(len(sub_bitmap_indexes) - 1, -1, -len(mip_levels)):
-            b = sub_bitmap_indexes[i]
-            exists = 0
-            for m in mip_levels:
-                image = self._images.get((b, m, c))
+        req_images = {}
+        c = self.channels_key
+        for m in mip_levels:
+            for b in sub_bitmap_indexes:
+                image = bitmap_cache.get(
+                    self.cache_key("image", b, m, c), count=False)
+                if image is None:
+                    rgba = bitmap_cache.get(
+                        self.cache_key("rgba", b, m), count=False)
+                    if rgba is not None:
+                        try:
+                            image = self.cache_image(
+                                b, m, c, *self.get_image_data(rgba))
+                        except Exception:
+                            print(format_exc())
+
+                bitmap_cache.record_lookup(image is not None)
                 req_images[(b, m, c)] = image
-                exists += image is not None
 
-            if exists == len(mip_levels):
-                sub_bitmap_indexes.pop(i)
+        return req_images
+
+    def get_images(self, mip_levels="all", sub_bitmap_indexes="all"):
+        req_images = self.get_cached_images(mip_levels, sub_bitmap_indexes)
+
+        # sub-bitmaps that need to be loaded, keyed by mip level
+        to_load = {}
+        for (b, m, c), image in req_images.items():
+            if image is None:
+                to_load.setdefault(m, []).append(b)
 
-        if sub_bitmap_indexes:
-            for k, v in self.load_images(
-                    mip_levels, sub_bitmap_indexes).items():
-                req_images[k] = v
+        for m, sub_bitmaps in to_load.items():
+            req_images.update(self.load_images(m, sub_bitmaps))
 
         return req_images
 
+    def get_cached_rgba(self, mip_level, sub_bitmap_indexes="all"):
+        '''
+        Returns the decoded RGBA pixels of the requested sub-bitmaps at the
+        mip level that are cached, keyed by sub-bitmap index. Sub-bitmaps
+        that aren't cached are left as None.
+        '''
+        if sub_bitmap_indexes == "all":
+            sub_bitmap_indexes = range(self.max_sub_bitmap + 1)
+        elif isinstance(sub_bitmap_indexes, int):
+            sub_bitmap_indexes = (sub_bitmap_indexes, )
+
+        req_rgba = {}
+        for b in sub_bitmap_indexes:
+            req_rgba[b] = bitmap_cache.get(self.cache_key("rgba", b, mip_level))
+        return req_rgba
+
+    def get_rgba(self, mip_level, sub_bitmap_indexes="all"):
+        '''
+        Returns the decoded RGBA pixels of the requested sub-bitmaps at the
+        mip level, keyed by sub-bitmap index, decoding any that aren't cached.
+        Sub-bitmaps that couldn't be decoded are left as None.
+        '''
+        req_rgba = self.get_cached_rgba(mip_level, sub_bitmap_indexes)
+        to_load = [b for b, rgba in req_rgba.items() if rgba is None]
+        if to_load:
+            try:
+                rgba_data = self.decode_rgba(to_load, (mip_level, ))
+            except Exception:
+                print(format_exc())
+                rgba_data = {}
+
+            self.cache_rgba(rgba_data)
+            for (b, m), rgba in rgba_data.items():
+                req_rgba[b] = rgba
+
+        return req_rgba
+
+    def prefetch_images(self, mip_levels="all", sub_bitmap_indexes="all"):
+        '''
+        Decodes the pixels of the requested images in a separate thread, so
+        they can quickly be made into PhotoImages if they are requested with
+        any channels. Mip levels are decoded in the order given. Anything
+        queued by a previous call that hasn't started decoding yet is
+        replaced by this request.
+        '''
+        if sub_bitmap_indexes == "all":
+            sub_bitmap_indexes = range(self.max_sub_bitmap + 1)
+        elif isinstance(sub_bitmap_indexes, int):
+            sub_bitmap_indexes = (sub_bitmap_indexes, )
+
+        if mip_levels == "all":
+            mip_levels = range(self.max_mipmap + 1)
+        elif isinstance(mip_levels, int):
+            mip_levels = (mip_levels, )
+
+        with self._prefetch_lock:
+            queue = []
+            for m in mip_levels:
+                if m not in range(self.max_mipmap + 1):
+                    continue
+                elif self._prefetching == (m, self._prefetch_generation):
+                    # already being decoded
+                    continue
+
+                sub_bitmaps = tuple(
+                    b for b in sub_bitmap_indexes
+                    if self.cache_key("rgba", b, m) not in bitmap_cache)
+                if sub_bitmaps:
+                    queue.append((m, sub_bitmaps, self._prefetch_generation))
+
+            self._prefetch_queue = queue
+            if queue and self._prefetch_thread is None:
+                self._prefetch_thread = threading.Thread(
+                    target=self._prefetch_loop, daemon=True)
+                self._prefetch_thread.start()
+
+    def is_prefetching(self, mip_level):
+        '''Returns whether the mip level is queued or being decoded.'''
+        with self._prefetch_lock:
+            if self._prefetching == (mip_level, self._prefetch_generation):
+                return True
+
+            return any(item[0] == mip_level for item in self._prefetch_queue)
+
+    def cancel_prefetch(self, keep_mip_levels=()):
+        '''
+        Clears anything queued to be prefetched, and discards whatever is
+        being decoded once it finishes, as the conversion can't be stopped.
+        If what's being decoded is one of the keep_mip_levels, it's kept.
+        '''
+        with self._prefetch_lock:
+            self._prefetch_queue = []
+            prefetching = self._prefetching
+            if (prefetching is None or prefetching[0] not in keep_mip_levels
+                    or prefetching[1] != self._prefetch_generation):
+                self._prefetch_generation += 1
+
+    def _prefetch_loop(self):
+        while True:
+            with self._prefetch_lock:
+                if not self._prefetch_queue:
+                    self._prefetch_thread = self._prefetching = None
+                    return
+
+                m, sub_bitmaps, generation = self._prefetch_queue.pop(0)
+                self._prefetching = (m, generation)
+
+            try:
+                rgba_data = self.decode_rgba(sub_bitmaps, (m, ))
+            except Exception:
+                print(format_exc())
+                rgba_data = {}
+
+            with self._prefetch_lock:
+                if generation != self._prefetch_generation:
+                    rgba_data = {}
+
+            # cached outside the lock, as caching may release PhotoImages,
+            # which may wait on the ui thread, which may wait on the lock.
+            # cached before clearing _prefetching so the images are
+            # never seen as neither cached nor being decoded.
+            self.cache_rgba(rgba_data)
+            with self._prefetch_lock:
+                self._prefetching = None
+
     @property
     def tex_type(self): return self.arby.texture_type
     @property
@@ -230,10 +844,9 @@ class BitmapDisplayFrame(BinillaWidget, tk.Frame):
     prev_cube_display_index = None
     changing_settings = False
 
-    curr_depth = 0
-    depth_canvas = None
-    depth_canvas_id = None
-    depth_canvas_image_id = None
+    zoom_index = None  # index of the zoom level to display the bitmap at
+    # the zoom levels that can be picked, as powers of 2
+    zoom_levels = tuple(range(e_c.BITMAP_MIN_ZOOM, e_c.BITMAP_MAX_ZOOM + 1))
 
     default_bitmap_mapping = (
         (0,),
@@ -250,28 +863,50 @@ class BitmapDisplayFrame(BinillaWidget, tk.Frame):
         )
 
     _image_handlers = None
-    image_canvas_ids = ()  # does NOT include the depth_canvas_id
+    # the faces of the bitmap being displayed, split into tiles so only the
+    # parts in view need PhotoImages made of them. each is a tuple of the
+    # x, y, width, and height the face is displayed at, the decoded RGBA
+    # pixels it's made from, and the first row and number of rows of them.
+    tile_faces = ()
+    # the tiles that have been made of the tile_faces, keyed by the
+    # index of the face and the x and y of the tile in the face.
+    # each is the canvas item id and the PhotoImage displayed by it,
+    # as canvases don't keep PhotoImages alive.
+    tiles = None
+    # the width and height of everything displayed on the image_canvas
+    content_size = (0, 0)
+    # the settings the tile_faces were laid out with
+    _layout_key = None
+    _tile_update_id = None
+    # the point on the image_canvas to zoom in or out around
+    _zoom_anchor = None
+    # whether the tile_faces are a scaled up smaller mip level
+    # being shown until the requested one is decoded
+    showing_placeholder = False
+    # the handler decoding images in the background, the
+    # (cache_id, mip) of the images, and the id of the
+    # after call checking if they're done
+    _decode_handler = None
+    _decode_request = None
+    _decode_poll_id = None
+    # the request that was last finished being decoded
+    _decode_finished = None
     textures = ()  # List of textures ready to be loaded into arbytmap.
     # Structure is as follows:  [ (tex_block0, tex_info0),
     #                             (tex_block1, tex_info1),
     #                             (tex_block2, tex_info2), ... ]
 
-    temp_root = os.path.join(tempfile.gettempdir(), "arbytmaps")
-    temp_dir = ''
-
     def __init__(self, master, *args, **kwargs):
         BinillaWidget.__init__(self)
-        self.temp_root = kwargs.pop('temp_root', self.temp_root)
+        # images aren't written to temp files anymore, so this is ignored
+        kwargs.pop('temp_root', None)
         textures = kwargs.pop('textures', ())
         app_root = kwargs.pop('app_root', ())
 
-        self.image_canvas_ids = []
+        self.tiles = {}
         self.textures = []
         self._image_handlers = {}
 
-        temp_name = str(int(random.random() * (1<<32)))
-        self.temp_dir = os.path.join(self.temp_root, temp_name)
-
         kwargs.update(relief='flat', bd=self.frame_depth,
                       bg=self.default_bg_color)
         tk.Frame.__init__(self, master, *args, **kwargs)
@@ -281,6 +916,7 @@ def __init__(self, master, *args, **kwargs):
         self.depth_index   = tk.IntVar(self)
         self.channel_index = tk.IntVar(self)
         self.cube_display_index = tk.IntVar(self)
+        self.zoom_index = tk.IntVar(self, self.zoom_levels.index(0))
         self.root_canvas = tk.Canvas(self, highlightthickness=0)
         self.root_frame = tk.Frame(self.root_canvas, highlightthickness=0)
 
@@ -291,9 +927,8 @@ def __init__(self, master, *args, **kwargs):
         self.image_root_frame = tk.Frame(self.root_frame, highlightthickness=0)
         self.image_canvas = tk.Canvas(self.image_root_frame,
                                       highlightthickness=0,
-                                      bg=self.bitmap_canvas_bg_color)
-        self.depth_canvas = tk.Canvas(self.image_canvas, highlightthickness=0,
-                                      bg=self.bitmap_canvas_bg_color)
+                                      bg=self.bitmap_canvas_bg_color,
+                                      xscrollincrement=1, yscrollincrement=1)
 
         self.bitmap_menu  = ScrollMenu(self.controls_frame0, menu_width=7,
                                        variable=self.bitmap_index, can_scroll=True)
@@ -306,6 +941,12 @@ def __init__(self, master, *args, **kwargs):
         self.cube_display_menu = ScrollMenu(self.controls_frame1, menu_width=9,
                                             variable=self.cube_display_index,
                                             options=("cross", "linear"), can_scroll=True)
+        self.zoom_menu = ScrollMenu(self.controls_frame2, menu_width=9,
+                                    variable=self.zoom_index, can_scroll=True,
+                                    options=tuple(
+                                        "%sx" % (1 << z) if z >= 0 else
+                                        "1/%sx" % (1 << -z)
+                                        for z in self.zoom_levels))
 
         self.save_button = ttk.Button(self.controls_frame2, width=11,
                                      text="Browse", command=self.save_as)
@@ -321,6 +962,7 @@ def __init__(self, master, *args, **kwargs):
         labels.append(tk.Label(self.controls_frame0, text="Channels"))
         labels.append(tk.Label(self.controls_frame1, text="Cubemap display"))
         labels.append(tk.Label(self.controls_frame2, text="Save to file"))
+        labels.append(tk.Label(self.controls_frame2, text="Zoom"))
         for lbl in labels:
             lbl.config(width=15, anchor='w',
                        bg=self.default_bg_color, fg=self.text_normal_color,
@@ -332,7 +974,7 @@ def __init__(self, master, *args, **kwargs):
                                 command=self.root_canvas.yview)
         self.root_canvas.config(xscrollcommand=self.hsb.set, xscrollincrement=1,
                                 yscrollcommand=self.vsb.set, yscrollincrement=1)
-        for w in [self.root_frame, self.root_canvas, self.image_canvas,
+        for w in [self.root_frame, self.root_canvas,
                   self.controls_frame0, self.controls_frame1,
                   self.controls_frame2] + labels:
             if e_c.IS_LNX:
@@ -344,6 +986,25 @@ def __init__(self, master, *args, **kwargs):
                 w.bind('<Shift-MouseWheel>', self.mousewheel_scroll_x)
                 w.bind('<MouseWheel>',       self.mousewheel_scroll_y)
 
+        # the image_canvas scrolls itself when the bitmap doesn't fit in it
+        if e_c.IS_LNX:
+            self.image_canvas.bind('<Shift-4>', self.mousewheel_scroll_image_x)
+            self.image_canvas.bind('<Shift-5>', self.mousewheel_scroll_image_x)
+            self.image_canvas.bind('<4>',       self.mousewheel_scroll_image_y)
+            self.image_canvas.bind('<5>',       self.mousewheel_scroll_image_y)
+            self.image_canvas.bind('<Control-4>', self.mousewheel_zoom)
+            self.image_canvas.bind('<Control-5>', self.mousewheel_zoom)
+        else:
+            self.image_canvas.bind('<Shift-MouseWheel>',
+                                   self.mousewheel_scroll_image_x)
+            self.image_canvas.bind('<MouseWheel>',
+                                   self.mousewheel_scroll_image_y)
+            self.image_canvas.bind('<Control-MouseWheel>',
+                                   self.mousewheel_zoom)
+        self.image_canvas.bind('<ButtonPress-1>', self.start_pan)
+        self.image_canvas.bind('<B1-Motion>', self.pan)
+        self.root_canvas.bind('<Configure>', self.update_viewport_size)
+
         # pack everything
         # pack in this order so scrollbars aren't shrunk
         self.root_frame_id = self.root_canvas.create_window(
@@ -365,11 +1026,13 @@ def __init__(self, master, *args, **kwargs):
         self.bitmap_menu.pack(side='left', padx=padx, pady=pady)
         self.mipmap_menu.pack(side='left', padx=padx, pady=pady)
         self.depth_menu.pack(side='left', padx=padx, pady=pady)
-        for lbl in labels[3:]:
+        for lbl in labels[3:6]:
             lbl.pack(side='left', padx=(15, 0), pady=pady)
         self.save_button.pack(side='left', padx=padx, pady=pady)
         self.channel_menu.pack(side='left', padx=padx, pady=pady)
         self.cube_display_menu.pack(side='left', padx=padx, pady=pady)
+        labels[6].pack(side='left', padx=(15, 0), pady=pady)
+        self.zoom_menu.pack(side='left', padx=padx, pady=pady)
 
         self.change_textures(textures)
 
@@ -378,20 +1041,33 @@ def __init__(self, master, *args, **kwargs):
         self.write_trace(self.depth_index, self.settings_changed)
         self.write_trace(self.cube_display_index, self.settings_changed)
         self.write_trace(self.channel_index, self.settings_changed)
+        self.write_trace(self.zoom_index, self.zoom_changed)
 
         self.apply_style()
 
     def destroy(self):
+        try:
+            self.cancel_decode()
+            if self._tile_update_id is not None:
+                self.after_cancel(self._tile_update_id)
+        except Exception:
+            pass
         try:
             self.clear_canvas()
-            self.clear_depth_canvas()
         except Exception:
             pass
         try: del self.textures[:]
         except Exception: pass
+        try:
+            for handler in self._image_handlers.values():
+                handler.release_cache()
+        except Exception:
+            pass
         try: del self._image_handlers[:]
         except Exception: pass
-        self.image_canvas_ids = self._image_handlers = None
+        self._image_handlers = None
+        self.tiles = {}
+        self.tile_faces = ()
         self.textures = None
         tk.Frame.destroy(self)
         self.delete_all_traces()
@@ -406,7 +1082,7 @@ def active_image_handler(self):
         elif b not in self._image_handlers:
             # make a new PhotoImageHandler if one doesnt exist already
             self._image_handlers[b] = PhotoImageHandler(
-                self.textures[b][0], self.textures[b][1], self.temp_dir)
+                self.textures[b][0], self.textures[b][1])
 
         return self._image_handlers[b]
 
@@ -434,19 +1110,92 @@ def mousewheel_scroll_y(self, e):
         delta = getattr(self.app_root, "scroll_increment_y", 20)
         self.root_canvas.yview_scroll(int(get_mouse_delta(e) * delta), "units")
 
+    def mousewheel_scroll_image_x(self, e):
+        # scroll the whole frame if the bitmap fits in the image_canvas
+        if self.image_canvas.winfo_width() >= self.content_size[0]:
+            return self.mousewheel_scroll_x(e)
+
+        delta = getattr(self.app_root, "scroll_increment_x", 20)
+        self.image_canvas.xview_scroll(int(get_mouse_delta(e) * delta), "units")
+        self.schedule_tile_update()
+
+    def mousewheel_scroll_image_y(self, e):
+        # scroll the whole frame if the bitmap fits in the image_canvas
+        if self.image_canvas.winfo_height() >= self.content_size[1]:
+            return self.mousewheel_scroll_y(e)
+
+        delta = getattr(self.app_root, "scroll_increment_y", 20)
+        self.image_canvas.yview_scroll(int(get_mouse_delta(e) * delta), "units")
+        self.schedule_tile_update()
+
+    def mousewheel_zoom(self, e):
+        self.set_zoom(self.zoom_index.get() - get_mouse_delta(e), e.x, e.y)
+
+    def start_pan(self, e):
+        self.image_canvas.scan_mark(e.x, e.y)
+
+    def pan(self, e):
+        self.image_canvas.scan_dragto(e.x, e.y, gain=1)
+        self.schedule_tile_update()
+
+    def set_zoom(self, zoom_index, anchor_x=None, anchor_y=None):
+        '''
+        Sets the zoom level to display the bitmap at, keeping the point on
+        the image_canvas at (anchor_x, anchor_y) over the same part of the
+        bitmap. The center of the image_canvas is used if not given.
+        '''
+        zoom_index = max(0, min(zoom_index, len(self.zoom_levels) - 1))
+        if zoom_index != self.zoom_index.get():
+            self._zoom_anchor = (anchor_x, anchor_y)
+            self.zoom_index.set(zoom_index)
+
+    def zoom_changed(self, *args):
+        canvas = self.image_canvas
+        anchor_x, anchor_y = self._zoom_anchor or (None, None)
+        self._zoom_anchor = None
+        if anchor_x is None:
+            anchor_x = canvas.winfo_width() // 2
+        if anchor_y is None:
+            anchor_y = canvas.winfo_height() // 2
+
+        # where the anchor is over the bitmap, as a fraction of its size
+        old_w, old_h = self.content_size
+        frac_x = canvas.canvasx(anchor_x) / old_w if old_w else 0
+        frac_y = canvas.canvasy(anchor_y) / old_h if old_h else 0
+
+        self.update_bitmap()
+        new_w, new_h = self.content_size
+        if new_w and new_h:
+            canvas.xview_moveto((frac_x*new_w - anchor_x) / new_w)
+            canvas.yview_moveto((frac_y*new_h - anchor_y) / new_h)
+        self.schedule_tile_update()
+
+    def update_viewport_size(self, e=None):
+        '''
+        Sizes the image_canvas to fit the bitmap being displayed, or to fit
+        as much of it as the frame can show without scrolling the controls
+        out of view. The rest of the bitmap is scrolled into view within it.
+        '''
+        content_w, content_h = self.content_size
+        controls_h = sum(w.winfo_reqheight() for w in (
+            self.controls_frame0, self.controls_frame1, self.controls_frame2))
+        min_size = e_c.BITMAP_VIEWPORT_MIN_SIZE
+        avail_w = max(self.root_canvas.winfo_width(), min_size)
+        avail_h = max(self.root_canvas.winfo_height() - controls_h, min_size)
+
+        self.image_canvas.config(
+            width=min(content_w, avail_w), height=min(content_h, avail_h),
+            scrollregion=(0, 0, content_w, content_h))
+        self.update_scroll_regions()
+        self.schedule_tile_update()
+
     def update_scroll_regions(self):
-        if not self.image_canvas_ids and not self.depth_canvas_id:
+        if not self.tile_faces:
             return
         rf = self.root_frame
-        region = self.image_canvas.bbox(tk.ALL)
-        # bbox region isn't actually x, y, w, h, but if the
-        # origin is at (0,0) we can treat it like that
-        if region is None:
-            x, y, w, h = (0,0,0,0)
-        else:
-            x, y, w, h = region
+        w = int(self.image_canvas.cget("width"))
+        h = int(self.image_canvas.cget("height"))
 
-        self.image_canvas.config(scrollregion=(x, y, w, h))
         rf.update_idletasks()
         max_w = w
         total_h = h
@@ -487,26 +1236,11 @@ def save_as(self, e=None, initial_dir=None):
             target_big_endian=False, tile_mode=False
             )
 
-    def clear_depth_canvas(self):
-        self.depth_canvas.delete(tk.ALL)
-        self.prev_depth_index = None
-        self.prev_cube_display_index = None
-        self.depth_canvas_image_id = None
-
     def clear_canvas(self):
         self.image_canvas.delete(tk.ALL)
-        self.clear_depth_canvas()
-        self.depth_canvas_id = None
-        self.image_canvas_ids = []
-
-    def hide_depth_canvas(self):
-        if self.depth_canvas_id is not None:
-            self.image_canvas.delete(self.depth_canvas_id)
-            self.depth_canvas_id = None
-
-    def show_depth_canvas(self):
-        self.depth_canvas_id = self.image_canvas.create_window(
-            (0, 0), anchor="nw", window=self.depth_canvas)
+        self.tiles = {}
+        self.tile_faces = ()
+        self._layout_key = None
 
     def change_textures(self, textures):
         assert hasattr(textures, '__iter__')
@@ -515,7 +1249,11 @@ def change_textures(self, textures):
             assert len(tex) == 2
             assert isinstance(tex[1], dict)
 
-        if self._image_handlers: del self._image_handlers
+        self.cancel_decode()
+        if self._image_handlers:
+            for handler in self._image_handlers.values():
+                handler.release_cache()
+            del self._image_handlers
         if self.textures:        del self.textures[:]
 
         self.textures = list(textures)
@@ -537,11 +1275,110 @@ def change_textures(self, textures):
         self.update_bitmap(force=True)
 
     def get_images(self):
+        '''Returns PhotoImages of each sub-bitmap at the current mip level.'''
         image_handler = self.active_image_handler
         if not image_handler: return
         images = image_handler.get_images(mip_levels=self.mipmap_index.get())
         return tuple(images[i] for i in sorted(images.keys()))
 
+    def get_display_sources(self):
+        '''
+        Returns the decoded RGBA pixels of each sub-bitmap to display, keyed
+        by sub-bitmap index, and the mip level they're of. Mip levels that
+        aren't decoded yet are decoded in a separate thread, and until they
+        are ready the smallest mip level is returned in their place(or
+        nothing is returned if it isn't ready either).
+        '''
+        handler = self.active_image_handler
+        if not handler:
+            return {}, None
+        mip = self.mipmap_index.get()
+        request = (handler.cache_id, mip)
+        sources = handler.get_cached_rgba(mip)
+        finished, self._decode_finished = self._decode_finished, None
+
+        self.showing_placeholder = False
+        if None not in sources.values():
+            pass
+        elif request == finished:
+            # decoding finished without decoding all of them. decode
+            # them here so any errors are printed and the rest are shown
+            sources = handler.get_rgba(mip)
+        else:
+            if request != self._decode_request:
+                self.start_decode(handler, mip, request)
+
+            small_mip = handler.max_mipmap
+            sources = handler.get_cached_rgba(small_mip)
+            if small_mip == mip or None in sources.values():
+                return {}, None
+
+            self.showing_placeholder = True
+            return sources, small_mip
+
+        # decode the neighboring mip levels in the background
+        # so stepping through the mip levels is quick
+        handler.prefetch_images((mip - 1, mip + 1))
+        return sources, mip
+
+    def start_decode(self, handler, mip, request):
+        '''
+        Starts decoding the mip level in a separate thread, after decoding
+        the smallest mip level to show in its place, and cancels decoding
+        anything that was requested before.
+        '''
+        if self._decode_handler not in (None, handler):
+            self._decode_handler.cancel_prefetch()
+
+        # the mip level may already be being decoded by a prefetch
+        # of the neighboring mip levels, so don't throw that away
+        mip_levels = (mip, ) if mip == handler.max_mipmap else (
+            handler.max_mipmap, mip)
+        handler.cancel_prefetch(keep_mip_levels=mip_levels)
+        handler.prefetch_images(mip_levels)
+        self._decode_handler = handler
+        self._decode_request = request
+        if self._decode_poll_id is None:
+            self._decode_poll_id = self.after(
+                e_c.BITMAP_DECODE_POLL_MS, self.check_decode)
+
+    def cancel_decode(self):
+        if self._decode_poll_id is not None:
+            self.after_cancel(self._decode_poll_id)
+        if self._decode_handler is not None:
+            self._decode_handler.cancel_prefetch()
+
+        self._decode_poll_id = self._decode_handler = None
+        self._decode_request = self._decode_finished = None
+
+    def check_decode(self):
+        '''
+        Displays the requested images once they're decoded, and displays
+        the placeholder for them if it's decoded first.
+        '''
+        self._decode_poll_id = None
+        handler = self._decode_handler
+        if handler is None or handler is not self.active_image_handler:
+            self.cancel_decode()
+            return
+
+        mip = self.mipmap_index.get()
+        request = (handler.cache_id, mip)
+        if self._decode_request != request:
+            self.cancel_decode()
+            return
+        elif not handler.is_prefetching(mip):
+            self._decode_request = None
+            self._decode_finished = request
+            self.update_bitmap(force=True)
+            return
+        elif not self.showing_placeholder and not handler.is_prefetching(
+                handler.max_mipmap):
+            self.update_bitmap(force=True)
+
+        self._decode_poll_id = self.after(
+            e_c.BITMAP_DECODE_POLL_MS, self.check_decode)
+
     def settings_changed(self, *args, force=False):
         handler = self.active_image_handler
         force = False
@@ -615,52 +1452,139 @@ def _display_cubemap(self, force=False, bitmap_mapping=None):
         self._display_2d_bitmap(force, bitmap_mapping)
 
     def _display_2d_bitmap(self, force=False, bitmap_mapping=None):
-        images = self.get_images()
-        if not images or not(self.should_update or force): return
-        w = max(image.width()  for image in images)
-        h = max(image.height() for image in images)
         if bitmap_mapping is None:
             bitmap_mapping = self.default_bitmap_mapping
+        self.layout_tiles(force, bitmap_mapping)
+
+    def _display_3d_bitmap(self, force=False):
+        self.layout_tiles(force)
+
+    def layout_tiles(self, force=False, bitmap_mapping=None):
+        '''
+        Lays out the faces of the bitmap to display at the current zoom level
+        in the arrangement given by the bitmap_mapping(or the slice at the
+        current depth if the bitmap is 3D), and schedules making tiles of
+        the parts of them in view. Nothing is redone if none of the
+        settings have changed since they were last laid out.
+        '''
+        handler = self.active_image_handler
+        sources, src_mip = self.get_display_sources()
+        if not sources or handler is None:
+            return
+
+        mip = self.mipmap_index.get()
+        layout_key = (handler.cache_id, mip, src_mip, handler.channels_key,
+                      self.zoom_index.get(), self.depth_index.get(),
+                      bitmap_mapping)
+        if layout_key == self._layout_key and not force:
+            return
+
+        scale = 2.0**self.zoom_levels[self.zoom_index.get()]
+        w = max(1, int(handler.mip_width(mip)*scale))
+        h = max(1, int(handler.mip_height(mip)*scale))
+        rgbas = [sources[i] for i in sorted(sources.keys())]
+
+        faces = []
+        if handler.tex_type == "3D":
+            # display the rows of the slice at the current depth
+            src_h = handler.mip_height(src_mip)
+            src_depth = handler.mip_depth(src_mip)
+            depth = min(self.depth_index.get()*src_depth //
+                        handler.mip_depth(mip), src_depth - 1)
+            bitmap_mapping = self.default_bitmap_mapping
+            if rgbas[0] is not None:
+                faces.append((0, 0, w, h, rgbas[0], depth*src_h, src_h))
+        else:
+            for y, line in enumerate(bitmap_mapping):
+                for x, image_index in enumerate(line):
+                    if (image_index in range(len(rgbas)) and
+                            rgbas[image_index] is not None):
+                        rgba = rgbas[image_index]
+                        faces.append((x*w, y*h, w, h, rgba, 0, rgba[1]))
 
         self.clear_canvas()
-        # place the bitmaps on the canvas
-        y = 0
-        for line in bitmap_mapping:
-            max_column_ct = max(0, len(line))
-            x = 0
-            for image_index in line:
-                if image_index in range(len(images)):
-                    # place the cube face on the canvas
-                    self.image_canvas_ids.append(
-                        self.image_canvas.create_image(
-                            (x, y), anchor="nw", image=images[image_index],
-                            tags=("BITMAP", "2D_BITMAP")))
-                x += w
-            y += h
-        self.update_scroll_regions()
+        self.tile_faces = tuple(faces)
+        self.content_size = (max(len(line) for line in bitmap_mapping)*w,
+                             len(bitmap_mapping)*h)
+        self._layout_key = layout_key
+        self.update_viewport_size()
+
+    def schedule_tile_update(self):
+        if self._tile_update_id is None:
+            self._tile_update_id = self.after_idle(self.update_tiles)
+
+    def update_tiles(self):
+        '''
+        Makes tiles of the parts of the tile_faces that are in view, and
+        deletes the tiles that have been scrolled out of view, so only the
+        part of the bitmap being looked at has PhotoImages made of it.
+        '''
+        self._tile_update_id = None
+        handler = self.active_image_handler
+        canvas = self.image_canvas
+        size = e_c.BITMAP_TILE_SIZE
+        # include the tiles just out of view, so they're ready
+        # before they're scrolled into view
+        view_x0 = canvas.canvasx(0) - size
+        view_y0 = canvas.canvasy(0) - size
+        view_x1 = view_x0 + canvas.winfo_width() + 2*size
+        view_y1 = view_y0 + canvas.winfo_height() + 2*size
+
+        in_view = set()
+        for i, face in enumerate(self.tile_faces):
+            x, y, w, h = face[: 4]
+            for tile_y in range(max(0, int(view_y0 - y) // size),
+                                min((h + size - 1) // size,
+                                    int(view_y1 - y) // size + 1)):
+                for tile_x in range(max(0, int(view_x0 - x) // size),
+                                    min((w + size - 1) // size,
+                                        int(view_x1 - x) // size + 1)):
+                    in_view.add((i, tile_x, tile_y))
+
+        for key in set(self.tiles) - in_view:
+            item_id = self.tiles.pop(key)[0]
+            if item_id is not None:
+                canvas.delete(item_id)
+
+        for key in sorted(in_view - set(self.tiles)):
+            i, tile_x, tile_y = key
+            face = self.tile_faces[i]
+            item_id = image = None
+            try:
+                image = self.make_tile(handler, face, tile_x, tile_y)
+            except Exception:
+                print(format_exc())
+
+            if image is not None:
+                item_id = canvas.create_image(
+                    (face[0] + tile_x*size, face[1] + tile_y*size),
+                    anchor="nw", image=image, tags=("BITMAP", "TILE"))
+            # tiles that couldn't be made are remembered
+            # so making them isn't retried on every scroll
+            self.tiles[key] = (item_id, image)
+
+    def make_tile(self, handler, face, tile_x, tile_y):
+        '''
+        Returns a PhotoImage of the tile at (tile_x, tile_y) in the grid of
+        tiles the face is split into, sampling the face's RGBA pixels down
+        to the size it's displayed at or repeating them up to it.
+        '''
+        size = e_c.BITMAP_TILE_SIZE
+        w, h, rgba, first_row, src_h = face[2:]
+        src_w = rgba[0]
+        out_w = min(size, w - tile_x*size)
+        out_h = min(size, h - tile_y*size)
+        x, x_count, step_x, zoom_x = get_tile_span(
+            tile_x*size, out_w, w / src_w, src_w, size)
+        y, y_count, step_y, zoom_y = get_tile_span(
+            tile_y*size, out_h, h / src_h, src_h, size)
+        if min(out_w, out_h, x_count, y_count) <= 0:
+            return None
 
-    def _display_3d_bitmap(self, force=False):
-        if self.should_update or self.depth_canvas_image_id is None or force:
-            self.clear_canvas()
-            self.show_depth_canvas()
-            handler = self.active_image_handler
-            images  = self.get_images()
-            if not(images and handler): return
-            m = self.mipmap_index.get()
-            w, h = images[0].width(), handler.mip_height(m)
-            self.curr_depth = handler.mip_depth(m)
-
-            # place the bitmap on the canvas
-            self.depth_canvas_image_id = self.depth_canvas.create_image(
-                (0, 0), anchor="nw", image=images[0],
-                tags=("BITMAP", "3D_BITMAP"))
-            self.image_canvas.itemconfig(self.depth_canvas_id,
-                                         width=w, height=h)
-            self.depth_canvas.config(scrollregion="0 0 %s %s" % (w, h))
-            self.update_scroll_regions()
-
-        self.depth_canvas.coords(self.depth_canvas_image_id,
-                                 (0, -self.depth_index.get()*self.curr_depth))
+        tile = sample_rgba(rgba[2], src_w, x, y + first_row, x_count, y_count,
+                           step_x, step_y, zoom_x, zoom_y, out_w, out_h)
+        fmt, data = handler.get_image_data(tile)
+        return tk.PhotoImage(data=data, format=fmt)
 
 
 class BitmapDisplayButton(BinillaWidget, ttk.Button):
@@ -1,8 +1,8 @@
 
 __all__ = (
-    "FieldWidget",
+    "FieldWidget", "FieldWidgetPool", "DirtyWidgetTracker",
     "ContainerFrame", "ColorPickerFrame", "SimpleImageFrame",
-    "ArrayFrame", "DynamicArrayFrame",
+    "ArrayFrame", "DynamicArrayFrame", "ArrayTableFrame",
     "DataFrame", "NullFrame", "VoidFrame", "PadFrame", "RawdataFrame",
     "UnionFrame", "StreamAdapterFrame",
     "BoolFrame", "BoolSingleFrame",
@@ -12,10 +12,13 @@
     )
 
 from binilla.widgets.field_widgets.field_widget import FieldWidget
+from binilla.widgets.field_widgets.field_widget_pool import FieldWidgetPool
+from binilla.widgets.field_widgets.dirty_widgets import DirtyWidgetTracker
 from binilla.widgets.field_widgets.container_frame import ContainerFrame
 from binilla.widgets.field_widgets.simple_image_frame import SimpleImageFrame
 from binilla.widgets.field_widgets.color_picker_frame import ColorPickerFrame
 from binilla.widgets.field_widgets.array_frame import ArrayFrame, DynamicArrayFrame
+from binilla.widgets.field_widgets.array_table_frame import ArrayTableFrame
 from binilla.widgets.field_widgets.bool_frame import BoolFrame, BoolSingleFrame
 from binilla.widgets.field_widgets.data_frame import DataFrame, NullFrame,\
      VoidFrame, PadFrame, RawdataFrame
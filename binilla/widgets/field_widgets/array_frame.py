@@ -1,13 +1,84 @@
 import threadsafe_tkinter as tk
 import tkinter.ttk as ttk
 
+from collections.abc import Mapping
 from copy import deepcopy
 from traceback import format_exc
 
 from binilla import editor_constants as e_c
 from binilla.widgets.scroll_menu import ScrollMenu
-from binilla.widgets.field_widgets import field_widget, container_frame,\
-     data_frame
+from binilla.widgets.field_widgets import field_widget, container_frame
+
+
+class ArrayOptionCache(Mapping):
+    '''
+    A mapping of {index: option name} for the elements of an array that can
+    be patched in place when elements are shifted, inserted, or deleted.
+
+    Element names are stored in a list(None where the element has no
+    name), so inserting or deleting doesn't renumber any keys, and the
+    labels are only formatted when an option is actually looked up.
+    '''
+    __slots__ = ("names", "fixed_names", "label_format")
+
+    def __init__(self, names=(), fixed_names=None, label_format=None):
+        # names of each element. these move with the elements
+        self.names = list(names)
+        # names that are tied to an index rather than an element
+        self.fixed_names = dict(fixed_names) if fixed_names else {}
+        # format string taking the (index, name) to make each label from
+        self.label_format = label_format
+
+    def __contains__(self, index):
+        if index in self.fixed_names:
+            return True
+        try:
+            return index >= 0 and self.names[index] is not None
+        except (IndexError, TypeError):
+            return False
+
+    def __getitem__(self, index):
+        name = self.fixed_names.get(index)
+        if name is None:
+            try:
+                if index < 0:
+                    raise IndexError()
+                name = self.names[index]
+            except (IndexError, TypeError):
+                name = None
+
+            if name is None:
+                raise KeyError(index)
+
+        if self.label_format:
+            return self.label_format % (index, name)
+        return name
+
+    def __iter__(self):
+        names = self.names
+        fixed_names = self.fixed_names
+        indices = set(i for i in fixed_names if isinstance(i, int))
+        indices.update(i for i in range(len(names)) if names[i] is not None)
+        return iter(sorted(indices))
+
+    def __len__(self):
+        return sum(1 for i in self)
+
+    def swap(self, i, j):
+        names = self.names
+        names[i], names[j] = names[j], names[i]
+
+    def insert(self, index, name=None):
+        self.names.insert(index, name)
+
+    def pop(self, index):
+        return self.names.pop(index)
+
+    def set_name(self, index, name=None):
+        self.names[index] = name
+
+    def clear(self):
+        del self.names[:]
 
 
 class ArrayFrame(container_frame.ContainerFrame):
@@ -218,43 +289,82 @@ def get_options(self, opt_index=None):
 
         return self.option_cache.get(opt_index)
 
-    def generate_options(self, opt_index=None):
-        # sort the options by value(values are integers)
-        options = {i: n for n, i in self.desc.get('NAME_MAP', {}).items()}
+    def get_option_name(self, index):
+        '''
+        Returns the name of the array element at index, or None
+        if the element should be displayed with the default name.
+        '''
+        sub_node = self.node[index]
+        if not hasattr(sub_node, 'desc'):
+            return None
 
-        if self.node:
-            node, desc = self.node, self.desc
-            sub_desc = desc['SUB_STRUCT']
-            def_struct_name = sub_desc['NAME']
-            if self.use_gui_names and 'GUI_NAME' in sub_desc:
-                def_struct_name = sub_desc['GUI_NAME']
+        sub_desc = self.desc['SUB_STRUCT']
+        def_struct_name = sub_desc['NAME']
+        if self.use_gui_names and 'GUI_NAME' in sub_desc:
+            def_struct_name = sub_desc['GUI_NAME']
 
-            options_to_generate = range(len(node))
-            if opt_index is not None:
-                options_to_generate = (
-                    (opt_index, ) if opt_index in options_to_generate else ())
+        sub_desc = sub_node.desc
+        sub_struct_name = sub_desc.get('GUI_NAME', sub_desc['NAME'])
+        if sub_struct_name == def_struct_name:
+            return None
+        return sub_struct_name
 
-            for i in options_to_generate:
-                if i in options:
-                    continue
-                sub_node = node[i]
-                if not hasattr(sub_node, 'desc'):
-                    continue
-                sub_desc = sub_node.desc
-                sub_struct_name = sub_desc.get('GUI_NAME', sub_desc['NAME'])
-                if sub_struct_name == def_struct_name:
-                    continue
+    def get_fixed_option_names(self):
+        '''Returns the option names that are tied to an index.'''
+        return {i: n for n, i in self.desc.get('NAME_MAP', {}).items()}
+
+    def generate_options(self, opt_index=None):
+        node = self.node
+        fixed_names = self.get_fixed_option_names()
+        if opt_index is not None:
+            options = ArrayOptionCache(fixed_names=fixed_names)
+            if node and opt_index in range(len(node)):
+                options.names = [None]*opt_index
+                options.names.append(self.get_option_name(opt_index))
+            return options.get(opt_index, None)
+
+        names = ()
+        if node:
+            names = [self.get_option_name(i) for i in range(len(node))]
+
+        options = ArrayOptionCache(names, fixed_names)
+        self.options_sane = True
+        self.option_cache = options
+        if self.sel_menu is not None:
+            self.sel_menu.options_menu_sane = False
+            self.sel_menu.max_index = len(node) - 1 if node else -1
+        return options
 
-                options[i] = sub_struct_name
+    def patch_option_cache(self, edit_type, index):
+        '''
+        Updates the option cache in place for an edit that shifted,
+        inserted, or deleted the array element at index, rather than
+        regenerating the options for every element in the array.
+        '''
+        if self.sel_menu is not None:
+            self.sel_menu.options_menu_sane = False
 
-        if opt_index is None:
-            self.options_sane = True
-            self.option_cache = options
-            if self.sel_menu is not None:
-                self.sel_menu.options_menu_sane = False
-                self.sel_menu.max_index = len(node) - 1
-            return options
-        return options.get(opt_index, None)
+        cache = self.option_cache
+        if cache is None or not self.options_sane:
+            self.options_sane = False
+            return
+
+        try:
+            if edit_type == 'shift_up':
+                cache.swap(index, index - 1)
+            elif edit_type == 'shift_down':
+                cache.swap(index, index + 1)
+            elif edit_type == 'insert':
+                cache.insert(index, self.get_option_name(index))
+            elif edit_type == 'delete':
+                cache.pop(index)
+            elif edit_type == 'delete_all':
+                cache.clear()
+            else:
+                self.options_sane = False
+        except Exception:
+            print(format_exc())
+            self.options_sane = False
 
     def set_shift_up_disabled(self, disable=True):
         '''
@@ -313,6 +423,8 @@ def edit_apply(self=None, *, edit_state, undo=True):
         w, node = field_widget.FieldWidget.get_widget_and_node(
             nodepath=state.nodepath, tag_window=state.tag_window)
 
+        # the way the option cache needs to be patched for this edit
+        cache_edit = edit_type
         if edit_type == 'shift_up':
             node[i], node[i - 1] = node[i - 1], node[i]
         elif edit_type == 'shift_down':
@@ -321,17 +433,21 @@ def edit_apply(self=None, *, edit_state, undo=True):
             if undo:
                 sel_index = None
                 node.pop(i)
+                cache_edit = 'delete'
             else:
                 node.insert(i, redo_node)
+                cache_edit = 'insert'
         elif edit_type == 'delete':
             if undo:
                 node.insert(i, undo_node)
+                cache_edit = 'insert'
             else:
                 sel_index = None
                 node.pop(i)
         elif edit_type == 'delete_all':
             if undo:
                 node[:] = undo_node
+                cache_edit = None
             else:
                 del node[:]
                 sel_index = None
@@ -358,7 +474,7 @@ def edit_apply(self=None, *, edit_state, undo=True):
 
                 max_index = len(node) - 1
                 w.sel_menu.max_index = max_index
-                w.options_sane = w.sel_menu.options_menu_sane = False
+                w.patch_option_cache(cache_edit, i)
                 if w.sel_index < 0:
                     w.select_option(0, force=True)
                 elif w.sel_index > max_index:
@@ -390,8 +506,8 @@ def shift_entry_up(self):
         self.edit_create(edit_type='shift_up', attr_index=index)
         node[index], node[index - 1] = node[index - 1], node[index]
 
+        self.patch_option_cache('shift_up', index)
         self.sel_index = self.sel_menu.sel_index = index - 1
-        self.options_sane = self.sel_menu.options_menu_sane = False
         self.sel_menu.update_label()
 
     def shift_entry_down(self):
@@ -408,8 +524,8 @@ def shift_entry_down(self):
         self.edit_create(edit_type='shift_down', attr_index=index)
         node[index], node[index + 1] = node[index + 1], node[index]
 
+        self.patch_option_cache('shift_down', index)
         self.sel_index = self.sel_menu.sel_index = index + 1
-        self.options_sane = self.sel_menu.options_menu_sane = False
         self.sel_menu.update_label()
 
     def add_entry(self):
@@ -429,7 +545,7 @@ def add_entry(self):
         self.edit_create(edit_type='add', attr_index=attr_index,
                          redo_node=self.node[attr_index], sel_index=attr_index)
 
-        self.options_sane = self.sel_menu.options_menu_sane = False
+        self.patch_option_cache('insert', attr_index)
         self.set_all_buttons_disabled(self.disabled)
         self.disable_unusable_buttons() 
         self.select_option(len(self.node) - 1, True)
@@ -451,7 +567,7 @@ def insert_entry(self):
         self.edit_create(edit_type='insert', attr_index=attr_index,
                          redo_node=self.node[attr_index], sel_index=attr_index)
 
-        self.options_sane = self.sel_menu.options_menu_sane = False
+        self.patch_option_cache('insert', attr_index)
         self.set_all_buttons_disabled(self.disabled)
         self.disable_unusable_buttons()
         self.select_option(attr_index, True)  # select the new entry
@@ -476,7 +592,7 @@ def duplicate_entry(self):
 
         self.node.append(new_subnode)
 
-        self.options_sane = self.sel_menu.options_menu_sane = False
+        self.patch_option_cache('insert', attr_index)
         self.set_all_buttons_disabled(self.disabled)
         self.disable_unusable_buttons()
         self.select_option(attr_index, True)
@@ -505,9 +621,9 @@ def delete_entry(self):
                          attr_index=attr_index, sel_index=attr_index)
 
         del self.node[attr_index]
+        self.patch_option_cache('delete', attr_index)
         attr_index = max(-1, min(len(self.node) - 1, attr_index))
 
-        self.options_sane = self.sel_menu.options_menu_sane = False
         self.select_option(attr_index, True)
         self.set_all_buttons_disabled(self.disabled)
         self.disable_unusable_buttons()
@@ -534,7 +650,7 @@ def delete_all_entries(self):
 
         del self.node[:]
 
-        self.options_sane = self.sel_menu.options_menu_sane = False
+        self.patch_option_cache('delete_all', 0)
         self.set_all_buttons_disabled(self.disabled)
         self.disable_unusable_buttons()
         self.select_option(self.sel_index, True)
@@ -625,9 +741,9 @@ def populate(self):
             self.f_widget_ids_map = {}
             self.f_widget_ids_map_inv = {}
 
-            # destroy any child widgets of the content
+            # release any child widgets of the content to be reused
             for c in list(self.f_widgets.values()):
-                c.destroy()
+                self.release_field_widget(c)
 
             for w in (self, self.content, self.title, self.title_label,
                       self.controls, self.buttons):
@@ -635,25 +751,11 @@ def populate(self):
 
             self.display_comment(self.content)
 
-            widget_cls = self.widget_picker.get_widget(sub_desc)
-            try:
-                widget = widget_cls(
-                    self.content, node=sub_node, parent=node,
-                    show_title=False, dont_padx_fields=True,
-                    attr_index=self.sel_index, tag_window=self.tag_window,
-                    f_widget_parent=self, disabled=self.disabled)
-            except Exception:
-                print(format_exc())
-                widget = data_frame.NullFrame(
-                    self.content, node=sub_node, parent=node,
-                    show_title=False, dont_padx_fields=True,
-                    attr_index=self.sel_index, tag_window=self.tag_window,
-                    f_widget_parent=self, disabled=self.disabled)
-
-            wid = id(widget)
-            self.f_widget_ids.append(wid)
-            self.f_widget_ids_map[self.sel_index] = wid
-            self.f_widget_ids_map_inv[wid] = self.sel_index
+            self.make_field_widget(
+                self.sel_index, sub_node, sub_desc, parent=node,
+                show_title=False, dont_padx_fields=True,
+                tag_window=self.tag_window, f_widget_parent=self,
+                disabled=self.disabled)
 
             self.populated = True
             self.build_f_widget_cache()
@@ -806,67 +908,89 @@ def generate_dynamic_options(self, options, options_to_generate):
         node, desc = self.node, self.desc
         dyn_name_path = desc.get('DYN_NAME_PATH')
         if dyn_name_path:
+            names = self.get_dyn_names(node, dyn_name_path)
+            for i in options_to_generate:
+                if i in range(len(names)) and names[i]:
+                    options[i] = names[i]
+
+    def get_option_name(self, index):
+        if not self.desc.get('DYN_NAME_PATH'):
+            sub_node = self.node[index]
+            if not hasattr(sub_node, 'desc'):
+                return None
+
+            sub_desc = self.desc['SUB_STRUCT']
+            def_struct_name = sub_desc['NAME']
+            if self.use_gui_names and 'GUI_NAME' in sub_desc:
+                def_struct_name = sub_desc['GUI_NAME']
+
+            sub_struct_name = sub_node.desc['NAME']
+            if self.use_gui_names and 'GUI_NAME' in sub_node.desc:
+                sub_struct_name = sub_node.desc['GUI_NAME']
+
+            if sub_struct_name == def_struct_name:
+                return None
+            return sub_struct_name
+
+        options = {}
+        try:
+            self.generate_dynamic_options(options, (index, ))
+        except Exception:
+            print(format_exc())
+        return options.get(index)
+
+    def patch_option_cache(self, edit_type, index):
+        dyn_name_path = self.desc.get('DYN_NAME_PATH')
+        cache = self.dyn_name_cache
+        if dyn_name_path and cache is not None and self.node is not None:
+            # patch the names the edit just invalidated, so the option
+            # for an inserted element is made without resolving the
+            # names of every other element in the array again
             try:
-                for i in options_to_generate:
-                    name = str(node[i].get_neighbor(dyn_name_path))
-                    if name:
-                        options[i] = name.split('\n')[0]
+                cache.patch_names(self.node, dyn_name_path, edit_type, index)
             except Exception:
-                pass
+                print(format_exc())
+
+        ArrayFrame.patch_option_cache(self, edit_type, index)
+
+    def get_fixed_option_names(self):
+        if self.desc.get('DYN_NAME_PATH'):
+            return {}
+        return ArrayFrame.get_fixed_option_names(self)
 
     def generate_options(self, opt_index=None):
         node, desc = self.node, self.desc
         if node is None:
             if opt_index is None:
-                return options
+                return ArrayOptionCache(label_format='%s. %s')
             return ""
 
-        options = {}
-        options_to_generate = range(len(node))
+        fixed_names = self.get_fixed_option_names()
         if opt_index is not None:
-            options_to_generate = (
-                (opt_index, ) if opt_index in options_to_generate else ())
+            options = ArrayOptionCache(fixed_names=fixed_names,
+                                       label_format='%s. %s')
+            if opt_index in range(len(node)):
+                options.names = [None]*opt_index
+                options.names.append(self.get_option_name(opt_index))
+            return options.get(opt_index, None)
 
         if desc.get('DYN_NAME_PATH'):
+            names = {}
             try:
-                self.generate_dynamic_options(options, options_to_generate)
+                self.generate_dynamic_options(names, range(len(node)))
             except Exception:
                 print(format_exc())
+            names = [names.get(i) for i in range(len(node))]
         else:
-            # sort the options by value(values are integers)
-            options.update({i: n for n, i in
-                            self.desc.get('NAME_MAP', {}).items()
-                            if i not in options})
-            sub_desc = desc['SUB_STRUCT']
-            def_struct_name = sub_desc['NAME']
-            if self.use_gui_names and 'GUI_NAME' in sub_desc:
-                def_struct_name = sub_desc['GUI_NAME']
-
-            for i in options_to_generate:
-                if i in options:
-                    continue
-                sub_node = node[i]
-                if not hasattr(sub_node, 'desc'):
-                    continue
-                sub_struct_name = sub_node.desc['NAME']
-                if self.use_gui_names and 'GUI_NAME' in sub_node.desc:
-                    sub_struct_name = sub_node.desc['GUI_NAME']
-
-                if sub_struct_name != def_struct_name:
-                    options[i] = sub_struct_name
-
-        for i, v in options.items():
-            options[i] = '%s. %s' % (i, v)
+            names = [self.get_option_name(i) for i in range(len(node))]
 
-
-        if opt_index is None:
-            self.option_cache = options
-            self.options_sane = True
-            if self.sel_menu is not None:
-                self.sel_menu.options_menu_sane = False
-                self.sel_menu.max_index = len(node) - 1
-            return options
-        return options.get(opt_index, None)
+        options = ArrayOptionCache(names, fixed_names, label_format='%s. %s')
+        self.option_cache = options
+        self.options_sane = True
+        if self.sel_menu is not None:
+            self.sel_menu.options_menu_sane = False
+            self.sel_menu.max_index = len(node) - 1
+        return options
 
     def flag_sanity_change(self, e=None):
         self.options_sane = self.sel_menu.options_menu_sane = (
@@ -0,0 +1,854 @@
+import threadsafe_tkinter as tk
+
+from bisect import bisect_right
+from traceback import format_exc
+
+from binilla import editor_constants as e_c
+from binilla.widgets import get_mouse_delta
+from binilla.widgets.field_widgets import field_widget, array_frame
+from binilla.widgets.field_widgets.entry_frame import node_to_str,\
+     parse_number_input
+
+
+class ArrayTableFrame(array_frame.ArrayFrame):
+    '''
+    Used for arrays of structs made of only simple data fields. Displays
+    every element in the array as a row in a canvas drawn table, with a
+    column for each field. Only the rows and columns scrolled into view
+    are drawn, so arrays with thousands of elements display instantly.
+
+    Cells are edited in place by double clicking them. Ctrl+Enter applies
+    the entered value to every selected row as a single undo state.
+    Clicking a column header sorts the rows by it. Sorting only changes
+    the order the rows are displayed in, not the order of the elements.
+    '''
+    table_frame = None
+    header_canvas = None
+    table_canvas = None
+    table_vsb = None
+    table_hsb = None
+    cell_entry = None
+
+    # (attr_index, desc, title, width) for each column of the table
+    columns = ()
+    # the x coordinate of the left side of each column
+    column_xs = ()
+    index_column_width = 0
+    table_width = 0
+
+    # the element indices in the order they are displayed, or None
+    # if the rows are displayed in the order of the elements.
+    row_order = None
+    sort_column = None
+    sort_reverse = False
+
+    table_top = 0
+    table_left = 0
+    active_column = 0
+    anchor_row = None
+    selected_indices = ()
+    # the (element_index, column) of the cell being edited
+    editing_cell = None
+
+    row_height = e_c.ARRAY_TABLE_ROW_HEIGHT
+    max_rows = e_c.ARRAY_TABLE_MAX_ROWS
+
+    @staticmethod
+    def is_table_column(desc):
+        '''Returns whether a field can be displayed as a table column.'''
+        f_type = desc['TYPE']
+        if f_type.is_block or f_type.is_raw or not f_type.is_data:
+            return False
+
+        node_cls = desc.get('NODE_CLS', f_type.node_cls)
+        return isinstance(node_cls, type) and (
+            issubclass(node_cls, (int, float)) or
+            (f_type.is_str and issubclass(node_cls, str)))
+
+    @classmethod
+    def can_display(cls, desc):
+        '''
+        Returns whether the array described by desc can be displayed as a
+        table. Its SUB_STRUCT must be a struct with no STEPTREE, and all
+        of its fields must be simple data fields or padding.
+        '''
+        try:
+            sub_desc = desc['SUB_STRUCT']
+            if not sub_desc['TYPE'].is_struct or 'STEPTREE' in sub_desc:
+                return False
+
+            column_count = 0
+            for i in range(sub_desc['ENTRIES']):
+                attr_desc = sub_desc[i]
+                f_type = attr_desc['TYPE']
+                if f_type.name in ("Pad", "Void"):
+                    # padding doesn't get a column
+                    continue
+                elif not cls.is_table_column(attr_desc):
+                    return False
+                column_count += 1
+
+            return column_count > 0
+        except Exception:
+            return False
+
+    def build_table(self):
+        '''Makes the canvases and scrollbars the table is drawn in.'''
+        self.table_frame = tk.Frame(self.content, bd=0, highlightthickness=0)
+        self.header_canvas = tk.Canvas(
+            self.table_frame, highlightthickness=0, bd=0,
+            height=self.row_height)
+        self.table_canvas = tk.Canvas(
+            self.table_frame, highlightthickness=0, bd=0, takefocus=1)
+        self.table_vsb = tk.Scrollbar(
+            self.table_frame, orient="vertical", command=self.scroll_rows)
+        self.table_hsb = tk.Scrollbar(
+            self.table_frame, orient="horizontal", command=self.scroll_columns)
+        self.cell_entry = tk.Entry(self.table_canvas, bd=1)
+
+        self.header_canvas.grid(row=0, column=0, sticky="ew")
+        self.table_canvas.grid(row=1, column=0, sticky="nsew")
+        self.table_frame.columnconfigure(0, weight=1)
+
+        for w in (self.table_frame, self.header_canvas, self.table_canvas,
+                  self.table_vsb, self.table_hsb, self.cell_entry):
+            w.f_widget_parent = self
+
+        self.header_canvas.bind('<Button-1>', self.click_header)
+        self.table_canvas.bind('<Button-1>', self.click_cell)
+        self.table_canvas.bind('<Shift-Button-1>', self.shift_click_cell)
+        self.table_canvas.bind('<Double-Button-1>', self.double_click_cell)
+        self.table_canvas.bind('<Configure>', self.redraw_table)
+        self.table_canvas.bind('<Up>', lambda e: self.move_selection(-1))
+        self.table_canvas.bind('<Down>', lambda e: self.move_selection(1))
+        self.table_canvas.bind('<Prior>',
+                               lambda e: self.move_selection(-self.max_rows))
+        self.table_canvas.bind('<Next>',
+                               lambda e: self.move_selection(self.max_rows))
+        self.table_canvas.bind('<Left>', lambda e: self.move_column(-1))
+        self.table_canvas.bind('<Right>', lambda e: self.move_column(1))
+        self.table_canvas.bind('<Return>', self.start_cell_edit)
+        self.table_canvas.bind('<F2>', self.start_cell_edit)
+
+        self.cell_entry.bind('<Return>', self.commit_cell_edit)
+        self.cell_entry.bind(
+            '<Control-Return>',
+            lambda e: self.commit_cell_edit(fill_selected=True))
+        self.cell_entry.bind('<Escape>', self.cancel_cell_edit)
+        self.cell_entry.bind('<FocusOut>', self.commit_cell_edit)
+
+        for w in (self.header_canvas, self.table_canvas, self.table_vsb):
+            if e_c.IS_LNX:
+                w.bind('<4>', self.mousewheel_scroll_y)
+                w.bind('<5>', self.mousewheel_scroll_y)
+            else:
+                w.bind('<MouseWheel>', self.mousewheel_scroll_y)
+
+    def apply_style(self, seen=None):
+        array_frame.ArrayFrame.apply_style(self, seen)
+        if self.table_canvas is not None:
+            self.header_canvas.config(bg=self.frame_bg_color)
+            self.table_canvas.config(bg=self.entry_normal_color)
+            self.redraw_table()
+
+    def destroy(self):
+        self.columns = self.row_order = self.selected_indices = None
+        array_frame.ArrayFrame.destroy(self)
+
+    def set_disabled(self, disable=True):
+        if disable:
+            self.cancel_cell_edit()
+        array_frame.ArrayFrame.set_disabled(self, disable)
+
+    def export_node(self):
+        pass
+
+    def import_node(self):
+        pass
+
+    def flush(self):
+        self.commit_cell_edit()
+        self.set_needs_flushing(False)
+
+    def get_column_unit_scale(self, desc):
+        unit_scale = desc.get('UNIT_SCALE')
+        if hasattr(unit_scale, '__call__'):
+            try:
+                unit_scale = unit_scale(f_widget=self)
+            except Exception:
+                unit_scale = None
+        return unit_scale
+
+    def build_columns(self):
+        '''Determines the columns of the table and how wide each is.'''
+        sub_desc = self.desc['SUB_STRUCT']
+        font = self.get_font("default")
+        char_width = max(1, font.measure("0"))
+        min_width = e_c.ARRAY_TABLE_MIN_COLUMN_WIDTH
+        max_width = e_c.ARRAY_TABLE_MAX_COLUMN_WIDTH
+
+        columns = []
+        for i in range(sub_desc['ENTRIES']):
+            attr_desc = sub_desc[i]
+            if (not self.is_table_column(attr_desc) or
+                    not self.get_visible(attr_desc.get('VISIBLE', True))):
+                continue
+
+            title = attr_desc.get('NAME', "").replace('_', ' ')
+            if self.use_gui_names:
+                title = attr_desc.get('GUI_NAME', title)
+
+            f_type = attr_desc['TYPE']
+            node_cls = attr_desc.get('NODE_CLS', f_type.node_cls)
+            size = attr_desc.get('SIZE', f_type.size)
+            if issubclass(node_cls, float):
+                chars = self.def_float_entry_width
+            elif issubclass(node_cls, int):
+                chars = self.max_int_entry_width
+                if isinstance(size, int):
+                    bits = size if f_type.is_bit_based else size*8
+                    chars = len(str(2**bits)) + 1
+            elif isinstance(size, int):
+                chars = min(size, self.max_string_entry_width)
+            else:
+                chars = self.def_string_entry_width
+
+            width = max(font.measure(title + " ▲"), char_width*chars) + 8
+            columns.append((i, attr_desc, title,
+                            max(min_width, min(width, max_width))))
+
+        node_len = len(self.node) if self.node else 0
+        self.index_column_width = char_width*(len(str(node_len)) + 1) + 8
+        self.columns = columns
+
+        x = self.index_column_width
+        column_xs = []
+        for column in columns:
+            column_xs.append(x)
+            x += column[3]
+
+        self.column_xs = column_xs
+        self.table_width = x
+        if self.active_column >= len(columns):
+            self.active_column = max(0, len(columns) - 1)
+
+    def get_cell_value(self, element_index, column):
+        try:
+            element = self.node[element_index]
+            if element.desc is not self.desc['SUB_STRUCT']:
+                return None
+            return element[self.columns[column][0]]
+        except Exception:
+            return None
+
+    def get_cell_string(self, element_index, column):
+        value = self.get_cell_value(element_index, column)
+        if value is None:
+            return ""
+
+        desc = self.columns[column][1]
+        try:
+            return node_to_str(value, desc, self.get_column_unit_scale(desc))
+        except Exception:
+            return str(value)
+
+    def parse_cell_input(self, string, element_index, column):
+        '''Converts a string entered into a cell into a node to store.'''
+        attr_index, desc = self.columns[column][:2]
+        f_type = desc['TYPE']
+        node_cls = desc.get('NODE_CLS', f_type.node_cls)
+        if not issubclass(node_cls, str):
+            return parse_number_input(
+                string, desc, desc.get('MAX', f_type.max),
+                desc.get('MIN', f_type.min), self.get_column_unit_scale(desc),
+                self.evaluate_entry_fields, self.enforce_max, self.enforce_min)
+
+        new_node = node_cls(string)
+        field_max = desc.get('MAX', desc.get('SIZE'))
+        if self.enforce_max and isinstance(field_max, int):
+            element = self.node[element_index]
+            sizecalc = f_type.sizecalc
+            while new_node and sizecalc(new_node, parent=element,
+                                        attr_index=attr_index) > field_max:
+                new_node = new_node[:-1]
+        return new_node
+
+    def get_row_count(self):
+        return len(self.node) if self.node else 0
+
+    def get_element_index(self, row):
+        '''Returns the index of the element displayed in the given row.'''
+        if self.row_order is None:
+            return row
+        return self.row_order[row]
+
+    def get_view_row(self, element_index):
+        '''Returns the row the element is displayed in, or None.'''
+        if element_index is None or element_index < 0:
+            return None
+        elif self.row_order is None:
+            return element_index
+        try:
+            return self.row_order.index(element_index)
+        except ValueError:
+            return None
+
+    def sort_rows(self):
+        '''Reorders the displayed rows by the value in the sort column.'''
+        column = self.sort_column
+        if column is None or column >= len(self.columns):
+            self.row_order = None
+            self.sort_column = None
+            return
+
+        attr_index = self.columns[column][0]
+        sub_desc = self.desc['SUB_STRUCT']
+
+        def sort_key(i, node=self.node):
+            element = node[i]
+            if getattr(element, "desc", None) is not sub_desc:
+                return (1, "")
+            value = element[attr_index]
+            return (0, value)
+
+        try:
+            self.row_order = sorted(range(self.get_row_count()), key=sort_key,
+                                    reverse=self.sort_reverse)
+        except Exception:
+            print(format_exc())
+            self.row_order = None
+
+    def populate(self):
+        desc = self.desc
+        sub_desc = desc['SUB_STRUCT']
+
+        if self.content in (None, self):
+            self.content = tk.Frame(self, relief="sunken", bd=self.frame_depth,
+                                    bg=self.default_bg_color)
+
+        if self.table_frame is None:
+            self.build_table()
+
+        self.sel_menu.default_text = sub_desc.get(
+            'GUI_NAME', sub_desc.get('NAME', ""))
+
+        for w in (self, self.content, self.title, self.title_label,
+                  self.controls, self.buttons, self.table_canvas):
+            w.tooltip_string = self.desc.get('TOOLTIP')
+
+        self.display_comment(self.content)
+        self.populated = True
+        self.reload()
+        if self.show.get():
+            self.pose_fields()
+
+    def reload(self):
+        '''Redraws the table with the current contents of the array.'''
+        try:
+            node = self.node if self.node else ()
+            self.cancel_cell_edit()
+
+            self.set_all_buttons_disabled(self.disabled)
+            self.disable_unusable_buttons()
+            self.set_import_disabled()
+            self.set_export_disabled()
+
+            if not node:
+                self.sel_index = -1
+            elif self.sel_index not in range(len(node)):
+                self.sel_index = max(0, min(self.sel_index, len(node) - 1))
+
+            self.sel_menu.sel_index = self.sel_index
+            self.sel_menu.max_index = len(node) - 1
+
+            selected = set(i for i in (self.selected_indices or ())
+                           if i in range(len(node)))
+            if not selected and self.sel_index >= 0:
+                selected.add(self.sel_index)
+            self.selected_indices = selected
+
+            self.build_columns()
+            self.sort_rows()
+            self.resize_table()
+            self.redraw_table()
+
+            self.sel_menu.update_label()
+            if self.node is None:
+                self.set_disabled(True)
+        except Exception:
+            print(format_exc())
+
+    def resize_table(self):
+        '''Sizes the table to fit the rows, up to max_rows of them.'''
+        row_count = self.get_row_count()
+        visible_rows = max(1, min(row_count, self.max_rows))
+        self.table_canvas.config(height=visible_rows*self.row_height,
+                                 width=min(self.table_width,
+                                           self.max_string_entry_width*10))
+
+        children_can_scroll = row_count > self.max_rows
+        for w in (self.header_canvas, self.table_canvas, self.table_vsb):
+            w.can_scroll = children_can_scroll
+
+        if children_can_scroll:
+            self.table_vsb.grid(row=1, column=1, sticky="ns")
+        else:
+            self.table_vsb.grid_forget()
+            self.table_top = 0
+
+    def pose_fields(self):
+        # by adding a fixed amount of padding, we fix a problem
+        # with difficult to predict padding based on nesting
+        self.table_frame.pack(fill='x', side='top', expand=True,
+                              padx=self.vertical_padx, pady=self.vertical_pady)
+        self.content.pack(fill='both', side='top', anchor='nw', expand=True)
+
+    @property
+    def view_width(self):
+        width = self.table_canvas.winfo_width()
+        if width <= 1:
+            # not drawn yet, so use the width it will be drawn at
+            width = int(self.table_canvas.cget("width"))
+        return max(width, 1)
+
+    @property
+    def visible_rows(self):
+        height = self.table_canvas.winfo_height()
+        if height <= 1:
+            # not drawn yet, so use the height it will be drawn at
+            height = int(self.table_canvas.cget("height"))
+        return max(1, height // self.row_height)
+
+    def redraw_table(self, e=None):
+        '''Draws the rows and columns of the table that are in view.'''
+        canvas, header = self.table_canvas, self.header_canvas
+        if canvas is None or self.columns is None:
+            return
+
+        canvas.delete(tk.ALL)
+        header.delete(tk.ALL)
+
+        row_count = self.get_row_count()
+        row_height = self.row_height
+        view_width = self.view_width
+        visible_rows = self.visible_rows
+
+        self.table_top = top = max(0, min(self.table_top,
+                                          row_count - visible_rows))
+        self.table_left = left = max(0, min(self.table_left,
+                                            self.table_width - view_width))
+
+        font = self.get_font("default")
+        title_font = self.get_font("frame_title")
+        text_color = self.text_normal_color
+        if self.disabled:
+            text_color = self.text_disabled_color
+        line_color = self.frame_bg_color
+        selected = self.selected_indices or ()
+
+        # draw the headers
+        index_width = self.index_column_width
+        header.create_rectangle(
+            0, 0, index_width, row_height, fill=self.frame_bg_color,
+            outline=self.button_border_dark_color)
+        header.create_text(4, row_height // 2, text="#", anchor="w",
+                           font=title_font, fill=self.text_normal_color)
+
+        visible_columns = []
+        for c, x in enumerate(self.column_xs):
+            width = self.columns[c][3]
+            x0 = x - left
+            if x0 + width < index_width or x0 > view_width:
+                continue
+
+            visible_columns.append((c, max(x0, index_width), x0 + width))
+            title = self.columns[c][2]
+            if c == self.sort_column:
+                title += " ▼" if self.sort_reverse else " ▲"
+
+            header.create_rectangle(
+                x0, 0, x0 + width, row_height, fill=self.frame_bg_color,
+                outline=self.button_border_dark_color)
+            header.create_text(x0 + 4, row_height // 2, text=title,
+                               anchor="w", font=title_font,
+                               fill=self.text_normal_color)
+
+        # redraw the index header over any columns scrolled under it
+        header.tag_raise(header.create_rectangle(
+            0, 0, index_width, row_height, fill=self.frame_bg_color,
+            outline=self.button_border_dark_color))
+        header.tag_raise(header.create_text(
+            4, row_height // 2, text="#", anchor="w",
+            font=title_font, fill=self.text_normal_color))
+
+        # draw the rows
+        for row in range(top, min(row_count, top + visible_rows)):
+            i = self.get_element_index(row)
+            y0 = (row - top)*row_height
+            y1 = y0 + row_height
+            is_selected = i in selected
+            row_fill = (self.entry_highlighted_color if is_selected else
+                        self.entry_normal_color)
+            row_text = (self.text_highlighted_color if is_selected else
+                        text_color)
+
+            canvas.create_rectangle(0, y0, view_width, y1,
+                                    fill=row_fill, outline=line_color)
+            for c, x0, x1 in visible_columns:
+                canvas.create_line(x0, y0, x0, y1, fill=line_color)
+                canvas.create_text(
+                    x0 + 4, y0 + row_height // 2, anchor="w", font=font,
+                    text=self.get_cell_string(i, c), fill=row_text)
+
+                if is_selected and i == self.sel_index and (
+                        c == self.active_column):
+                    canvas.create_rectangle(x0 + 1, y0 + 1, x1 - 1, y1 - 1,
+                                            outline=self.text_highlighted_color)
+
+            canvas.create_rectangle(0, y0, index_width, y1,
+                                    fill=self.frame_bg_color,
+                                    outline=line_color)
+            canvas.create_text(4, y0 + row_height // 2, anchor="w",
+                               font=font, text=str(i),
+                               fill=self.text_normal_color)
+
+        if row_count:
+            self.table_vsb.set(top / row_count,
+                               min(1.0, (top + visible_rows) / row_count))
+        else:
+            self.table_vsb.set(0.0, 1.0)
+
+        if self.table_width > view_width:
+            self.table_hsb.set(left / self.table_width,
+                               (left + view_width) / self.table_width)
+            if not self.table_hsb.winfo_manager():
+                self.table_hsb.grid(row=2, column=0, sticky="ew")
+        elif self.table_hsb.winfo_manager():
+            self.table_hsb.grid_forget()
+
+        self.place_cell_entry()
+
+    def scroll_rows(self, *args):
+        '''The scrollbar command for scrolling the rows.'''
+        if not args:
+            return
+
+        if args[0] == "moveto":
+            self.table_top = int(float(args[1])*self.get_row_count() + 0.5)
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            if len(args) > 2 and args[2] == "pages":
+                amount *= self.visible_rows
+            self.table_top += amount
+
+        self.redraw_table()
+
+    def scroll_columns(self, *args):
+        '''The scrollbar command for scrolling the columns.'''
+        if not args:
+            return
+
+        if args[0] == "moveto":
+            self.table_left = int(float(args[1])*self.table_width)
+        elif args[0] == "scroll":
+            amount = int(args[1])*e_c.ARRAY_TABLE_MIN_COLUMN_WIDTH
+            if len(args) > 2 and args[2] == "pages":
+                amount = int(args[1])*self.view_width
+            self.table_left += amount
+
+        self.redraw_table()
+
+    def mousewheel_scroll_y(self, e):
+        if self.should_scroll(e):
+            self.scroll_rows("scroll", int(get_mouse_delta(e)), "units")
+
+    def see_row(self, row):
+        '''Scrolls the table so the given row is in view.'''
+        if row is None:
+            return
+
+        visible_rows = self.visible_rows
+        if row < self.table_top:
+            self.table_top = row
+        elif row >= self.table_top + visible_rows:
+            self.table_top = row - visible_rows + 1
+
+    def see_column(self, column):
+        '''Scrolls the table so the given column is in view.'''
+        if column not in range(len(self.columns)):
+            return
+
+        x0 = self.column_xs[column] - self.index_column_width
+        x1 = self.column_xs[column] + self.columns[column][3]
+        view_width = self.view_width
+        if x0 < self.table_left:
+            self.table_left = x0
+        elif x1 > self.table_left + view_width:
+            self.table_left = x1 - view_width
+
+    def get_cell_at(self, x, y):
+        '''
+        Returns the (row, column) of the cell at the given coordinates on
+        the table canvas. The column is None for the index column.
+        '''
+        row = self.table_top + y // self.row_height
+        if row not in range(self.get_row_count()):
+            row = None
+
+        column = None
+        if x >= self.index_column_width:
+            column = bisect_right(self.column_xs, x + self.table_left) - 1
+            if (column not in range(len(self.columns)) or x + self.table_left
+                    >= self.column_xs[column] + self.columns[column][3]):
+                column = None
+        return row, column
+
+    def click_header(self, e):
+        if e.x < self.index_column_width:
+            # clicking the index header restores the element order
+            column = None
+        else:
+            column = bisect_right(self.column_xs, e.x + self.table_left) - 1
+            if column not in range(len(self.columns)):
+                return
+
+        # clicking the sorted column again reverses the sort,
+        # and clicking it a third time stops sorting by it.
+        if column is None:
+            self.sort_column = None
+        elif column != self.sort_column:
+            self.sort_column = column
+            self.sort_reverse = False
+        elif not self.sort_reverse:
+            self.sort_reverse = True
+        else:
+            self.sort_column = None
+
+        self.commit_cell_edit()
+        self.sort_rows()
+        self.see_row(self.get_view_row(self.sel_index))
+        self.redraw_table()
+
+    def click_cell(self, e):
+        self.table_canvas.focus_set()
+        row, column = self.get_cell_at(e.x, e.y)
+        if row is None:
+            return
+
+        if column is not None:
+            self.active_column = column
+        self.anchor_row = row
+        self.select_option(self.get_element_index(row))
+
+    def shift_click_cell(self, e):
+        self.table_canvas.focus_set()
+        row, column = self.get_cell_at(e.x, e.y)
+        if row is None:
+            return
+        elif self.anchor_row is None:
+            return self.click_cell(e)
+
+        if column is not None:
+            self.active_column = column
+
+        start, end = sorted((self.anchor_row, row))
+        self.commit_cell_edit()
+        self.sel_index = self.sel_menu.sel_index = self.get_element_index(row)
+        self.selected_indices = set(
+            self.get_element_index(r) for r in range(start, end + 1))
+        self.sel_menu.update_label()
+        self.redraw_table()
+
+    def double_click_cell(self, e):
+        row, column = self.get_cell_at(e.x, e.y)
+        if None not in (row, column):
+            self.start_cell_edit()
+
+    def move_selection(self, delta):
+        row = self.get_view_row(self.sel_index)
+        row_count = self.get_row_count()
+        if not row_count:
+            return
+        elif row is None:
+            row = 0
+        else:
+            row = max(0, min(row + delta, row_count - 1))
+
+        self.anchor_row = row
+        self.select_option(self.get_element_index(row))
+
+    def move_column(self, delta):
+        if not self.columns:
+            return
+        self.active_column = max(0, min(self.active_column + delta,
+                                        len(self.columns) - 1))
+        self.see_column(self.active_column)
+        self.redraw_table()
+
+    def select_option(self, opt_index=None, force=False, reload=True):
+        node = self.node if self.node else ()
+        if opt_index is None:
+            opt_index = self.sel_index
+
+        if opt_index < 0:
+            opt_index = 0
+
+        if not node:
+            opt_index = -1
+        elif opt_index not in range(len(node)):
+            opt_index = len(node) - 1
+
+        self.commit_cell_edit()
+        self.sel_index = opt_index
+        self.sel_menu.sel_index = opt_index
+        self.sel_menu.max_index = len(node) - 1
+        self.selected_indices = set() if opt_index < 0 else {opt_index}
+        if force and reload:
+            # elements may have been added or removed, so rebuild the view
+            self.reload()
+
+        self.see_row(self.get_view_row(opt_index))
+        self.redraw_table()
+        self.sel_menu.update_label()
+
+    def shift_entry_up(self):
+        array_frame.ArrayFrame.shift_entry_up(self)
+        self.select_option(self.sel_index, True)
+
+    def shift_entry_down(self):
+        array_frame.ArrayFrame.shift_entry_down(self)
+        self.select_option(self.sel_index, True)
+
+    def place_cell_entry(self):
+        '''Positions the cell entry over the cell being edited.'''
+        if self.editing_cell is None:
+            return
+
+        i, column = self.editing_cell
+        row = self.get_view_row(i)
+        visible_rows = self.visible_rows
+        if (row is None or column not in range(len(self.columns)) or
+                not self.table_top <= row < self.table_top + visible_rows):
+            self.cell_entry.place_forget()
+            return
+
+        x = self.column_xs[column] - self.table_left
+        self.cell_entry.place(
+            x=x, y=(row - self.table_top)*self.row_height,
+            width=self.columns[column][3], height=self.row_height)
+
+    def start_cell_edit(self, e=None):
+        if (self.disabled or self.sel_index < 0 or
+                self.active_column not in range(len(self.columns))):
+            return
+        elif not self.columns[self.active_column][1].get('EDITABLE', True) \
+                and not self.all_editable:
+            return
+
+        self.commit_cell_edit()
+        self.see_row(self.get_view_row(self.sel_index))
+        self.see_column(self.active_column)
+        self.editing_cell = (self.sel_index, self.active_column)
+        self.set_needs_flushing()
+
+        self.cell_entry.delete(0, tk.END)
+        self.cell_entry.insert(
+            0, self.get_cell_string(self.sel_index, self.active_column))
+        self.cell_entry.selection_range(0, tk.END)
+        self.redraw_table()
+        self.cell_entry.focus_set()
+
+    def cancel_cell_edit(self, e=None):
+        if self.editing_cell is None:
+            return
+
+        self.editing_cell = None
+        self.cell_entry.place_forget()
+        if e is not None:
+            self.table_canvas.focus_set()
+
+    def commit_cell_edit(self, e=None, fill_selected=False):
+        '''
+        Stores the value entered into the cell being edited. If
+        fill_selected is True, the value is stored in that column
+        of every selected row. A single edit state is made for it.
+        '''
+        if self.editing_cell is None:
+            return
+
+        i, column = self.editing_cell
+        # clear this first so the FocusOut binding doesn't commit again
+        self.editing_cell = None
+        self.cell_entry.place_forget()
+        if e is not None or fill_selected:
+            self.table_canvas.focus_set()
+
+        node = self.node
+        if node is None or i not in range(len(node)):
+            return
+
+        try:
+            new_value = self.parse_cell_input(self.cell_entry.get(), i, column)
+        except Exception:
+            # Couldnt cast the string to the node class. This is fine this
+            # kind of thing happens when entering data. Just dont store it
+            self.redraw_table()
+            return
+
+        indices = {i}
+        if fill_selected:
+            indices.update(self.selected_indices or ())
+
+        attr_index = self.columns[column][0]
+        sub_desc = self.desc['SUB_STRUCT']
+        cells, undo_values = [], []
+        for j in sorted(indices):
+            element = node[j]
+            if getattr(element, "desc", None) is not sub_desc:
+                continue
+            elif element[attr_index] != new_value:
+                cells.append((j, attr_index))
+                undo_values.append(element[attr_index])
+
+        if cells:
+            self.set_edited() # do this first so the TagWindow detects that
+            #                   the title needs to be updated with an asterisk
+            self.edit_create(edit_type='set_cells', cells=tuple(cells),
+                             undo_node=tuple(undo_values),
+                             redo_node=(new_value, )*len(cells))
+            for j, attr_index in cells:
+                node[j][attr_index] = new_value
+
+            if self.sort_column == column:
+                self.sort_rows()
+
+        self.redraw_table()
+
+    def edit_apply(self=None, *, edit_state, undo=True):
+        state = edit_state
+        if state.edit_type != 'set_cells':
+            return array_frame.ArrayFrame.edit_apply(
+                edit_state=edit_state, undo=undo)
+
+        w, node = field_widget.FieldWidget.get_widget_and_node(
+            nodepath=state.nodepath, tag_window=state.tag_window)
+
+        values = state.undo_node if undo else state.redo_node
+        for (i, attr_index), value in zip(state.edit_info['cells'], values):
+            node[i][attr_index] = value
+
+        if w is not None:
+            try:
+                if w.desc is not state.desc:
+                    return
+
+                w.needs_flushing = False
+                w.reload()
+                w.set_edited()
+            except Exception:
+                print(format_exc())
+
+    @property
+    def visible_field_count(self):
+        # the table displays every element at once
+        return max(1, self.get_row_count())
@@ -1,4 +1,3 @@
-import math
 import threadsafe_tkinter as tk
 
 from traceback import format_exc
@@ -9,16 +8,27 @@
 
 
 class BoolFrame(data_frame.DataFrame):
+    '''
+    Used for flags nodes. Every visible bit is drawn as a checkbox on a
+    single canvas, and clicks are hit-tested against the rows, rather
+    than making a tk.Checkbutton and tk.IntVar for every bit.
+    '''
     children_can_scroll = True
     can_scroll = False
-    checkvars = None  # used to know which IntVars to set when undo/redoing
-    checkbtns = ()
     bit_opt_map = None
+    # the bits in the order their rows are drawn
+    bit_rows = ()
+    # the canvas ids of the check marks of each bit
+    check_ids = None
+    row_height = 18
+    hover_bit = None
+    focus_bit = None
+    hover_id = None
+    focus_id = None
 
     def __init__(self, *args, **kwargs):
         self.bit_opt_map = {}
-        self.checkvars = {}
-        self.checkbtns = {}
+        self.check_ids = {}
         data_frame.DataFrame.__init__(self, *args, **kwargs)
 
         self.content = tk.Frame(self, highlightthickness=0)
@@ -33,58 +43,52 @@ def __init__(self, *args, **kwargs):
         if self.gui_name != '':
             self.title_label.pack(side='left')
 
-        self.check_canvas = tk.Canvas(self.content, highlightthickness=0)
-        self.check_frame = tk.Frame(
-            self.check_canvas, bd=self.listbox_depth,
-            relief='sunken',  highlightthickness=0)
+        self.check_canvas = tk.Canvas(
+            self.content, highlightthickness=0, takefocus=1,
+            bd=self.listbox_depth, relief='sunken')
 
         self.scrollbar_y = tk.Scrollbar(self.content, orient='vertical',
                                         command=self.check_canvas.yview)
 
         self.check_canvas.config(yscrollcommand=self.scrollbar_y.set,
                                  yscrollincrement=1, xscrollincrement=1)
-        self.check_frame_id = self.check_canvas.create_window(
-            (0, 0), window=self.check_frame, anchor='nw')
 
         if e_c.IS_LNX:
-            self.check_frame.bind('<4>', self.mousewheel_scroll_y)
-            self.check_frame.bind('<5>', self.mousewheel_scroll_y)
             self.check_canvas.bind('<4>', self.mousewheel_scroll_y)
             self.check_canvas.bind('<5>', self.mousewheel_scroll_y)
         else:
-            self.check_frame.bind('<MouseWheel>', self.mousewheel_scroll_y)
             self.check_canvas.bind('<MouseWheel>', self.mousewheel_scroll_y)
 
+        self.check_canvas.bind('<Button-1>', self.click_bit)
+        self.check_canvas.bind('<Motion>', self.hover_over_bit)
+        self.check_canvas.bind('<Leave>', self.hover_over_bit)
+        self.check_canvas.bind('<Up>', lambda e: self.move_focus_bit(-1))
+        self.check_canvas.bind('<Down>', lambda e: self.move_focus_bit(1))
+        self.check_canvas.bind('<space>', self.toggle_focus_bit)
+
         self.populate()
         self._initialized = True
 
     def unload_node_data(self):
         field_widget.FieldWidget.unload_node_data(self)
-        for var in self.checkvars.values():
-            var.set(0)
+        self.reload()
 
     def set_disabled(self, disable=True):
         disable = disable or not self.editable
         if self.node is None and not disable:
             return
 
-        if bool(disable) != self.disabled:
-            new_state = tk.DISABLED if disable else tk.NORMAL
-            for bit in self.checkbtns:
-                self.checkbtns[bit].config(state=new_state)
-
+        redraw = bool(disable) != self.disabled
         data_frame.DataFrame.set_disabled(self, disable)
+        if redraw and getattr(self, "check_canvas", None):
+            self.draw_bits()
 
     def apply_style(self, seen=None):
         field_widget.FieldWidget.apply_style(self, seen)
-        self.check_frame.config(bg=self.entry_normal_color,
-                                bd=self.listbox_depth)
-
-        for w in self.check_frame.children.values():
-            if isinstance(w, tk.Checkbutton):
-                w.config(bg=self.entry_normal_color, selectcolor="",
-                         activebackground=self.entry_highlighted_color,
-                         activeforeground=self.text_highlighted_color)
+        self.check_canvas.config(bg=self.entry_normal_color,
+                                 bd=self.listbox_depth)
+        self.draw_bits()
+        self.pose_fields()
 
     def flush(self): pass
 
@@ -112,131 +116,210 @@ def edit_apply(self=None, *, edit_state, undo=True):
 
                 w.needs_flushing = False
                 w.set_edited()
-                w.checkvars[bit].set(new_val)
+                w.reload()
             except Exception:
                 print(format_exc())
 
+    def is_bit_editable(self, bit):
+        opt = self.bit_opt_map.get(bit)
+        if opt is None or self.disabled:
+            return False
+        return bool(opt.get("EDITABLE", True) or self.all_editable)
+
+    def get_bit_at(self, y):
+        '''Returns the bit drawn at the y coordinate of the canvas.'''
+        row = int(self.check_canvas.canvasy(y) - self.listbox_depth
+                  ) // self.row_height
+        if row in range(len(self.bit_rows)):
+            return self.bit_rows[row]
+        return None
+
     def populate(self):
         bit_opt_map = {}
 
-        desc = self.desc
-        for w in (self, self.content, self.check_canvas,
-                  self.check_frame, self.title_label):
+        for w in (self, self.content, self.check_canvas, self.title_label):
             w.tooltip_string = self.desc.get('TOOLTIP')
 
-        visible_bits = [int(math.log(mask, 2.0)) for mask in sorted(desc['VALUE_MAP'])]
-        # create visible bits for all flags that dont have one defined
+        # make a condensed mapping of all visible flags and their information
+        for bit, visibility, opt in self.desc_metadata.get_flag_options():
+            if opt is not None and self.get_visible(visibility):
+                bit_opt_map[bit] = opt
+
+        # create visible bits for all flags that arent visible or defined
         if self.all_bools_visible:
             bit_ct = self.field_size * (1 if self.is_bit_based else 8)
-            for i in range(bit_ct):
-                if len(visible_bits) <= i:
-                    visible_bits.extend(range(i, bit_ct))
-                    break
-                elif visible_bits[i] != i:
-                    visible_bits.insert(i, i)
-
-        # make a condensed mapping of all visible flags and their information
-        for bit in visible_bits:
-            mask = 1 << bit
-            opt = desc.get(desc['VALUE_MAP'].get(mask))
-
-            if opt is None or not self.get_visible(opt.get("VISIBLE", True)):
-                if not self.all_bools_visible:
-                    continue
-                name = e_c.UNKNOWN_BOOLEAN % bit
-                opt = dict(GUI_NAME=name.replace('_', ' '), NAME=name)
-            else:
-                opt = dict(opt)
-                defname = opt.get('NAME', e_c.UNNAMED_FIELD).replace('_', ' ')
-                opt.setdefault('GUI_NAME', defname)
-
-            bit_opt_map[bit] = opt
+            for bit in range(bit_ct):
+                if bit not in bit_opt_map:
+                    name = e_c.UNKNOWN_BOOLEAN % bit
+                    bit_opt_map[bit] = dict(GUI_NAME=name.replace('_', ' '),
+                                            NAME=name)
 
         if self.bit_opt_map != bit_opt_map:
-            self.checkvars = {}
-            self.checkbtns = {}
-
-            # destroy all the child widgets of the content
-            for c in list(self.check_frame.children.values()):
-                c.destroy()
-
-            # loop over each possible boolean(even unused ones)
-            for bit in sorted(bit_opt_map):
-                opt = bit_opt_map[bit]
+            self.bit_opt_map = bit_opt_map
+            self.bit_rows = tuple(sorted(bit_opt_map))
+            self.hover_bit = self.focus_bit = None
+            self.apply_style()
+        else:
+            self.reload()
+
+    def draw_bits(self):
+        '''Draws the checkbox and name of every visible bit.'''
+        canvas = self.check_canvas
+        canvas.delete(tk.ALL)
+        self.check_ids = {}
+
+        font = self.get_font("default")
+        self.row_height = row_height = max(font.metrics("linespace") + 4, 14)
+        box_size = row_height - 6
+        pad = self.listbox_depth
+
+        for row, bit in enumerate(self.bit_rows):
+            opt = self.bit_opt_map[bit]
+            name = opt.get('GUI_NAME', opt['NAME'])
+            if opt.get('TOOLTIP'):
+                name += " �"
+
+            editable = self.is_bit_editable(bit)
+            fg = self.text_normal_color if editable else self.text_disabled_color
+            y0 = pad + row*row_height
+            x0, y1 = pad + 2, y0 + 3
+            canvas.create_rectangle(
+                x0, y1, x0 + box_size, y1 + box_size, outline=fg,
+                fill=self.entry_normal_color if editable else
+                self.entry_disabled_color, tags=("bit%s" % bit, ))
+            self.check_ids[bit] = canvas.create_line(
+                x0 + 2, y1 + box_size//2, x0 + box_size//2 - 1,
+                y1 + box_size - 3, x0 + box_size - 2, y1 + 2,
+                fill=fg, width=2, state="hidden")
+            canvas.create_text(
+                x0 + box_size + 6, y0 + row_height//2, text=name,
+                anchor="w", font=font, fill=fg)
+
+        self.hover_id = canvas.create_rectangle(
+            0, 0, 0, 0, outline=self.entry_highlighted_color, state="hidden")
+        self.focus_id = canvas.create_rectangle(
+            0, 0, 0, 0, outline=self.text_normal_color, dash=(1, 1),
+            state="hidden")
+        self.move_row_highlight(self.hover_id, self.hover_bit)
+        self.move_row_highlight(self.focus_id, self.focus_bit)
+        self.reload()
 
-                name = opt.get('GUI_NAME', opt['NAME'])
-                if opt.get('TOOLTIP'):
-                    name += " �"
+    def move_row_highlight(self, item_id, bit):
+        canvas = self.check_canvas
+        if item_id is None:
+            return
+        elif bit not in self.bit_opt_map:
+            canvas.itemconfigure(item_id, state="hidden")
+            return
 
-                self.checkvars[bit] = check_var = tk.IntVar(self.check_frame)
-                state = tk.DISABLED
-                if opt.get("EDITABLE", not self.disabled):
-                    state = tk.NORMAL
+        pad = self.listbox_depth
+        y0 = pad + self.bit_rows.index(bit)*self.row_height
+        canvas.coords(item_id, pad, y0,
+                      max(self.check_canvas.winfo_width(),
+                          int(canvas.cget("width"))) - pad - 1,
+                      y0 + self.row_height - 1)
+        canvas.itemconfigure(item_id, state="normal")
 
-                self.checkbtns[bit] = check_btn = tk.Checkbutton(
-                    self.check_frame, variable=check_var, padx=0, pady=0,
-                    text=name, anchor='nw', justify='left',
-                    borderwidth=0, state=state,)
+    def reload(self):
+        data = getattr(self.node, "data", 0)
 
-                check_btn.config(command=lambda b=check_btn, i=bit, v=check_var:
-                                 self._check_bool(b, i, v))
+        # check/uncheck each flag
+        itemconfigure = self.check_canvas.itemconfigure
+        for bit, check_id in self.check_ids.items():
+            itemconfigure(check_id, state=(
+                "normal" if data & (1 << bit) else "hidden"))
+
+    def click_bit(self, e):
+        self.check_canvas.focus_set()
+        bit = self.get_bit_at(e.y)
+        if bit is None:
+            return
 
-                check_btn.pack(anchor='nw', fill='x', expand=True)
-                check_btn.tooltip_string = opt.get('TOOLTIP')
+        self.focus_bit = bit
+        self.move_row_highlight(self.focus_id, bit)
+        self.toggle_bit(bit)
 
-                if e_c.IS_LNX:
-                    check_btn.bind('<4>', self.mousewheel_scroll_y)
-                    check_btn.bind('<5>', self.mousewheel_scroll_y)
-                else:
-                    check_btn.bind('<MouseWheel>', self.mousewheel_scroll_y)
+    def hover_over_bit(self, e):
+        bit = None
+        if str(e.type) != "Leave":
+            bit = self.get_bit_at(e.y)
 
-            self.apply_style()
-            self.bit_opt_map = bit_opt_map
+        if bit == self.hover_bit:
+            return
 
-        self.reload()
+        self.hover_bit = bit
+        self.move_row_highlight(self.hover_id, bit)
+        # the tooltip handler displays the tooltip_string of the
+        # widget under the mouse, so swap in the hovered bits tooltip
+        if bit is None:
+            self.check_canvas.tooltip_string = self.desc.get('TOOLTIP')
+        else:
+            self.check_canvas.tooltip_string = \
+                self.bit_opt_map[bit].get('TOOLTIP')
 
-    def reload(self):
-        data = getattr(self.node, "data", 0)
+    def move_focus_bit(self, delta):
+        if not self.bit_rows:
+            return
 
-        # check/uncheck each flag
-        for bit in sorted(self.bit_opt_map):
-            self.checkvars[bit].set(bool(data & (1 << bit)))
+        if self.focus_bit not in self.bit_opt_map:
+            row = 0
+        else:
+            row = self.bit_rows.index(self.focus_bit) + delta
+            row = max(0, min(row, len(self.bit_rows) - 1))
+
+        self.focus_bit = self.bit_rows[row]
+        self.move_row_highlight(self.focus_id, self.focus_bit)
+
+        # scroll the focused bit into view
+        top = self.check_canvas.canvasy(0)
+        y0 = self.listbox_depth + row*self.row_height
+        height = self.check_canvas.winfo_height()
+        if y0 < top:
+            self.check_canvas.yview_scroll(int(y0 - top), "units")
+        elif y0 + self.row_height > top + height:
+            self.check_canvas.yview_scroll(
+                int(y0 + self.row_height - top - height), "units")
+
+    def toggle_focus_bit(self, e=None):
+        if self.focus_bit is not None:
+            self.toggle_bit(self.focus_bit)
+
+    def toggle_bit(self, bit):
+        if self.node is None or not self.is_bit_editable(bit):
+            return
 
-    def _check_bool(self, check_btn, bit, check_var):
-        check_btn.focus_set()
-        self.set_bool_to(bit, check_var)
+        self.set_bool_to(bit, not self.node.data & (1 << bit))
+        self.reload()
 
-    def set_bool_to(self, bit, new_val_var):
+    def set_bool_to(self, bit, new_val):
         if self.node is None:
             return
 
         self.set_edited()
-        mask, data, new_val = 1 << bit, self.node.data, bool(new_val_var.get())
+        mask, data, new_val = 1 << bit, self.node.data, bool(new_val)
 
         self.edit_create(bit=bit, mask=mask, redo_node=new_val)
         self.node.data = data - (data & mask) + mask*new_val
 
-    def apply_style(self, seen=None):
-        super(BoolFrame, self).apply_style(seen)
-
-        for k in self.checkbtns:
-            self.checkbtns[k].config(
-                bg=self.entry_normal_color, fg=self.text_normal_color, 
-                activebackground=self.entry_highlighted_color,
-                activeforeground=self.text_highlighted_color,)
-        self.pose_fields()
-
     def pose_fields(self):
         self.content.pack(side='left', anchor='nw')
         self.check_canvas.pack(side='left', fill='both')
-        self.update()
-        if not getattr(self, "check_frame", None):
-            return
 
-        width  = self.check_frame.winfo_reqwidth()
-        height = self.check_frame.winfo_reqheight()
+        font = self.get_font("default")
+        pad = self.listbox_depth
+        width = 0
+        for bit in self.bit_rows:
+            opt = self.bit_opt_map[bit]
+            name = opt.get('GUI_NAME', opt['NAME'])
+            if opt.get('TOOLTIP'):
+                name += " �"
+            width = max(width, font.measure(name))
+
+        width += self.row_height + 8
+        height = len(self.bit_rows)*self.row_height
 
-        self.check_canvas.config(scrollregion="0 0 %s %s" % (width, height))
+        self.check_canvas.config(scrollregion="0 0 %s %s" % (
+            width + pad*2, height + pad*2))
 
         width  = max(width,  self.bool_frame_min_width)
         height = max(height, self.bool_frame_min_height)
@@ -249,23 +332,16 @@ def pose_fields(self):
             self.children_can_scroll = False
 
         self.check_canvas.can_scroll = self.children_can_scroll
-        self.check_frame.can_scroll = self.children_can_scroll
         self.scrollbar_y.can_scroll = self.children_can_scroll
 
         self.check_canvas.f_widget_parent = self
-        self.check_frame.f_widget_parent = self
         self.scrollbar_y.f_widget_parent = self
-        for w in self.check_frame.children.values():
-            w.can_scroll = self.children_can_scroll
-            w.f_widget_parent = self
 
         width = min(self.bool_frame_max_width, width)
         height = min(self.bool_frame_max_height, height)
-        self.content.config(width=width + self.frame_depth*2,
-                            height=height + self.frame_depth*2)
         self.check_canvas.config(width=width, height=height)
-        self.check_canvas.itemconfigure(
-            self.check_frame_id, width=self.check_canvas.winfo_reqwidth())
+        self.move_row_highlight(self.hover_id, self.hover_bit)
+        self.move_row_highlight(self.focus_id, self.focus_bit)
 
     def mousewheel_scroll_y(self, e):
         if self.should_scroll(e):
@@ -9,6 +9,8 @@
 class ColorPickerFrame(container_frame.ContainerFrame):
 
     color_type = int
+    # the color channel widgets are traced, so they must always exist
+    can_virtualize = False
 
     def __init__(self, *args, **kwargs):
         container_frame.ContainerFrame.__init__(self, *args, **kwargs)
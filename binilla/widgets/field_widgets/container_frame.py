@@ -13,6 +13,18 @@ class ContainerFrame(tk.Frame, field_widget.FieldWidget):
     import_btn = None
     export_btn = None
 
+    # whether or not this widget can delay building its child widgets
+    # until they are scrolled into view when virtualizing widgets.
+    can_virtualize = True
+
+    # the attr_indices of each visible field, in the order they are packed.
+    # only used when virtualizing widgets, so it is empty otherwise.
+    virtual_field_indices = ()
+    # mappings of {attr_index: placeholder frame} for each visible field
+    # and {attr_index: kwargs} for the kwargs to build its widget with.
+    virtual_placeholders = ()
+    virtual_field_kwargs = ()
+
     def __init__(self, *args, **kwargs):
         field_widget.FieldWidget.__init__(self, *args, **kwargs)
 
@@ -83,6 +95,10 @@ def load_node_data(self, parent, node, attr_index, desc=None):
             # needs repopulating. can't load child node data
             return True
 
+        if self.virtual_placeholders and not self.virtualize_widgets:
+            # unloaded before the TagWindow finished building its fields
+            self.queue_realize()
+
         return self.load_child_node_data()
 
     def load_child_node_data(self):
@@ -128,36 +144,28 @@ def apply_style(self, seen=None):
 
     @property
     def field_count(self):
-        desc = self.desc
         try:
-            return desc.get('ENTRIES', 0) + ('STEPTREE' in desc)
+            return self.desc_metadata.field_count
         except Exception:
             return 0
 
     @property
     def visible_field_count(self):
-        desc = self.desc
+        return len(self.get_visible_field_indices())
+
+    def get_visible_field_indices(self):
+        '''Returns a list of the indices of the fields that will be shown.'''
+        layout_plan = self.layout_plan
+        if layout_plan is not None:
+            field_indices = layout_plan.get_field_indices(self.node)
+            if field_indices is not None:
+                return field_indices
+
         try:
-            total = 0
-            node = self.node
-            sub_node = None
-            entries = tuple(range(desc.get('ENTRIES', 0)))
-            if 'STEPTREE' in desc:
-                entries += ('STEPTREE',)
-
-            for i in entries:
-                sub_desc = desc[i]
-                if hasattr(node, "__getitem__"):
-                    sub_node = node[i]
-
-                if hasattr(sub_node, 'desc'):
-                    sub_desc = sub_node.desc
-
-                if self.get_visible(sub_desc.get('VISIBLE', True)):
-                    total += 1
-            return total
+            return self.desc_metadata.get_visible_fields(
+                self.get_visible, self.node)
         except (IndexError, KeyError, AttributeError):
-            return 0
+            return []
 
     def edit_apply(self=None, *, edit_state, undo=True):
         state = edit_state
@@ -211,13 +219,20 @@ def populate(self):
         self.f_widget_ids_map = {}
         self.f_widget_ids_map_inv = {}
 
-        # destroy all the child widgets of the content
+        # release all the child widgets of the content to be reused
         for w in self.f_widgets.values():
-            w.destroy()
+            self.release_field_widget(w)
+
+        if self.virtual_placeholders:
+            for w in self.virtual_placeholders.values():
+                w.destroy()
+
+        self.virtual_field_indices = []
+        self.virtual_placeholders = {}
+        self.virtual_field_kwargs = {}
 
         node = self.node
         desc = self.desc
-        picker = self.widget_picker
         tag_window = self.tag_window
 
         self.display_comment(self.content)
@@ -243,15 +258,13 @@ def populate(self):
         if getattr(self, 'title_label', None):
             self.title_label.tooltip_string = self.tooltip_string
 
-        field_indices = range(desc['ENTRIES'])
-        # if the node has a steptree node, include its index in the indices
-        if 'STEPTREE' in desc:
-            field_indices = tuple(field_indices) + ('STEPTREE',)
+        # the fields that shouldnt be visible dont get widgets made
+        field_indices = self.get_visible_field_indices()
 
         kwargs = dict(parent=node, tag_window=tag_window, f_widget_parent=self,
                       disabled=self.disabled, vert_oriented=vertical)
 
-        visible_field_count = self.visible_field_count
+        visible_field_count = len(field_indices)
         # if only one sub-widget being displayed, dont
         # display the title of the widget being displayed
         if self.field_count != visible_field_count and visible_field_count < 2:
@@ -269,6 +282,12 @@ def populate(self):
             # singular child appears where this widget would.
             kwargs.update(use_parent_pack_padx=True)
 
+        # if virtualizing, only placeholders are made here. The widgets
+        # are built when the TagWindow scrolls their placeholders into view.
+        # if deferring, the TagWindow builds them a few at a time when idle
+        virtualize = (vertical and self.can_virtualize and
+                      (self.virtualize_widgets or self.defer_widgets))
+
         # loop over each field and make its widget
         sub_node = None
         for i in field_indices:
@@ -279,26 +298,16 @@ def populate(self):
             if hasattr(sub_node, 'desc'):
                 sub_desc = sub_node.desc
 
-            # if the field shouldnt be visible, dont make its widget
-            if not self.get_visible(sub_desc.get('VISIBLE', True)):
-                continue
-
-            widget_cls = picker.get_widget(sub_desc)
             if i == field_indices[-1] and vertical:
                 kwargs.update(pack_pady=0)
 
-            try:
-                widget = widget_cls(content, node=sub_node,
-                                    attr_index=i, desc=sub_desc, **kwargs)
-            except Exception:
-                print(format_exc())
-                widget = data_frame.NullFrame(
-                    content, node=sub_node, attr_index=i, desc=sub_desc, **kwargs)
-
-            wid = id(widget)
-            self.f_widget_ids.append(wid)
-            self.f_widget_ids_map[i] = wid
-            self.f_widget_ids_map_inv[wid] = i
+            if virtualize:
+                self.virtual_field_indices.append(i)
+                self.virtual_field_kwargs[i] = dict(kwargs)
+                self.virtual_placeholders[i] = self.make_placeholder(
+                    sub_desc, kwargs.get('pack_pady', self.vertical_pady))
+            else:
+                self.make_field_widget(i, sub_node, sub_desc, **kwargs)
 
         self.build_f_widget_cache()
 
@@ -306,6 +315,219 @@ def populate(self):
         if self.show.get():
             self.pose_fields()
 
+        if self.virtual_placeholders and not self.virtualize_widgets:
+            self.queue_realize()
+
+    def make_field_widget(self, attr_index, sub_node, sub_desc, **kwargs):
+        '''
+        Builds a FieldWidget to display the given node within the content
+        frame and records its id under the attr_index it is displaying.
+        '''
+        widget = self.build_field_widget(
+            sub_desc, node=sub_node, attr_index=attr_index, **kwargs)
+
+        wid = id(widget)
+        self.f_widget_ids.append(wid)
+        self.f_widget_ids_map[attr_index] = wid
+        self.f_widget_ids_map_inv[wid] = attr_index
+        return widget
+
+    def build_field_widget(self, sub_desc, **kwargs):
+        '''
+        Returns a FieldWidget to display nodes with the given descriptor
+        within the content frame. A widget from the TagWindows widget pool
+        is rebound and returned if one exists, otherwise one is built.
+        '''
+        # imported here since those modules import this one
+        from binilla.widgets.field_widgets import array_frame,\
+             array_table_frame
+
+        widget_cls = self.widget_picker.get_widget(sub_desc)
+        if (widget_cls is array_frame.ArrayFrame and
+                self.show_arrays_as_tables and
+                array_table_frame.ArrayTableFrame.can_display(sub_desc)):
+            widget_cls = array_table_frame.ArrayTableFrame
+
+        pool = self.widget_pool
+        if pool is not None:
+            widget = pool.acquire(widget_cls, self.content, sub_desc, **kwargs)
+            if widget is not None:
+                return widget
+
+        try:
+            widget = widget_cls(self.content, desc=sub_desc, **kwargs)
+            if pool is not None:
+                pool.register(widget, **kwargs)
+            return widget
+        except Exception:
+            print(format_exc())
+            return data_frame.NullFrame(self.content, desc=sub_desc, **kwargs)
+
+    def release_field_widget(self, widget):
+        '''
+        Releases the widget to the TagWindows widget pool so
+        it can be reused, or destroys it if it can't be pooled.
+        '''
+        pool = self.widget_pool
+        if pool is None or not pool.release(widget):
+            widget.destroy()
+
+    def make_placeholder(self, sub_desc, pack_pady=0):
+        '''
+        Makes an empty frame to stand in for a field widget that hasn't been
+        built yet. Its height is an estimate of how tall the widget will be.
+        '''
+        rows = 1
+        f_type = sub_desc['TYPE']
+        if ((f_type.is_struct or f_type.is_container) and
+            not self.blocks_start_hidden):
+            rows += sub_desc.get('ENTRIES', 0)
+
+        placeholder = tk.Frame(
+            self.content, height=rows*e_c.VIRTUAL_ROW_HEIGHT,
+            bd=0, highlightthickness=0, bg=self.default_bg_color)
+        placeholder.pack_padx = 0
+        placeholder.pack_pady = pack_pady
+        return placeholder
+
+    def realize_field(self, attr_index):
+        '''
+        Builds the widget for the field at attr_index and packs
+        it where its placeholder is. Returns the built widget.
+        '''
+        placeholder = self.virtual_placeholders.get(attr_index)
+        if placeholder is None:
+            return None
+
+        wid = self.f_widget_ids_map.get(attr_index)
+        if wid in self.f_widgets:
+            return self.f_widgets[wid]
+
+        node = self.node
+        sub_node = None
+        sub_desc = self.desc[attr_index]
+        if hasattr(node, "__getitem__"):
+            sub_node = node[attr_index]
+
+        if hasattr(sub_node, 'desc'):
+            sub_desc = sub_node.desc
+
+        # the node or disabled state may have changed since populating
+        kwargs = self.virtual_field_kwargs[attr_index]
+        kwargs.update(parent=node, disabled=self.disabled)
+
+        widget = self.make_field_widget(attr_index, sub_node, sub_desc, **kwargs)
+        self.f_widgets[id(widget)] = widget
+
+        if placeholder.winfo_manager():
+            widget.pack(fill='x', side='top', anchor='nw', before=placeholder,
+                        padx=widget.pack_padx, pady=widget.pack_pady)
+            placeholder.pack_forget()
+        widget.apply_style()
+        return widget
+
+    def queue_realize(self):
+        '''
+        Queues this widget with its TagWindow to have the
+        fields still left as placeholders built while idle.
+        '''
+        try:
+            self.tag_window.queue_realize(self)
+        except AttributeError:
+            pass
+
+    def finish_realizing(self):
+        '''
+        Destroys the placeholders left after building all fields that were
+        deferred, so this widget goes back to handling its fields normally.
+        Does nothing if virtualizing, as placeholders are still needed then.
+        '''
+        if not self.virtual_placeholders or self.virtualize_widgets:
+            return
+
+        f_widget_ids = []
+        for i in self.virtual_field_indices:
+            wid = self.f_widget_ids_map.get(i)
+            if wid not in self.f_widgets:
+                # something wasn't built. keep the placeholders around
+                return
+            f_widget_ids.append(wid)
+
+        for w in self.virtual_placeholders.values():
+            w.destroy()
+
+        self.f_widget_ids = f_widget_ids
+        self.virtual_field_indices = []
+        self.virtual_placeholders = {}
+        self.virtual_field_kwargs = {}
+
+    def unrealize_field(self, attr_index):
+        '''
+        Flushes and releases the widget for the field at attr_index, and
+        packs a placeholder the same height as it in its place.
+        Returns True if the widget was released.
+        '''
+        placeholder = self.virtual_placeholders.get(attr_index)
+        wid = self.f_widget_ids_map.get(attr_index)
+        w = self.f_widgets.get(wid)
+        if placeholder is None or w is None:
+            return False
+
+        try:
+            # dont destroy the widget the user is typing into
+            focus = str(self.focus_get())
+            if focus == str(w) or focus.startswith(str(w) + "."):
+                return False
+        except Exception:
+            pass
+
+        if w.needs_flushing:
+            w.flush()
+
+        placeholder.config(height=max(1, w.winfo_height()))
+        placeholder.pack_pady = w.pack_pady
+        placeholder.pack(fill='x', side='top', anchor='nw', before=w,
+                         padx=placeholder.pack_padx, pady=placeholder.pack_pady)
+
+        self.f_widgets.pop(wid, None)
+        self.f_widget_ids_map.pop(attr_index, None)
+        self.f_widget_ids_map_inv.pop(wid, None)
+        if wid in self.f_widget_ids:
+            self.f_widget_ids.remove(wid)
+
+        self.release_field_widget(w)
+        return True
+
+    def update_virtual_fields(self, top, bottom):
+        if not self.virtual_placeholders:
+            return field_widget.FieldWidget.update_virtual_fields(
+                self, top, bottom)
+
+        content = self.content
+        if content is not self and not content.winfo_manager():
+            # collapsed. nothing inside is visible
+            return False
+
+        changed = False
+        y_off = 0 if content is self else content.winfo_y()
+        for i in self.virtual_field_indices:
+            w = self.f_widgets.get(self.f_widget_ids_map.get(i))
+            slot = self.virtual_placeholders[i] if w is None else w
+            y = slot.winfo_y() + y_off
+            in_view = y + slot.winfo_height() >= top and y <= bottom
+            try:
+                if w is None:
+                    if in_view:
+                        changed |= self.realize_field(i) is not None
+                elif not in_view:
+                    changed |= self.unrealize_field(i)
+                else:
+                    changed |= bool(w.update_virtual_fields(top - y, bottom - y))
+            except Exception:
+                print(format_exc())
+
+        return changed
+
     def reload(self):
         '''Resupplies the nodes to the widgets which display them.'''
         try:
@@ -347,9 +569,14 @@ def flush(self):
             return
 
         try:
-            for w in self.f_widgets.values():
-                if hasattr(w, 'flush'):
-                    w.flush()
+            dirty_widgets = self.dirty_widgets
+            if dirty_widgets is not None:
+                # only flush the widgets below this one that have changes
+                dirty_widgets.flush(self)
+            else:
+                for w in self.f_widgets.values():
+                    if hasattr(w, 'flush'):
+                        w.flush()
             self.set_needs_flushing(False)
         except Exception:
             print(format_exc())
@@ -369,8 +596,16 @@ def pose_fields(self):
                 self.set_export_disabled()
 
         side = 'left' if orient == 'h' else 'top'
-        for wid in self.f_widget_ids:
-            w = self.f_widgets[wid]
+        if self.virtual_field_indices:
+            widgets = []
+            for i in self.virtual_field_indices:
+                wid = self.f_widget_ids_map.get(i)
+                widgets.append(self.f_widgets.get(wid,
+                                                  self.virtual_placeholders[i]))
+        else:
+            widgets = [self.f_widgets[wid] for wid in self.f_widget_ids]
+
+        for w in widgets:
             w.pack(fill='x', side=side, anchor='nw',
                    padx=w.pack_padx, pady=w.pack_pady)
 
@@ -6,6 +6,7 @@
 from supyr_struct.buffer import get_rawdata_context
 
 from binilla import editor_constants as e_c
+from binilla.widgets.hex_view import HexView
 from binilla.widgets.field_widgets import field_widget
 from binilla.windows.filedialog import askopenfilename
 
@@ -73,6 +74,9 @@ def reload(self): pass
 
 
 class RawdataFrame(DataFrame):
+    # built the first time the hex view is shown
+    hex_view = None
+    hex_btn = None
 
     def __init__(self, *args, **kwargs):
         DataFrame.__init__(self, *args, **kwargs)
@@ -104,7 +108,11 @@ def edit_apply(self=None, *, edit_state, undo=True):
         w_parent, parent = field_widget.FieldWidget.get_widget_and_node(
             nodepath=edit_state.nodepath, tag_window=edit_state.tag_window)
 
-        if undo:
+        if edit_state.edit_type == 'patch_bytes':
+            RawdataFrame.patch_node(
+                parent, attr_index, edit_state.edit_info['offset'],
+                edit_state.undo_node if undo else edit_state.redo_node)
+        elif undo:
             parent[attr_index] = edit_state.undo_node
         else:
             parent[attr_index] = edit_state.redo_node
@@ -122,6 +130,66 @@ def edit_apply(self=None, *, edit_state, undo=True):
             except Exception:
                 print(format_exc())
 
+    @staticmethod
+    def patch_node(parent, attr_index, offset, new_bytes):
+        '''
+        Overwrites the bytes of parent[attr_index] starting at offset.
+        Mutable buffers are written to in place, while immutable ones
+        are replaced with a patched copy of the same type.
+        '''
+        node = parent[attr_index]
+        end = offset + len(new_bytes)
+        with memoryview(node) as view, view.cast('B') as view:
+            if not view.readonly:
+                view[offset: end] = new_bytes
+                return
+
+            patched = bytearray(view)
+
+        patched[offset: end] = new_bytes
+        parent[attr_index] = type(node)(patched)
+
+    def write_bytes(self, offset, new_bytes):
+        '''
+        Overwrites the bytes of the node starting at offset, recording
+        only the bytes that were overwritten so the edit can be undone.
+        '''
+        if None in (self.parent, self.node) or self.disabled:
+            return
+
+        with memoryview(self.node) as view, view.cast('B') as view:
+            undo_bytes = bytes(view[offset: offset + len(new_bytes)])
+
+        new_bytes = new_bytes[: len(undo_bytes)]
+        if new_bytes == undo_bytes:
+            return
+
+        self.edit_create(edit_type='patch_bytes', offset=offset,
+                         undo_node=undo_bytes, redo_node=new_bytes)
+        self.patch_node(self.parent, self.attr_index, offset, new_bytes)
+        self.node = self.parent[self.attr_index]
+        self.set_edited()
+        self.reload()
+
+    def toggle_hex_view(self):
+        if self.hex_view is None:
+            self.hex_view = HexView(
+                self, write_callback=self.write_bytes,
+                editable=not self.disabled)
+            self.hex_view.f_widget_parent = self
+            self.hex_view.canvas.f_widget_parent = self
+            self.hex_view.canvas.can_scroll = True
+
+        if self.hex_view.winfo_manager():
+            self.hex_view.pack_forget()
+            self.hex_btn.config(text='Hex')
+        else:
+            self.hex_view.pack(side='bottom', fill='x', before=self.import_btn,
+                               padx=self.horizontal_padx,
+                               pady=self.horizontal_pady)
+            self.hex_btn.config(text='Hide')
+            self.reload()
+
     def populate(self):
         self.title_label = tk.Label(
             self, text=self.gui_name, width=self.title_size, anchor='w',
@@ -141,6 +209,10 @@ def populate(self):
         self.delete_btn = ttk.Button(
             self, width=6, text='Delete',
             command=self.delete_node)
+        self.hex_btn = ttk.Button(
+            self, width=6, text='Hex',
+            command=self.toggle_hex_view)
+        self.hex_btn.tooltip_string = "Show or hide the bytes of this data."
 
         # now that the field widgets are created, position them
         self.pose_fields()
@@ -154,6 +226,8 @@ def set_disabled(self, disable=True):
             for w in (self.import_btn, self.export_btn, self.delete_btn):
                 if w:
                     w.config(state=tk.DISABLED if disable else tk.NORMAL)
+            if self.hex_view:
+                self.hex_view.editable = not disable
 
         DataFrame.set_disabled(self, disable)
 
@@ -276,8 +350,16 @@ def pose_fields(self):
         self.import_btn.pack(side='left', fill="x", padx=padx, pady=pady)
         self.export_btn.pack(side='left', fill="x", padx=padx, pady=pady)
         self.delete_btn.pack(side='left', fill="x", padx=padx, pady=pady)
+        self.hex_btn.pack(side='left', fill="x", padx=padx, pady=pady)
 
-    def reload(self): pass
+    def unload_node_data(self):
+        DataFrame.unload_node_data(self)
+        if self.hex_view:
+            self.hex_view.set_source(None)
+
+    def reload(self):
+        if self.hex_view and self.hex_view.winfo_manager():
+            self.hex_view.set_source(self.node)
 
 
 class VoidFrame(DataFrame):
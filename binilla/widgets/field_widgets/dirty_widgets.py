@@ -0,0 +1,97 @@
+import weakref
+
+from traceback import format_exc
+
+
+def is_descendant(widget, ancestor):
+    '''
+    Returns True if the FieldWidget is the ancestor, or is
+    below it in the chain of f_widget_parents leading to it.
+    '''
+    while widget is not None:
+        if widget is ancestor:
+            return True
+        widget = getattr(widget, "f_widget_parent", None)
+    return False
+
+
+def is_root_widget(widget):
+    '''Returns True if the FieldWidget has no FieldWidget parent.'''
+    return not hasattr(getattr(widget, "f_widget_parent", None), "set_edited")
+
+
+class DirtyWidgetTracker:
+    '''
+    Keeps track of which FieldWidgets in a TagWindow have unsaved edits
+    or unflushed changes, so flushing and clearing the edited flags after
+    saving only visit those widgets rather than every widget in the tag.
+
+    Widgets are held weakly, as they may be destroyed while still dirty.
+    '''
+    def __init__(self):
+        # widgets whose edited flag is set
+        self.edited = weakref.WeakSet()
+        # widgets whose needs_flushing flag is set, either because they
+        # have changes to flush or because one of their children does
+        self.unflushed = weakref.WeakSet()
+        # the widgets with changes of their own that need flushing
+        self.flush_pending = weakref.WeakSet()
+
+    def _pop_widgets(self, widgets, root):
+        '''
+        Removes and returns the widgets in the set that are the root or
+        are below it. If the root is at the top of its widget tree, every
+        widget in the set is removed without checking where it is.
+        '''
+        if root is None or is_root_widget(root):
+            popped = tuple(widgets)
+            widgets.clear()
+            return popped
+
+        popped = tuple(w for w in widgets if is_descendant(w, root))
+        for w in popped:
+            widgets.discard(w)
+        return popped
+
+    def mark_edited(self, widget):
+        self.edited.add(widget)
+
+    def clear_edited(self, root=None):
+        '''Clears the edited flag of the root and all widgets below it.'''
+        for w in self._pop_widgets(self.edited, root):
+            w.edited = False
+
+    def mark_needs_flushing(self, widget, pending=True):
+        '''
+        Records that the widget needs flushing. If pending is False, the
+        widget is only flagged because one of its children needs flushing.
+        '''
+        self.unflushed.add(widget)
+        if pending:
+            self.flush_pending.add(widget)
+
+    def clear_needs_flushing(self, root=None):
+        '''Clears the needs_flushing flag of the root and all widgets below it.'''
+        self._pop_widgets(self.flush_pending, root)
+        for w in self._pop_widgets(self.unflushed, root):
+            w.needs_flushing = False
+
+    def flush(self, root=None):
+        '''
+        Flushes every widget below the root with changes of its own
+        to flush. The root itself is not flushed, as it is the caller.
+        '''
+        for w in self._pop_widgets(self.flush_pending, root):
+            if w is root:
+                continue
+
+            try:
+                if w.needs_flushing and w.node is not None:
+                    w.flush()
+            except Exception:
+                print(format_exc())
+
+    def clear(self):
+        self.edited.clear()
+        self.unflushed.clear()
+        self.flush_pending.clear()
@@ -32,6 +32,87 @@ def float_from_bytes(val, end='<'):
     )
 
 
+def node_to_str(node, desc, unit_scale=None):
+    '''
+    Returns the string to display a data node as in an entry
+    field, scaling it by the unit_scale if one is provided.
+    '''
+    str_node = node
+    if unit_scale is not None and isinstance(node, (int, float)):
+        str_node = node * unit_scale
+
+    if isinstance(str_node, float):
+        # find the precision of the float
+        field_type = desc.get('TYPE')
+        prec = 0
+        if   'f' in field_type.enc:
+            prec = FLOAT_PREC
+        elif 'd' in field_type.enc:
+            prec = DOUBLE_PREC
+        elif hasattr(field_type, "mantissa_len"):
+            prec = field_type.mantissa_len*math.log(2, 10)
+
+        if unit_scale:
+            prec -= math.ceil(math.log(abs(unit_scale), 10))
+        return float_to_str(str_node, prec)
+    elif unit_scale and isinstance(node, int):
+        return float_to_str(
+            float(str_node), -1*math.ceil(math.log(abs(unit_scale), 10)))
+    elif str_node is None:
+        return ""
+    return str(str_node)
+
+
+def parse_number_input(string, desc, field_max=None, field_min=None,
+                       unit_scale=None, evaluate=False,
+                       enforce_max=True, enforce_min=True):
+    '''
+    Converts a string entered into a number entry field into a node
+    using the given descriptor, clipping it to the max and min values.
+    '''
+    desc_size  = desc.get('SIZE')
+    field_type = desc.get('TYPE')
+    node_cls = desc.get('NODE_CLS', field_type.node_cls)
+
+    new_node = string
+    if evaluate:
+        if "__" in new_node:
+            raise ValueError("Unsafe operations included in evaluation string.")
+        new_node = eval(new_node, {'__builtins__': {}}, number_eval_globals)
+
+    if unit_scale is None:
+        unit_scale = 1
+        new_node = node_cls(new_node)
+    else:
+        new_node = float(new_node) / unit_scale
+        if issubclass(node_cls, int):
+            # going to int, so decimals dont matter. do rounding
+            new_node = node_cls(round(new_node))
+
+    if isinstance(new_node, float):
+        pass
+    elif field_max is None and isinstance(desc_size, int):
+        if not field_type.is_bit_based:
+            field_max = 2**(desc_size * 8)
+        else:
+            field_max = 2**desc_size
+
+    if field_max is not None and new_node >= field_max:
+        if enforce_max:
+            new_node = field_max
+            if not desc.get('ALLOW_MAX', True):
+                raise ValueError("Enter a value below %s" %
+                                 (field_max * unit_scale))
+    elif field_min is not None and new_node <= field_min:
+        if enforce_min:
+            new_node = field_min
+            if not desc.get('ALLOW_MIN', True):
+                raise ValueError("Enter a value above %s" %
+                                 (field_min * unit_scale))
+
+    return new_node
+
+
 class EntryFrame(data_frame.DataFrame):
 
     last_flushed_val = None  # used for determining if a change has been made
@@ -258,12 +339,6 @@ def populate(self):
 
     def reload(self):
         try:
-            node = self.node
-            unit_scale = self.unit_scale
-
-            if unit_scale is not None and isinstance(node, (int, float)):
-                node *= unit_scale
-
             highlight = False
             if self.data_entry.selection_present():
                 highlight = True
@@ -275,27 +350,8 @@ def reload(self):
             self.data_entry.config(state=tk.NORMAL)
 
             self.data_entry.delete(0, tk.END)
-            if isinstance(node, float):
-                # find the precision of the float
-                field_type = self.desc.get('TYPE')
-                prec = 0
-                if   'f' in field_type.enc:
-                    prec = FLOAT_PREC
-                elif 'd' in field_type.enc:
-                    prec = DOUBLE_PREC
-                elif hasattr(field_type, "mantissa_len"):
-                    prec = field_type.mantissa_len*math.log(2, 10)
-
-                if unit_scale:
-                    prec -= math.ceil(math.log(abs(unit_scale), 10))
-                self.last_flushed_val = float_to_str(node, prec)
-            elif unit_scale and isinstance(self.node, int):
-                self.last_flushed_val = float_to_str(
-                    float(node), -1*math.ceil(math.log(abs(unit_scale), 10)))
-            elif node is None:
-                self.last_flushed_val = ""
-            else:
-                self.last_flushed_val = str(node)
+            self.last_flushed_val = node_to_str(
+                self.node, self.desc, self.unit_scale)
 
             self.data_entry.insert(0, self.last_flushed_val)
             self.needs_flushing = False
@@ -313,50 +369,10 @@ def reload(self):
 class NumberEntryFrame(EntryFrame):
 
     def parse_input(self):
-        desc = self.desc
-        field_max, field_min = self.field_max, self.field_min
-        unit_scale = self.unit_scale
-        desc_size  = desc.get('SIZE')
-        field_type = desc.get('TYPE')
-        node_cls = desc.get('NODE_CLS', field_type.node_cls)
-
-        new_node = self.entry_string.get()
-        if self.evaluate_entry_fields:
-            if "__" in new_node:
-                raise ValueError("Unsafe operations included in evaluation string.")
-            new_node = eval(new_node, {'__builtins__': {}}, number_eval_globals)
-
-        if unit_scale is None:
-            unit_scale = 1
-            new_node = node_cls(new_node)
-        else:
-            new_node = float(new_node) / unit_scale
-            if issubclass(node_cls, int):
-                # going to int, so decimals dont matter. do rounding
-                new_node = node_cls(round(new_node))
-
-        if isinstance(new_node, float):
-            pass
-        elif field_max is None and isinstance(desc_size, int):
-            if not field_type.is_bit_based:
-                field_max = 2**(desc_size * 8)
-            else:
-                field_max = 2**desc_size
-
-        if field_max is not None and new_node >= field_max:
-            if self.enforce_max:
-                new_node = field_max
-                if not desc.get('ALLOW_MAX', True):
-                    raise ValueError("Enter a value below %s" %
-                                     (field_max * unit_scale))
-        elif field_min is not None and new_node <= field_min:
-            if self.enforce_min:
-                new_node = field_min
-                if not desc.get('ALLOW_MIN', True):
-                    raise ValueError("Enter a value above %s" %
-                                     (field_min * unit_scale))
-
-        return new_node
+        return parse_number_input(
+            self.entry_string.get(), self.desc,
+            self.field_max, self.field_min, self.unit_scale,
+            self.evaluate_entry_fields, self.enforce_max, self.enforce_min)
 
     @property
     def entry_width(self):
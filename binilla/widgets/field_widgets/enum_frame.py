@@ -3,6 +3,7 @@
 from traceback import format_exc
 
 from binilla import editor_constants as e_c
+from binilla.dyn_name_path import compile_dyn_name_path, split_dyn_enum_path
 from binilla.widgets.scroll_menu import ScrollMenu
 from binilla.widgets.field_widgets import field_widget, data_frame
 
@@ -123,23 +124,10 @@ def get_options(self, opt_index=None):
         return self.option_cache.get(opt_index, None)
 
     def generate_options(self, opt_index=None):
-        desc = self.desc
-        options = {}
-        option_count = desc.get('ENTRIES', 0)
-        options_to_generate = range(option_count)
-        if opt_index is not None:
-            options_to_generate = (
-                (opt_index, ) if opt_index in options_to_generate else ())
-
-        # sort the options by value(values are integers)
-        use_gui_names = self.use_gui_names
-        for i in options_to_generate:
-            opt = desc[i]
-            if use_gui_names and 'GUI_NAME' in opt:
-                options[i] = opt['GUI_NAME']
-            else:
-                options[i] = opt.get('NAME', '<UNNAMED %s>' % i)\
-                             .replace('_', ' ')
+        # the option names are the same for every node with this
+        # descriptor, so they're only generated once per descriptor
+        options = self.desc_metadata.get_enum_options(self.use_gui_names)
+        option_count = len(options)
 
         if opt_index is None:
             self.options_sane = True
@@ -286,27 +274,19 @@ def generate_options(self, opt_index=None):
             return None
 
         try:
-            p_out, p_in = dyn_name_path.split('[DYN_I]')
-
-            # We are ALWAYS going to go to the parent, so we need to slice
-            if p_out.startswith('..'): p_out = p_out.split('.', 1)[-1]
-            array = self.parent.get_neighbor(p_out)
+            p_out, p_in = split_dyn_enum_path(dyn_name_path)
+            array = compile_dyn_name_path(p_out, self.parent.desc)(self.parent)
+            names = self.get_dyn_names(array, p_in)
 
-            options_to_generate = range(len(array))
+            options_to_generate = range(len(names))
             if opt_index is not None:
                 options_to_generate = (
                     (opt_index - 1, ) if opt_index - 1 in
                     options_to_generate else ())
 
             for i in options_to_generate:
-                name = array[i].get_neighbor(p_in)
-                if isinstance(name, list):
-                    name = repr(name).strip("[").strip("]")
-                else:
-                    name = str(name)
-
-                options[i + 1] = '%s. %s' % (i, name.split('\n')[0])
-            option_count = len(array) + 1
+                options[i + 1] = '%s. %s' % (i, names[i] or "")
+            option_count = len(names) + 1
         except Exception:
             print(format_exc())
             option_count = 1
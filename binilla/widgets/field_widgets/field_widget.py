@@ -8,6 +8,9 @@
 from binilla.edit_manager import EditState
 from binilla import constants
 from binilla import editor_constants as e_c
+from binilla.desc_metadata import get_desc_metadata
+from binilla.dyn_name_path import DynNameCache
+from binilla.widgets import get_relative_widget_position
 from binilla.widgets.binilla_widget import BinillaWidget
 from binilla.windows.filedialog import asksaveasfilename, askopenfilename
 
@@ -252,6 +255,27 @@ def show_sidetips(self):
         except Exception:
             return False
 
+    @property
+    def virtualize_widgets(self):
+        try:
+            return bool(self.tag_window.virtualize_widgets)
+        except Exception:
+            return False
+
+    @property
+    def show_arrays_as_tables(self):
+        try:
+            return bool(self.tag_window.show_arrays_as_tables)
+        except Exception:
+            return False
+
+    @property
+    def preview_large_text(self):
+        try:
+            return bool(self.tag_window.preview_large_text)
+        except Exception:
+            return False
+
     @property
     def max_undos(self):
         try:
@@ -330,14 +354,12 @@ def unit_scale(self):
     @property
     def gui_name(self):
         '''The gui_name of the node of this FieldWidget.'''
-        name = self.name.replace('_', ' ')
-        if self.use_gui_names:
-            name = self.desc.get('GUI_NAME', name)
-
-        if self.desc.get('TOOLTIP') and name:
-            name += " �"
+        return self.desc_metadata.get_gui_name(self.use_gui_names)
 
-        return name
+    @property
+    def desc_metadata(self):
+        '''The DescMetadata compiled for the descriptor of this FieldWidget.'''
+        return get_desc_metadata(self.desc)
 
     @property
     def show_title(self):
@@ -360,10 +382,42 @@ def title_size(self):
 
     @property
     def widget_width(self):
-        desc = self.desc
-        if 'WIDGET_WIDTH' in desc:
-            return desc['WIDGET_WIDTH']
-        return 0
+        return self.desc_metadata.widget_width
+
+    @property
+    def widget_pool(self):
+        try:
+            return self.tag_window.widget_pool
+        except AttributeError:
+            return None
+
+    @property
+    def dyn_name_cache(self):
+        try:
+            return self.tag_window.dyn_name_cache
+        except AttributeError:
+            return None
+
+    @property
+    def dirty_widgets(self):
+        try:
+            return self.tag_window.dirty_widgets
+        except AttributeError:
+            return None
+
+    @property
+    def layout_plan(self):
+        try:
+            return self.tag_window.layout_plan
+        except AttributeError:
+            return None
+
+    @property
+    def defer_widgets(self):
+        try:
+            return bool(self.tag_window.defer_widgets)
+        except Exception:
+            return False
 
     @property
     def widget_picker(self):
@@ -412,6 +466,17 @@ def use_parent_pack_pady(self):
     def use_parent_pack_pady(self, new_val):
         self._use_parent_pack_pady = bool(new_val)
 
+    def get_dyn_names(self, array, dyn_name_path):
+        '''
+        Returns a list of the names each element of the array resolves to
+        using the given DYN_NAME_PATH. Names that couldn't be resolved
+        are None. The names are cached in the tag windows dyn_name_cache.
+        '''
+        cache = self.dyn_name_cache
+        if cache is None:
+            cache = DynNameCache()
+        return cache.get_names(array, dyn_name_path)
+
     def display_comment(self, master=None):
         if not self.show_comments:
             return
@@ -664,6 +729,26 @@ def load_node_data(self, parent, node, attr_index, desc=None):
         self._desc = desc
         return self._desc != prev_desc
 
+    def update_virtual_fields(self, top, bottom):
+        '''
+        Builds any child widgets between the top and bottom pixel offsets
+        (relative to this widget) and destroys the ones outside them.
+        Returns True if any widgets were built or destroyed.
+        '''
+        changed = False
+        for wid in tuple(self.f_widget_ids):
+            w = self.f_widgets.get(wid)
+            if w is None or not w.winfo_manager():
+                continue
+
+            try:
+                y = get_relative_widget_position(w, self)[1]
+                changed |= bool(w.update_virtual_fields(top - y, bottom - y))
+            except Exception:
+                print(format_exc())
+
+        return changed
+
     def build_f_widget_cache(self):
         self.f_widgets = {}
         try:
@@ -675,12 +760,18 @@ def build_f_widget_cache(self):
 
     def set_edited(self, new_value=True):
         self.edited = bool(new_value)
+        dirty_widgets = self.dirty_widgets
         try:
             if self.edited:
+                if dirty_widgets is not None:
+                    dirty_widgets.mark_edited(self)
                 if hasattr(self.f_widget_parent, "set_edited"):
                     # Tell all parents that there are unsaved edits
                     self.f_widget_parent.set_edited()
                 return
+            elif dirty_widgets is not None:
+                # only the widgets that were edited need to be told
+                dirty_widgets.clear_edited(self)
             else:
                 # Tell all children that there are no longer unsaved edits
                 for f_wid in self.f_widget_ids:
@@ -692,11 +783,23 @@ def set_edited(self, new_value=True):
 
     def set_needs_flushing(self, new_value=True):
         self.needs_flushing = new_value
+        dirty_widgets = self.dirty_widgets
         try:
             if self.needs_flushing:
+                if dirty_widgets is not None:
+                    dirty_widgets.mark_needs_flushing(self)
+
                 # Tell all parents that there are unflushed edits
-                if not self.f_widget_parent.needs_flushing:
-                    self.f_widget_parent.set_needs_flushing()
+                parent = self.f_widget_parent
+                while not getattr(parent, "needs_flushing", True):
+                    parent.needs_flushing = True
+                    if dirty_widgets is not None:
+                        dirty_widgets.mark_needs_flushing(parent, False)
+                    parent = parent.f_widget_parent
+                return
+            elif dirty_widgets is not None:
+                # only the widgets that need flushing need to be told
+                dirty_widgets.clear_needs_flushing(self)
                 return
 
             # Tell all children that there are no longer unflushed edits
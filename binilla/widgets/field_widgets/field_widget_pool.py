@@ -0,0 +1,167 @@
+from traceback import format_exc
+
+from binilla import editor_constants as e_c
+
+
+class FieldWidgetPool:
+    '''
+    Holds onto FieldWidgets released by their parents so they can be
+    rebound to new nodes with load_node_data and reload, rather than
+    destroying them and building new tkinter widgets in their place.
+
+    tkinter widgets cannot be moved to a different master, so released
+    widgets are pooled by their class, their descriptor, their master, and
+    the build_kwargs they were built with. Widgets must be registered with
+    the build kwargs they were made with to be pooled.
+    '''
+    max_count = e_c.FIELD_WIDGET_POOL_MAX
+    # kwargs that decide how a widget is built, rather than what it displays,
+    # so widgets are only reused for ones built with the same values of them
+    build_kwargs = ("show_title", "dont_padx_fields", "use_parent_pack_padx",
+                    "use_parent_pack_pady", "vert_oriented", )
+
+    def __init__(self, max_count=None):
+        # the keys are (widget_cls, id(desc), str(master), build_options)
+        # and the values are lists of the released widgets that can be
+        # reused for them.
+        self._pool = {}
+        self._count = 0
+        if max_count is not None:
+            self.max_count = max_count
+
+    def __len__(self):
+        return self._count
+
+    def get_build_options(self, kwargs):
+        return tuple(kwargs.get(name) for name in self.build_kwargs)
+
+    def get_key(self, widget_cls, master, desc, build_options):
+        return (widget_cls, id(desc), str(master), build_options)
+
+    def register(self, widget, **kwargs):
+        '''
+        Records the build kwargs the widget was built with, so
+        it can be pooled and reused for widgets built with them.
+        '''
+        widget.pool_build_options = self.get_build_options(kwargs)
+
+    def release(self, widget):
+        '''
+        Unpacks the widget and unloads its node data so it can be reused.
+        Returns True if the widget was pooled. If False, the caller
+        is responsible for destroying the widget.
+        '''
+        build_options = getattr(widget, "pool_build_options", None)
+        if build_options is None:
+            # no telling what it was built with, so it can't be reused
+            return False
+        elif self._count >= self.max_count:
+            self.prune()
+            if self._count >= self.max_count:
+                return False
+
+        try:
+            key = self.get_key(type(widget), widget.master, widget.desc,
+                               build_options)
+            widget.pack_forget()
+            widget.unload_node_data()
+        except Exception:
+            print(format_exc())
+            return False
+
+        self._pool.setdefault(key, []).append(widget)
+        self._count += 1
+        return True
+
+    def acquire(self, widget_cls, master, desc, **kwargs):
+        '''
+        Returns a pooled widget of the given class that was built in the
+        given master to display nodes with the given descriptor, rebinding
+        it to the node described by the kwargs. Returns None if none exist.
+        '''
+        widgets = self._pool.get(self.get_key(
+            widget_cls, master, desc, self.get_build_options(kwargs)))
+        while widgets:
+            w = widgets.pop()
+            self._count -= 1
+            try:
+                # the master may have destroyed it while it sat in the pool
+                if not w.winfo_exists():
+                    continue
+
+                if 'f_widget_parent' in kwargs:
+                    w.f_widget_parent = kwargs['f_widget_parent']
+                if 'pack_padx' in kwargs:
+                    w.pack_padx = kwargs['pack_padx']
+                if 'pack_pady' in kwargs:
+                    w.pack_pady = kwargs['pack_pady']
+
+                if w.load_node_data(kwargs.get('parent'), kwargs.get('node'),
+                                    kwargs.get('attr_index'), desc):
+                    w.populate()
+
+                w.reload()
+                w.set_needs_flushing(False)
+                w.set_edited(False)
+                w.set_disabled(kwargs.get('disabled', False))
+                self.reset_collapsed(w, kwargs.get('show_frame'))
+                return w
+            except Exception:
+                print(format_exc())
+                try:
+                    w.destroy()
+                except Exception:
+                    pass
+
+        return None
+
+    def reset_collapsed(self, widget, show_frame=None):
+        '''
+        Expands or collapses a reused widget the same way it would have
+        been if it were built with the given show_frame kwarg, rather than
+        leaving it however it was when it was released.
+        '''
+        if (getattr(widget, "show_btn", None) is None or
+            getattr(widget, "show", None) is None or
+            not hasattr(widget, "set_collapsed")):
+            # can't be collapsed
+            return
+
+        if show_frame is None:
+            show_frame = not widget.blocks_start_hidden
+        if widget.is_empty and widget.hide_if_blank:
+            show_frame = False
+
+        if bool(show_frame) != bool(widget.show.get()):
+            widget.set_collapsed(not show_frame)
+
+    def prune(self):
+        '''Removes any pooled widgets that have been destroyed.'''
+        count = 0
+        for key, widgets in tuple(self._pool.items()):
+            alive = []
+            for w in widgets:
+                try:
+                    if w.winfo_exists():
+                        alive.append(w)
+                except Exception:
+                    pass
+
+            if alive:
+                self._pool[key] = alive
+            else:
+                del self._pool[key]
+            count += len(alive)
+
+        self._count = count
+
+    def clear(self):
+        '''Destroys all pooled widgets.'''
+        pool, self._pool = self._pool, {}
+        self._count = 0
+        for widgets in pool.values():
+            for w in widgets:
+                try:
+                    w.destroy()
+                except Exception:
+                    pass
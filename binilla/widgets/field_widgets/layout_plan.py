@@ -0,0 +1,129 @@
+'''
+Before a TagWindow builds its FieldWidgets it can plan them out by walking
+the descriptors of the nodes in its tag. This is pure python, so it can be
+done in a separate thread while the ui stays responsive, and the widgets
+are then built from the plan a little at a time on the tkinter thread.
+'''
+from traceback import format_exc
+
+from binilla.desc_metadata import get_desc_metadata
+
+__all__ = ("LayoutPlan", "PlannedNode", )
+
+
+class PlannedNode:
+    '''The fields that will be shown for a node, and the widgets to show them.'''
+    __slots__ = ("node", "field_indices", "widget_classes", )
+
+    def __init__(self, node, field_indices, widget_classes):
+        self.node = node
+        self.field_indices = field_indices
+        self.widget_classes = widget_classes
+
+
+class LayoutPlan:
+    '''
+    A plan of which fields of each node in a tag will be shown, and which
+    widget classes they will be shown with. Computing this warms up the
+    DescMetadata of every descriptor in the plan, so building the widgets
+    afterward doesn't need to derive any of it.
+
+    Plans are only valid for the nodes as they were when it was made, so
+    they should be discarded once the tag they were made for is edited.
+    '''
+    def __init__(self, get_visible, widget_picker, use_gui_names=True,
+                 show_arrays_as_tables=False):
+        self.get_visible = get_visible
+        self.widget_picker = widget_picker
+        self.use_gui_names = use_gui_names
+        self.show_arrays_as_tables = show_arrays_as_tables
+        # PlannedNodes keyed by id(node). each holds onto the
+        # node it was made for, so the id can't be reused.
+        self.planned_nodes = {}
+        # the number of widgets that will be built from placeholders
+        self.widget_count = 0
+        self.cancelled = False
+
+    def get_field_indices(self, node):
+        '''
+        Returns the planned indices of the visible fields of the node,
+        or None if the node isn't in the plan.
+        '''
+        planned = self.planned_nodes.get(id(node))
+        if planned is None or planned.node is not node:
+            return None
+        return list(planned.field_indices)
+
+    def cancel(self):
+        '''Stops the plan from being computed any further.'''
+        self.cancelled = True
+
+    def get_widget_class(self, desc):
+        # imported here since those modules import this one
+        from binilla.widgets.field_widgets import array_frame,\
+             array_table_frame
+
+        widget_cls = self.widget_picker.get_widget(desc)
+        if (widget_cls is array_frame.ArrayFrame and
+                self.show_arrays_as_tables and
+                array_table_frame.ArrayTableFrame.can_display(desc)):
+            widget_cls = array_table_frame.ArrayTableFrame
+        return widget_cls
+
+    def plan(self, root_node):
+        '''
+        Walks the nodes that will be shown, starting at the root node, and
+        records the fields that will be shown for each one that has fields.
+        '''
+        from binilla.widgets.field_widgets import container_frame,\
+             array_frame, array_table_frame, enum_frame, bool_frame
+
+        nodes = [root_node]
+        while nodes and not self.cancelled:
+            node = nodes.pop()
+            try:
+                desc = node.desc
+                metadata = get_desc_metadata(desc)
+                metadata.get_gui_name(self.use_gui_names)
+
+                widget_cls = self.get_widget_class(desc)
+                if issubclass(widget_cls, array_table_frame.ArrayTableFrame):
+                    # displays every element itself, so no widgets are
+                    # made for the elements to plan out
+                    continue
+                elif issubclass(widget_cls, array_frame.ArrayFrame):
+                    # only the selected element is ever shown
+                    if len(node):
+                        nodes.append(node[0])
+                    continue
+                elif not issubclass(widget_cls, container_frame.ContainerFrame):
+                    continue
+
+                field_indices = tuple(metadata.get_visible_fields(
+                    self.get_visible, node))
+                widget_classes = []
+                for i in field_indices:
+                    sub_node = node[i]
+                    sub_desc = getattr(sub_node, "desc", desc[i])
+                    sub_metadata = get_desc_metadata(sub_desc)
+                    sub_metadata.get_gui_name(self.use_gui_names)
+
+                    sub_widget_cls = self.get_widget_class(sub_desc)
+                    widget_classes.append(sub_widget_cls)
+                    if issubclass(sub_widget_cls, enum_frame.EnumFrame):
+                        sub_metadata.get_enum_options(self.use_gui_names)
+                    elif issubclass(sub_widget_cls, bool_frame.BoolFrame):
+                        sub_metadata.get_flag_options()
+
+                    if hasattr(sub_node, "desc"):
+                        nodes.append(sub_node)
+
+                self.planned_nodes[id(node)] = PlannedNode(
+                    node, field_indices, tuple(widget_classes))
+                if metadata.orient == 'v' and widget_cls.can_virtualize:
+                    # these fields will be built one at a time
+                    self.widget_count += len(field_indices)
+            except Exception:
+                print(format_exc())
+
+        return self
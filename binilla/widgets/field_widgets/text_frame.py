@@ -1,7 +1,9 @@
+import re
 import threadsafe_tkinter as tk
 
 from traceback import format_exc
 
+from binilla import editor_constants as e_c
 from binilla.widgets.field_widgets import field_widget, data_frame
 
 
@@ -13,7 +15,20 @@ class TextFrame(data_frame.DataFrame):
     _flushing = False
 
     replace_map = None
+    text_escaper = None
     data_text = None
+    preview_button = None
+
+    # the escaped text being inserted into data_text in chunks, how
+    # much of it has been inserted, and the id of the after_idle job
+    _load_text = None
+    _load_pos = 0
+    _load_job = None
+    # whether data_text only contains a read-only preview of the text
+    is_preview = False
+    # whether the full text was asked for, so it isn't previewed again
+    # until this widget is loaded with different node data
+    _full_text_requested = False
 
     def __init__(self, *args, **kwargs):
         kwargs.update(relief='flat', bd=0, highlightthickness=0,
@@ -34,6 +49,9 @@ def __init__(self, *args, **kwargs):
 
         self.sidetip_label = tk.Label(
             self.content, anchor='w', justify='left')
+        self.preview_button = tk.Button(
+            self.content, text="Load full text for editing",
+            command=self.load_full_text)
 
         self.hsb = tk.Scrollbar(self.content, orient='horizontal',
                                 command=self.data_text.xview)
@@ -59,6 +77,9 @@ def __init__(self, *args, **kwargs):
 
         if self.gui_name != '':
             self.title_label.pack(fill="x")
+        self.preview_button.tooltip_string = (
+            "This text is too large to load all at once, so only the start\n"
+            "of it is being shown. Click to load all of it for editing.")
         self.hsb.pack(side="bottom", fill='x', expand=True)
         self.vsb.pack(side="right",  fill='y')
         self.data_text.pack(side="right", fill="x", expand=True)
@@ -85,8 +106,25 @@ def _text_redo(self):
         except Exception:
             pass
 
+    @property
+    def is_loading(self):
+        '''Whether the text is still being inserted into data_text.'''
+        return self._load_text is not None
+
+    def destroy(self):
+        self.cancel_text_load()
+        data_frame.DataFrame.destroy(self)
+
+    def load_node_data(self, parent, node, attr_index, desc=None):
+        self._full_text_requested = False
+        return field_widget.FieldWidget.load_node_data(
+            self, parent, node, attr_index, desc)
+
     def unload_node_data(self):
         field_widget.FieldWidget.unload_node_data(self)
+        self.cancel_text_load()
+        self.is_preview = False
+        self._full_text_requested = False
         if not self.data_text: return
         self.data_text.config(state=tk.NORMAL)
         self.data_text.delete(1.0, tk.END)
@@ -102,7 +140,8 @@ def set_disabled(self, disable=True):
             return
 
         if self.data_text and bool(disable) != self.disabled:
-            self.data_text.config(state=tk.DISABLED if disable else tk.NORMAL)
+            read_only = disable or self.is_preview or self.is_loading
+            self.data_text.config(state=tk.DISABLED if read_only else tk.NORMAL)
         data_frame.DataFrame.set_disabled(self, disable)
 
     def disable_undo_redo(self, *args, **kwargs):
@@ -142,45 +181,25 @@ def set_modified(self, e=None):
         self.set_edited()
 
     def build_replace_map(self):
-        desc = self.desc
-        enc = desc['TYPE'].enc
-        c_size = desc['TYPE'].size
-        endian = 'big' if desc['TYPE'].endian == '>' else 'little'
-
-        self.replace_map = {}
-        if not enc:
-            return
-
-        # this is the header of what the first
-        # 16 characters will be replaced with.
-        hex_head = '\\0x0'
-
-        # add a null and return character to the end of it so it can
-        # be distinguished from users typing \x00 or \xff and whatnot.
-        hex_foot = b'\x00' * c_size
-        if endian == 'little':
-            hex_foot = b'\x00' * (c_size - 1) + b'\x0d'
-            hex_foot = b'\x00' * (c_size - 1) + b'\x0a'
-        else:
-            hex_foot = b'\x0d' + (b'\x00' * (c_size - 1))
-            hex_foot = b'\x0a' + (b'\x00' * (c_size - 1))
-        hex_foot = hex_foot.decode(encoding=enc)
-
-        for i in range(0, 32):
-            if i in (9, 10, 13):
-                # formatting characters
-                continue
-            elif i == 16:
-                hex_head = '\\0x'
-
-            byte_str = i.to_bytes(c_size, endian).decode(encoding=enc)
-            self.replace_map[byte_str] = hex_head + hex(i)[2:] + hex_foot
+        # the replace map only depends on the encoding, so it's shared
+        # between every TextFrame displaying text with the same one.
+        self.text_escaper = self.desc_metadata.get_cached(
+            "text_escaper", get_text_escaper)
+        self.replace_map = self.text_escaper.replace_map
 
     def flush(self, *args):
         if None in (self.parent, self.node):
             return
         elif self._flushing or not self.needs_flushing:
             return
+        elif self.is_preview or self.is_loading:
+            # data_text doesnt contain all of the text, so it can't be read
+            self.set_needs_flushing(False)
+            return
+        elif not self.tk.getboolean(self.data_text.edit_modified()):
+            # nothing was typed, so skip reading back the entire text
+            self.set_needs_flushing(False)
+            return
 
         try:
             self._flushing = True
@@ -192,12 +211,7 @@ def flush(self, *args):
                 return
 
             new_node = self.data_text.get(1.0, "%s-1chars" % tk.END)
-
-            # NEED TO DO THIS SORTED cause the /x00 we inserted will be janked
-            for b in sorted(self.replace_map.keys()):
-                new_node = new_node.replace(self.replace_map[b], b)
-
-            new_node = node_cls(new_node)
+            new_node = node_cls(self.text_escaper.unescape(new_node))
             if self.node != new_node:
                 field_max = self.field_max
                 if field_max is None:
@@ -216,6 +230,9 @@ def flush(self, *args):
                 self.edit_create(undo_node=self.node, redo_node=new_node)
                 self.parent[self.attr_index] = self.node = new_node
 
+            # only cleared once the text is in the node, so text that
+            # failed to validate is read back and checked again next flush
+            self.data_text.edit_modified(False)
             self._flushing = False
             self.set_needs_flushing(False)
         except Exception:
@@ -224,29 +241,36 @@ def flush(self, *args):
             print(format_exc())
 
     def reload(self):
+        self.cancel_text_load()
         try:
             new_text = "" if self.node is None else str(self.node)
-            # NEED TO DO THIS SORTED cause the /x00 we insert will be mesed up
-            for b in sorted(self.replace_map.keys()):
-                new_text = new_text.replace(b, self.replace_map[b])
+            new_text = self.text_escaper.escape(new_text)
 
             # set this to true so the StringVar trace function
             # doesnt think the widget has been edited by the user
             self.needs_flushing = True
             self.data_text.config(state=tk.NORMAL)
             self.data_text.delete(1.0, tk.END)
-            self.data_text.insert(1.0, new_text)
+
+            self.is_preview = (self.preview_large_text and
+                               not self._full_text_requested and
+                               len(new_text) > e_c.TEXT_PREVIEW_THRESHOLD)
+            if self.is_preview:
+                self.data_text.insert(1.0, new_text[: e_c.TEXT_PREVIEW_SIZE])
+                self.data_text.insert(tk.END, "\n...\n[%s of %s characters shown]"
+                                      % (e_c.TEXT_PREVIEW_SIZE, len(new_text)))
+                self.preview_button.pack(side="bottom", fill="x",
+                                         before=self.hsb)
+            else:
+                self.preview_button.pack_forget()
+                self.start_text_load(new_text)
 
             self.last_flushed_val = new_text
-            self.data_text.edit_reset()
             self.needs_flushing = False
         except Exception:
             print(format_exc())
         finally:
-            if self.disabled:
-                self.data_text.config(state=tk.DISABLED)
-            else:
-                self.data_text.config(state=tk.NORMAL)
+            self.update_text_state()
 
         sidetip = self.desc.get('SIDETIP')
         if self.show_sidetips and sidetip:
@@ -257,4 +281,177 @@ def reload(self):
                   self.data_text, self.sidetip_label):
             w.tooltip_string = self.desc.get('TOOLTIP')
 
+    def update_text_state(self):
+        '''Makes data_text read-only unless its text can be edited.'''
+        if not self.data_text:
+            return
+        elif self.disabled or self.is_preview or self.is_loading:
+            self.data_text.config(state=tk.DISABLED)
+        else:
+            self.data_text.config(state=tk.NORMAL)
+
+    def load_full_text(self):
+        '''Replaces the read-only preview with all of the text.'''
+        if not self.is_preview:
+            return
+
+        self.is_preview = False
+        self._full_text_requested = True
+        self.preview_button.pack_forget()
+        self.reload()
+
+    def start_text_load(self, text):
+        '''
+        Inserts the text into data_text. Text too large to insert at once
+        is inserted in chunks when idle, so the window stays responsive.
+        '''
+        chunk_size = e_c.TEXT_LOAD_CHUNK_SIZE
+        self.data_text.insert(1.0, text[: chunk_size])
+        if len(text) <= chunk_size:
+            self.finish_text_load()
+            return
+
+        self._load_text = text
+        self._load_pos = chunk_size
+        self._load_job = self.after_idle(self._insert_next_chunk)
+
+    def _insert_next_chunk(self):
+        self._load_job = None
+        text = self._load_text
+        if text is None or not self.data_text:
+            return
+
+        end = self._load_pos + e_c.TEXT_LOAD_CHUNK_SIZE
+        try:
+            self.data_text.config(state=tk.NORMAL)
+            self.data_text.insert("end-1chars", text[self._load_pos: end])
+        except Exception:
+            print(format_exc())
+            self.cancel_text_load()
+            return
+
+        self._load_pos = end
+        if end < len(text):
+            self.data_text.config(state=tk.DISABLED)
+            self._load_job = self.after_idle(self._insert_next_chunk)
+        else:
+            self._load_text = None
+            self.finish_text_load()
+            self.update_text_state()
+
+    def finish_text_load(self):
+        # inserting the text isnt something the user should be able to
+        # undo, and it shouldnt count as the text being modified either.
+        self.data_text.edit_reset()
+        self.data_text.edit_modified(False)
+
+    def cancel_text_load(self):
+        '''Stops inserting the rest of a text that is loading in chunks.'''
+        if self._load_job is not None:
+            try:
+                self.after_cancel(self._load_job)
+            except Exception:
+                pass
+
+        self._load_job = self._load_text = None
+        self._load_pos = 0
+
     populate = reload
+
+
+# TextEscapers keyed by (encoding, character size, endianness)
+_text_escapers = {}
+
+
+class TextEscaper:
+    '''
+    Escapes the unprintable characters in text so they can be displayed
+    and edited, and unescapes them again, each in a single pass.
+    '''
+    __slots__ = ("replace_map", "_unescape_map",
+                 "_escape_regex", "_unescape_regex")
+
+    def __init__(self, replace_map):
+        self.replace_map = dict(replace_map)
+        self._unescape_map = {v: k for k, v in replace_map.items()}
+        self._escape_regex = self._compile(replace_map)
+        self._unescape_regex = self._compile(self._unescape_map)
+
+    @staticmethod
+    def _compile(strings):
+        if not strings:
+            return None
+        # longest first so nothing matches the start of a longer string
+        return re.compile("|".join(
+            re.escape(s) for s in sorted(strings, key=len, reverse=True)))
+
+    def escape(self, text):
+        if self._escape_regex is None:
+            return text
+
+        replace_map = self.replace_map
+        return self._escape_regex.sub(
+            lambda match: replace_map[match.group()], text)
+
+    def unescape(self, text):
+        if self._unescape_regex is None or "\\0x" not in text:
+            return text
+
+        unescape_map = self._unescape_map
+        return self._unescape_regex.sub(
+            lambda match: unescape_map[match.group()], text)
+
+
+def get_text_escaper(desc):
+    '''
+    Returns the TextEscaper for the encoding of the given string
+    descriptor. TextEscapers are shared between every descriptor
+    with the same encoding, character size, and endianness.
+    '''
+    f_type = desc['TYPE']
+    key = (f_type.enc, f_type.size, f_type.endian)
+    escaper = _text_escapers.get(key)
+    if escaper is None:
+        escaper = _text_escapers[key] = TextEscaper(make_replace_map(desc))
+    return escaper
+
+
+def make_replace_map(desc):
+    '''
+    Returns a dict mapping the unprintable characters of the encoding of
+    the given string descriptor to the escaped text they're displayed as.
+    '''
+    enc = desc['TYPE'].enc
+    c_size = desc['TYPE'].size
+    endian = 'big' if desc['TYPE'].endian == '>' else 'little'
+
+    replace_map = {}
+    if not enc:
+        return replace_map
+
+    # this is the header of what the first
+    # 16 characters will be replaced with.
+    hex_head = '\\0x0'
+
+    # add a null and return character to the end of it so it can
+    # be distinguished from users typing \x00 or \xff and whatnot.
+    hex_foot = b'\x00' * c_size
+    if endian == 'little':
+        hex_foot = b'\x00' * (c_size - 1) + b'\x0d'
+        hex_foot = b'\x00' * (c_size - 1) + b'\x0a'
+    else:
+        hex_foot = b'\x0d' + (b'\x00' * (c_size - 1))
+        hex_foot = b'\x0a' + (b'\x00' * (c_size - 1))
+    hex_foot = hex_foot.decode(encoding=enc)
+
+    for i in range(0, 32):
+        if i in (9, 10, 13):
+            # formatting characters
+            continue
+        elif i == 16:
+            hex_head = '\\0x'
+
+        byte_str = i.to_bytes(c_size, endian).decode(encoding=enc)
+        replace_map[byte_str] = hex_head + hex(i)[2:] + hex_foot
+
+    return replace_map
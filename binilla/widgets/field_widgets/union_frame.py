@@ -5,8 +5,7 @@
 
 from binilla import editor_constants as e_c
 from binilla.widgets.scroll_menu import ScrollMenu
-from binilla.widgets.field_widgets import field_widget, container_frame,\
-     data_frame
+from binilla.widgets.field_widgets import field_widget, container_frame
 
 
 class UnionFrame(container_frame.ContainerFrame):
@@ -226,7 +225,7 @@ def populate(self):
 
             # do things in this order to prevent the window from scrolling up
             for w in old_u_node_frames:
-                w.destroy()
+                self.release_field_widget(w)
         except Exception:
             print(format_exc())
 
@@ -256,18 +255,12 @@ def reload(self):
             active_widget = self.u_node_widgets_by_u_index.get(u_index)
             if active_widget is None:
                 if u_index is not None:
-                    widget_cls = self.widget_picker.get_widget(u_desc)
-                    kwargs = dict(
+                    active_widget = self.build_field_widget(
+                        u_desc, parent=self.node, node=u_node,
                         show_title=False, tag_window=self.tag_window,
                         attr_index=u_index, disabled=self.disabled,
-                        f_widget_parent=self, desc=u_desc,
-                        show_frame=self.show.get(), dont_padx_fields=True)
-
-                    try:
-                        active_widget = widget_cls(self.content, **kwargs)
-                    except Exception:
-                        print(format_exc())
-                        active_widget = data_frame.NullFrame(self.content, **kwargs)
+                        f_widget_parent=self, show_frame=self.show.get(),
+                        dont_padx_fields=True)
                 else:
                     active_widget = self.raw_frame
 
@@ -0,0 +1,467 @@
+import threadsafe_tkinter as tk
+import tkinter.ttk as ttk
+
+from binascii import unhexlify
+from traceback import format_exc
+
+from binilla import editor_constants as e_c
+from binilla.widgets.binilla_widget import BinillaWidget
+from binilla.widgets import get_mouse_delta
+
+
+__all__ = ("HexView", "find_bytes", "parse_search_query", )
+
+
+# the printable ascii characters are displayed as themselves
+# and everything else is displayed as a period.
+_ascii_table = bytes(c if 32 <= c < 127 else 46 for c in range(256))
+# the two hex digits each byte is displayed as
+_hex_table = tuple("%02X" % c for c in range(256))
+
+
+def bytes_to_hex(data):
+    '''Returns the bytes as a string of space separated hex digit pairs.'''
+    return " ".join([_hex_table[c] for c in data])
+
+
+def find_bytes(source, query, start=0, chunk_size=1 << 20):
+    '''
+    Returns the offset of the first occurrence of query in the source
+    at or after start, or -1 if it isn't found. Sources without a find
+    method are searched in chunks so they are never copied whole.
+    '''
+    if not query:
+        return -1
+
+    if isinstance(source, (bytes, bytearray)) or hasattr(source, "find"):
+        try:
+            return source.find(query, start)
+        except TypeError:
+            pass
+
+    with memoryview(source) as view, view.cast('B') as view:
+        end = len(view)
+        # overlap the chunks so matches spanning two chunks are found
+        overlap = len(query) - 1
+        while start < end:
+            chunk = bytes(view[start: start + chunk_size + overlap])
+            i = chunk.find(query)
+            if i >= 0:
+                return start + i
+            start += chunk_size
+
+    return -1
+
+
+def parse_search_query(query):
+    '''
+    Converts a search string into the bytes to search for. Strings of
+    hex digit pairs(whitespace between them is allowed) are searched for
+    as the bytes they represent, and anything else is searched for as
+    its utf8 encoded text. Prefix the string with a quote to force it to
+    be searched for as text.
+    '''
+    if query[:1] in ('"', "'"):
+        return query[1:].encode("utf-8")
+
+    digits = "".join(query.split())
+    if digits.lower().startswith("0x"):
+        digits = digits[2:]
+
+    if digits and len(digits) % 2 == 0:
+        try:
+            return unhexlify(digits)
+        except ValueError:
+            pass
+
+    return query.encode("utf-8")
+
+
+class HexView(tk.Frame, BinillaWidget):
+    '''
+    Displays the bytes of any object supporting the buffer protocol(such
+    as bytes, bytearrays, arrays, and mmaps) as rows of hex and ascii.
+    Only the rows scrolled into view are drawn, and only their bytes are
+    read from the source, so huge buffers are never copied in full.
+
+    Bytes are edited by typing hex digits or ascii characters over them.
+    Rather than writing to the source itself, the HexView passes each
+    edit to its write_callback, so the owner can record it for undoing.
+    '''
+    source = None
+    source_len = 0
+    bytes_per_row = 16
+
+    # the index of the row at the top of the view
+    top_row = 0
+    # the offset of the cursor, and the offset the selection started at
+    cursor = 0
+    sel_anchor = 0
+    # which column the cursor is in. either "hex" or "ascii"
+    cursor_side = "hex"
+    # the first hex digit typed when editing a byte in the hex column
+    pending_nibble = None
+
+    editable = True
+    write_callback = None
+    last_query = b''
+
+    def __init__(self, *args, **kwargs):
+        BinillaWidget.__init__(self)
+        source = kwargs.pop('source', None)
+        self.write_callback = kwargs.pop('write_callback', None)
+        self.editable = kwargs.pop('editable', self.editable)
+        self.visible_rows = kwargs.pop('visible_rows', e_c.HEX_VIEW_ROWS)
+        kwargs.setdefault('bd', 0)
+        tk.Frame.__init__(self, *args, **kwargs)
+
+        self.canvas = tk.Canvas(self, highlightthickness=0, takefocus=1)
+        self.vsb = tk.Scrollbar(self, orient="vertical",
+                                command=self.scroll_command)
+        self.status_frame = tk.Frame(self, bd=0)
+        self.status_label = tk.Label(self.status_frame, anchor="w",
+                                     justify="left")
+        self.status_label.font_type = "fixed"
+        self.search_entry = tk.Entry(self.status_frame, width=24)
+        self.search_btn = ttk.Button(self.status_frame, width=6, text="Find",
+                                     command=self.find_next)
+        self.search_entry.tooltip_string = (
+            "Hex bytes(ex: 'de ad be ef') or text to search for.\n"
+            "Start with a quote to search for digits as text.\n"
+            "Press Enter or F3 to find the next occurrence.")
+
+        self.canvas.bind('<Button-1>', self.click)
+        self.canvas.bind('<Shift-Button-1>', self.shift_click)
+        self.canvas.bind('<B1-Motion>', self.drag)
+        self.canvas.bind('<Configure>', lambda e: self.render())
+        self.canvas.bind('<Key>', self.key_press)
+        self.canvas.bind('<Control-c>', self.copy_selection)
+        self.canvas.bind('<Control-f>', self.focus_search)
+        self.canvas.bind('<F3>', self.find_next)
+        self.search_entry.bind('<Return>', self.find_next)
+        self.search_entry.bind('<F3>', self.find_next)
+        for side in ("Left", "Right", "Up", "Down", "Prior", "Next",
+                     "Home", "End"):
+            self.canvas.bind('<%s>' % side, self.move_key)
+            self.canvas.bind('<Shift-%s>' % side, self.move_key)
+
+        if e_c.IS_LNX:
+            self.canvas.bind('<4>', self.mousewheel_scroll)
+            self.canvas.bind('<5>', self.mousewheel_scroll)
+        else:
+            self.canvas.bind('<MouseWheel>', self.mousewheel_scroll)
+
+        self.status_frame.pack(side="bottom", fill="x")
+        self.search_btn.pack(side="right")
+        self.search_entry.pack(side="right", padx=(4, 4))
+        self.status_label.pack(side="left", fill="x", expand=True)
+        self.vsb.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+
+        self.apply_style()
+        self.set_source(source)
+
+    @property
+    def char_width(self):
+        return self.get_font("fixed").measure("0")
+
+    @property
+    def row_height(self):
+        return self.get_font("fixed").metrics("linespace") + 2
+
+    @property
+    def row_count(self):
+        return (self.source_len + self.bytes_per_row - 1) // self.bytes_per_row
+
+    @property
+    def rows_in_view(self):
+        height = self.canvas.winfo_height()
+        if height <= 1:
+            height = int(self.canvas.cget("height"))
+        return max(1, height // self.row_height)
+
+    @property
+    def column_x(self):
+        '''The x coordinates of the offset, hex, and ascii columns.'''
+        cw = self.char_width
+        hex_x = 4 + 10*cw
+        return 4, hex_x, hex_x + (3*self.bytes_per_row + 1)*cw
+
+    @property
+    def selection(self):
+        '''The start and end offsets of the selected bytes.'''
+        if not self.source_len:
+            return 0, 0
+        start, end = sorted((self.cursor, self.sel_anchor))
+        return start, end + 1
+
+    def apply_style(self, seen=None):
+        BinillaWidget.apply_style(self, seen)
+        self.canvas.config(bg=self.entry_normal_color,
+                           width=self.column_x[2] +
+                           (self.bytes_per_row + 1)*self.char_width,
+                           height=self.visible_rows*self.row_height)
+        self.render()
+
+    def set_source(self, source):
+        '''
+        Sets the object to display the bytes of. The source is only
+        viewed while drawing rows and searching, so it can be resized
+        or replaced by its owner between calls.
+        '''
+        self.source = source
+        self.source_len = 0
+        if source is not None:
+            try:
+                with memoryview(source) as view:
+                    self.source_len = view.nbytes
+            except Exception:
+                print(format_exc())
+                self.source = None
+
+        self.pending_nibble = None
+        self.cursor = min(self.cursor, max(0, self.source_len - 1))
+        self.sel_anchor = min(self.sel_anchor, self.cursor)
+        self.top_row = max(0, min(self.top_row,
+                                  self.row_count - self.rows_in_view))
+        self.render()
+
+    def read(self, offset, size):
+        '''Returns a copy of size bytes of the source starting at offset.'''
+        if self.source is None:
+            return b''
+        with memoryview(self.source) as view, view.cast('B') as view:
+            return bytes(view[offset: offset + size])
+
+    def render(self):
+        '''Redraws the rows scrolled into view.'''
+        canvas = self.canvas
+        canvas.delete(tk.ALL)
+
+        bpr = self.bytes_per_row
+        cw, row_h = self.char_width, self.row_height
+        off_x, hex_x, ascii_x = self.column_x
+        font = self.get_font("fixed")
+        row_count = self.row_count
+        top = self.top_row
+        rows = min(self.rows_in_view, row_count - top)
+
+        data = self.read(top*bpr, rows*bpr) if rows > 0 else b''
+        sel_start, sel_end = self.selection
+        fg = self.text_normal_color
+
+        for r in range(max(rows, 0)):
+            offset = (top + r)*bpr
+            row_data = data[r*bpr: (r + 1)*bpr]
+            y = 2 + r*row_h
+
+            # highlight the selected bytes of this row
+            start = max(sel_start, offset) - offset
+            end = min(sel_end, offset + len(row_data)) - offset
+            if start < end:
+                for x, width in ((hex_x, 3), (ascii_x, 1)):
+                    canvas.create_rectangle(
+                        x + start*width*cw, y,
+                        x + (end*width - (width > 1))*cw, y + row_h - 1,
+                        fill=self.entry_highlighted_color, width=0)
+
+            canvas.create_text(off_x, y, anchor="nw", font=font,
+                               fill=self.text_disabled_color,
+                               text="%08X" % offset)
+            canvas.create_text(hex_x, y, anchor="nw", font=font, fill=fg,
+                               text=bytes_to_hex(row_data))
+            canvas.create_text(ascii_x, y, anchor="nw", font=font, fill=fg,
+                               text=row_data.translate(_ascii_table).decode())
+
+        # outline the byte the cursor is on in the column being typed in
+        if top*bpr <= self.cursor < (top + rows)*bpr:
+            r, c = divmod(self.cursor - top*bpr, bpr)
+            x = hex_x + 3*c*cw if self.cursor_side == "hex" else ascii_x + c*cw
+            width = 2*cw if self.cursor_side == "hex" else cw
+            canvas.create_rectangle(x - 1, 2 + r*row_h, x + width,
+                                    1 + (r + 1)*row_h, outline=fg)
+
+        if row_count:
+            self.vsb.set(top/row_count, min(1.0, (top + rows)/row_count))
+        else:
+            self.vsb.set(0.0, 1.0)
+
+        self.update_status()
+
+    def update_status(self):
+        sel_start, sel_end = self.selection
+        text = "Offset: 0x%X" % self.cursor
+        if sel_end - sel_start > 1:
+            text += "    Selected: 0x%X-0x%X (%s bytes)" % (
+                sel_start, sel_end - 1, sel_end - sel_start)
+        self.status_label.config(text=text)
+
+    def scroll_to_row(self, row):
+        row = max(0, min(int(row), self.row_count - self.rows_in_view))
+        if row != self.top_row:
+            self.top_row = row
+            self.render()
+
+    def see_offset(self, offset):
+        row = offset // self.bytes_per_row
+        if row < self.top_row:
+            self.scroll_to_row(row)
+        elif row >= self.top_row + self.rows_in_view:
+            self.scroll_to_row(row - self.rows_in_view + 1)
+
+    def scroll_command(self, action, amount, units=None):
+        if action == "moveto":
+            self.scroll_to_row(float(amount)*self.row_count)
+        elif action == "scroll":
+            if units == "pages":
+                amount = int(amount)*self.rows_in_view
+            self.scroll_to_row(self.top_row + int(amount))
+
+    def mousewheel_scroll(self, e):
+        if self.should_scroll(e):
+            self.scroll_to_row(self.top_row + 3*int(get_mouse_delta(e)))
+
+    def get_offset_at(self, x, y):
+        '''
+        Returns the offset of the byte at the canvas coordinates and the
+        column it's in, or (None, None) if there is no byte there.
+        '''
+        if not self.source_len:
+            return None, None
+
+        bpr, cw = self.bytes_per_row, self.char_width
+        off_x, hex_x, ascii_x = self.column_x
+        row = self.top_row + max(0, int(y) - 2)//self.row_height
+        if x >= ascii_x:
+            side, col = "ascii", (int(x) - ascii_x)//cw
+        elif x >= hex_x:
+            side, col = "hex", (int(x) - hex_x)//(3*cw)
+        else:
+            side, col = self.cursor_side, 0
+
+        col = max(0, min(col, bpr - 1))
+        return min(row*bpr + col, self.source_len - 1), side
+
+    def set_cursor(self, offset, extend=False, side=None):
+        offset = max(0, min(offset, self.source_len - 1))
+        self.cursor = offset
+        if not extend:
+            self.sel_anchor = offset
+        if side is not None:
+            self.cursor_side = side
+
+        self.pending_nibble = None
+        self.see_offset(offset)
+        self.render()
+
+    def click(self, e):
+        self.canvas.focus_set()
+        offset, side = self.get_offset_at(e.x, e.y)
+        if offset is not None:
+            self.set_cursor(offset, side=side)
+
+    def shift_click(self, e):
+        self.canvas.focus_set()
+        offset, side = self.get_offset_at(e.x, e.y)
+        if offset is not None:
+            self.set_cursor(offset, True, side)
+
+    def drag(self, e):
+        offset, side = self.get_offset_at(e.x, e.y)
+        if offset is not None:
+            self.set_cursor(offset, True)
+
+    def move_key(self, e):
+        bpr = self.bytes_per_row
+        cursor = self.cursor
+        moves = dict(
+            Left=-1, Right=1, Up=-bpr, Down=bpr,
+            Prior=-bpr*self.rows_in_view, Next=bpr*self.rows_in_view,
+            Home=-(cursor % bpr), End=bpr - 1 - cursor % bpr)
+
+        if e.keysym in moves:
+            self.set_cursor(cursor + moves[e.keysym], bool(e.state & 1))
+        return "break"
+
+    def key_press(self, e):
+        if (not self.editable or self.write_callback is None or
+                not self.source_len or e.state & 4 or not e.char):
+            return
+
+        char = e.char
+        if self.cursor_side == "ascii":
+            if not 32 <= ord(char) < 127:
+                return
+            self.write_bytes(self.cursor, char.encode("latin-1"))
+            self.set_cursor(self.cursor + 1)
+            return "break"
+
+        if char not in "0123456789abcdefABCDEF":
+            return
+
+        if self.pending_nibble is None:
+            # show the digit typed so far in place of the first digit
+            self.pending_nibble = char
+            self.render()
+            r, c = divmod(self.cursor - self.top_row*self.bytes_per_row,
+                          self.bytes_per_row)
+            self.canvas.create_text(
+                self.column_x[1] + 3*c*self.char_width,
+                2 + r*self.row_height, anchor="nw", text=char.upper(),
+                font=self.get_font("fixed"), fill=self.text_highlighted_color)
+        else:
+            new_byte = unhexlify(self.pending_nibble + char)
+            self.pending_nibble = None
+            self.write_bytes(self.cursor, new_byte)
+            self.set_cursor(self.cursor + 1)
+        return "break"
+
+    def write_bytes(self, offset, new_bytes):
+        try:
+            self.write_callback(offset, new_bytes)
+        except Exception:
+            print(format_exc())
+
+    def copy_selection(self, e=None):
+        '''Copies the selected bytes to the clipboard as hex.'''
+        sel_start, sel_end = self.selection
+        if sel_end <= sel_start:
+            return "break"
+
+        self.clipboard_clear()
+        self.clipboard_append(
+            bytes_to_hex(self.read(sel_start, sel_end - sel_start)))
+        return "break"
+
+    def focus_search(self, e=None):
+        self.search_entry.focus_set()
+        self.search_entry.select_range(0, tk.END)
+        return "break"
+
+    def find_next(self, e=None):
+        '''Selects the next occurrence of the searched for bytes.'''
+        query = self.search_entry.get()
+        if not query or self.source is None:
+            return "break"
+
+        query = parse_search_query(query)
+        # start after the cursor when searching for the same thing again
+        start = self.selection[0]
+        if query == self.last_query:
+            start += 1
+
+        self.last_query = query
+        offset = find_bytes(self.source, query, start)
+        if offset < 0 and start > 0:
+            # wrap around to the start
+            offset = find_bytes(self.source, query, 0)
+
+        if offset < 0:
+            self.status_label.config(text="Not found.")
+            return "break"
+
+        self.set_cursor(offset + len(query) - 1)
+        self.sel_anchor = offset
+        self.see_offset(offset)
+        self.render()
+        return "break"
@@ -1,15 +1,62 @@
 import threadsafe_tkinter as tk
+import tkinter.font
 import tkinter.ttk as ttk
 
+from bisect import bisect_left
+
 from binilla import editor_constants as e_c
 from binilla.widgets.binilla_widget import BinillaWidget
 from binilla.widgets import get_mouse_delta, get_relative_widget_position
 
 
-win_10_pad = 2
+__all__ = ("ScrollMenu", "OptionSearchIndex", )
 
 
-__all__ = ("ScrollMenu", )
+class OptionSearchIndex:
+    '''
+    Indexes the option strings of a ScrollMenu so they can be filtered
+    by what is typed while the option box is open. Options whose string
+    starts with the query are found by bisecting a sorted list of them,
+    and options containing the query are found by scanning. A query that
+    extends the previous one only scans the options the previous matched.
+    '''
+    def __init__(self, labels):
+        # labels is a sequence of the option strings by option index
+        self.labels = [str(label).lower() for label in labels]
+        self.sorted_labels = sorted(
+            (label, i) for i, label in enumerate(self.labels))
+        self._last_query = ""
+        self._last_matches = None
+
+    def search(self, query):
+        '''
+        Returns a list of the indices of the options matching the query.
+        Options that start with the query come first, followed by ones
+        that contain it, with each group sorted by option index.
+        '''
+        query = query.lower()
+        if not query:
+            return list(range(len(self.labels)))
+
+        sorted_labels = self.sorted_labels
+        prefixed = []
+        i = bisect_left(sorted_labels, (query, -1))
+        while i < len(sorted_labels) and sorted_labels[i][0].startswith(query):
+            prefixed.append(sorted_labels[i][1])
+            i += 1
+        prefixed.sort()
+
+        candidates = self._last_matches
+        if candidates is None or not query.startswith(self._last_query):
+            candidates = range(len(self.labels))
+
+        labels = self.labels
+        matches = [i for i in candidates if query in labels[i]]
+        self._last_query = query
+        self._last_matches = matches
+
+        prefixed_set = set(prefixed)
+        return prefixed + [i for i in matches if i not in prefixed_set]
 
 
 class ScrollMenu(tk.Frame, BinillaWidget):
@@ -38,6 +85,16 @@ class ScrollMenu(tk.Frame, BinillaWidget):
 
     menu_width = None
 
+    # The option box only holds the rows that are scrolled into view.
+    # option_rows are the option indices that can be scrolled through,
+    # and option_top is the position in option_rows of the top row.
+    menu_options = None
+    option_rows = ()
+    option_top = 0
+    option_rows_visible = 1
+    option_filter = ""
+    option_search_index = None
+
     def __init__(self, *args, **kwargs):
         BinillaWidget.__init__(self)
 
@@ -99,13 +156,16 @@ def __init__(self, *args, **kwargs):
             self.option_frame, highlightthickness=0, exportselection=False,
             bg=self.enum_normal_color, fg=self.text_normal_color,
             selectbackground=self.enum_highlighted_color,
-            selectforeground=self.text_highlighted_color,
-            yscrollcommand=self.option_bar.set, width=menu_width)
-        self.option_bar.config(command=self.option_box.yview)
+            selectforeground=self.text_highlighted_color, width=menu_width)
+        self.option_bar.config(command=self.scroll_option_box)
+        self.filter_label = tk.Label(
+            self.option_frame, anchor='w', justify='left',
+            bg=self.enum_highlighted_color, fg=self.text_highlighted_color)
 
         # make sure the TagWindow knows these widgets are scrollable
         for w in (self.sel_label, self.button_frame, self.arrow_button,
-                  self.option_frame, self.option_bar, self.option_box):
+                  self.option_frame, self.option_bar, self.option_box,
+                  self.filter_label):
             w.can_scroll = self.can_scroll
             w.f_widget_parent = self.f_widget_parent
 
@@ -116,6 +176,11 @@ def __init__(self, *args, **kwargs):
         self.arrow_button.bind('<Down>', self.increment_sel)
         self.option_bar.bind('<Up>', self.decrement_listbox_sel)
         self.option_bar.bind('<Down>', self.increment_listbox_sel)
+        self.option_bar.bind('<Prior>', self.page_up_listbox_sel)
+        self.option_bar.bind('<Next>', self.page_down_listbox_sel)
+        self.option_bar.bind('<Key>', self.type_option_filter)
+        self.option_bar.bind('<BackSpace>', self.backspace_option_filter)
+        self.option_bar.bind('<Escape>', self.escape_option_box)
 
         if e_c.IS_LNX:
             self.sel_label.bind('<4>', self._mousewheel_scroll)
@@ -124,10 +189,14 @@ def __init__(self, *args, **kwargs):
             self.button_frame.bind('<5>', self._mousewheel_scroll)
             self.arrow_button.bind('<4>', self._mousewheel_scroll)
             self.arrow_button.bind('<5>', self._mousewheel_scroll)
+            self.option_box.bind('<4>', self._option_box_mousewheel_scroll)
+            self.option_box.bind('<5>', self._option_box_mousewheel_scroll)
         else:
             self.sel_label.bind('<MouseWheel>', self._mousewheel_scroll)
             self.button_frame.bind('<MouseWheel>', self._mousewheel_scroll)
             self.arrow_button.bind('<MouseWheel>', self._mousewheel_scroll)
+            self.option_box.bind('<MouseWheel>',
+                                 self._option_box_mousewheel_scroll)
 
         self.sel_label.bind('<Button-1>', self.click_label)
         self.arrow_button.bind('<ButtonRelease-1>', self.select_option_box)
@@ -135,7 +204,7 @@ def __init__(self, *args, **kwargs):
         self.arrow_button.bind('<space>', self.select_option_box)
         self.option_bar.bind('<FocusOut>', self.deselect_option_box)
         self.option_bar.bind('<Return>', self.select_menu)
-        self.option_bar.bind('<space>', self.select_menu)
+        self.option_bar.bind('<space>', self.space_option_box)
         self.option_box.bind('<<ListboxSelect>>', self.select_menu)
 
         self.set_disabled(disabled)
@@ -227,25 +296,44 @@ def click_outside_option_box(self, e):
         under_mouse = self.winfo_containing(e.x_root, e.y_root)
         if under_mouse not in (self.option_frame, self.option_bar,
                                self.option_box, self.sel_label,
-                               self.arrow_button):
+                               self.arrow_button, self.filter_label):
             self.deselect_option_box()
 
     def decrement_listbox_sel(self, e=None):
-        if self.selecting:
+        self.move_listbox_sel(-1)
+
+    def increment_listbox_sel(self, e=None):
+        self.move_listbox_sel(1)
+
+    def page_up_listbox_sel(self, e=None):
+        self.move_listbox_sel(-self.option_page_size)
+
+    def page_down_listbox_sel(self, e=None):
+        self.move_listbox_sel(self.option_page_size)
+
+    def move_listbox_sel(self, delta):
+        '''
+        Moves the selection in the option box by delta rows, scrolling
+        the option box to keep the newly selected option in view.
+        '''
+        if self.selecting or not self.option_box_visible:
             return
-        sel_indices = self.option_box.curselection()
-        if not sel_indices:
+
+        rows = self.option_rows
+        row = self.get_option_row(self.sel_index)
+        if not rows:
             return
-        new_index = sel_indices[0] - 1
-        if new_index < 0:
-            new_index = (self.max_index >= 0) - 1
+        elif row is None:
+            row = 0
+        else:
+            row = max(0, min(row + delta, len(rows) - 1))
 
+        new_index = rows[row]
         try:
             self.selecting = True
-            self.option_box.select_clear(0, tk.END)
-            self.option_box.select_set(new_index)
-            self.option_box.see(new_index)
+            self.see_option_row(row)
             self.sel_index = new_index
+            self.render_option_box()
             if self.callback is not None:
                 self.callback(new_index)
             self.selecting = False
@@ -289,6 +377,8 @@ def deselect_option_box(self, e=None):
             self.option_bar.forget()
             self.option_box_visible = False
             self.click_outside_funcid = None
+            self.option_filter = ""
+            self.filter_label.pack_forget()
 
         self.arrow_button.unbind('<FocusOut>')
 
@@ -316,29 +406,6 @@ def enable(self):
                               fg=self.text_normal_color)
         self.arrow_button.config(state='normal')
 
-    def increment_listbox_sel(self, e=None):
-        if self.selecting:
-            return
-        sel_indices = self.option_box.curselection()
-        if not sel_indices:
-            return
-        new_index = sel_indices[0] + 1
-        if new_index > self.max_index:
-            new_index = self.max_index
-
-        try:
-            self.selecting = True
-            self.option_box.select_clear(0, tk.END)
-            self.option_box.select_set(new_index)
-            self.option_box.see(new_index)
-            self.sel_index = new_index
-            if self.callback is not None:
-                self.callback(new_index)
-            self.selecting = False
-        except Exception:
-            self.selecting = False
-            raise
-
     def increment_sel(self, e=None):
         if self.selecting:
             return
@@ -356,10 +423,20 @@ def increment_sel(self, e=None):
             raise
 
     def select_menu(self, e=None):
-        sel_index = [int(i) for i in self.option_box.curselection()]
-        if not sel_index:
+        sel_rows = [int(i) for i in self.option_box.curselection()]
+        if sel_rows:
+            row = self.option_top + sel_rows[0]
+        else:
+            # nothing is selected in the rows being displayed, so
+            # fall back to the selected option if it's displayable
+            row = self.get_option_row(self.sel_index)
+            if row is None and self.option_filter:
+                # pick the best match for what was typed
+                row = 0
+
+        if row is None or row not in range(len(self.option_rows)):
             return
-        self.sel_index = sel_index[0]
+        self.sel_index = self.option_rows[row]
         if self.callback is not None:
             self.callback(self.sel_index)
         self.deselect_option_box()
@@ -391,21 +468,19 @@ def show_menu(self):
         option_cnt = self.max_index + 1
 
         if not self.options_menu_sane or self.options_volatile:
-            END = tk.END
-            self.option_box.delete(0, END)
-            insert = self.option_box.insert
-            def_str = '%s' + ('. %s' % self.default_text)
             menu_width = self.menu_width if self.menu_width else\
                          self.scroll_menu_width
-            for i in range(option_cnt):
-                if i in options:
-                    insert(END, options[i])
-                else:
-                    insert(END, def_str % i)
-
+            # the search index is only built once something is typed
+            self.option_search_index = None
             self.options_menu_sane = True
             self.sel_label.config(width=menu_width)
 
+        self.menu_options = options
+        self.option_filter = ""
+        self.option_rows = range(option_cnt)
+        self.option_top = 0
+        self.filter_label.pack_forget()
+
         # explicitly forget these so they can be repacked properly
         self.option_bar.pack_forget()
         self.option_box.pack_forget()
@@ -419,7 +494,9 @@ def show_menu(self):
         pos_x, pos_y = get_relative_widget_position(
             self.sel_label, self.option_frame.master)
         pos_y += self_height - 4
-        height = min(max(option_cnt, 0), self.max_height)*(14 + win_10_pad) + 4
+        row_height = self.get_option_row_height()
+        height = min(max(option_cnt, 0), self.max_height)*row_height + 4
+        self.option_box.config(height=min(max(option_cnt, 1), self.max_height))
         width = max(self.option_box.winfo_reqwidth(),
                     self.sel_label.winfo_width() +
                     self.arrow_button.winfo_width())
@@ -441,11 +518,12 @@ def show_menu(self):
             pos_y -= self_height + height
 
         # unpack the scrollbar if there is enough room to display the whole list
-        if option_cnt <= self.max_height and (height - 4) // 14 >= option_cnt:
+        if option_cnt <= self.max_height and (height - 4) // row_height >= option_cnt:
             # place it off the frame so it can still be used for key bindings
             self.option_bar.pack_forget()
             self.option_bar.place(x=pos_x + width, y=pos_y, anchor=tk.NW)
 
+        self.option_rows_visible = max(1, (height - 4) // row_height)
         self.option_bar.focus_set()
         self.option_frame.place(x=pos_x, y=pos_y, anchor=tk.NW,
                                 height=height, width=width)
@@ -459,13 +537,161 @@ def show_menu(self):
             self.sel_index = self.max_index
 
         try:
-            self.option_box.select_clear(0, tk.END)
-            if self.sel_index >= 0:
-                self.option_box.select_set(self.sel_index)
-                self.option_box.see(self.sel_index)
+            row = self.get_option_row(self.sel_index)
+            if row is not None:
+                self.see_option_row(row)
+            self.render_option_box()
         except Exception:
             pass
 
+    @property
+    def option_page_size(self):
+        return max(1, self.option_rows_visible - bool(self.option_filter))
+
+    def get_option_row_height(self):
+        '''
+        Returns the pixel height of each row in the option box, measured
+        from the font it is displaying with, the same way a Listbox does.
+        '''
+        try:
+            font = tkinter.font.Font(root=self.option_box,
+                                     font=self.option_box.cget("font"))
+            sel_bd = int(float(self.option_box.cget("selectborderwidth")))
+            return max(1, font.metrics("linespace") + 1 + 2*sel_bd)
+        except Exception:
+            return 16
+
+    def get_option_string(self, opt_index):
+        options = self.menu_options
+        option = None if options is None else options.get(opt_index)
+        if option is None:
+            return '%s. %s' % (opt_index, self.default_text)
+        return option
+
+    def get_option_row(self, opt_index):
+        '''
+        Returns the position of the option in the rows that can
+        be scrolled through, or None if it isn't one of them.
+        '''
+        try:
+            return self.option_rows.index(opt_index)
+        except ValueError:
+            return None
+
+    def see_option_row(self, row):
+        '''Scrolls the option box so the given row is in view.'''
+        page_size = self.option_page_size
+        if row < self.option_top:
+            self.option_top = row
+        elif row >= self.option_top + page_size:
+            self.option_top = row - page_size + 1
+
+    def render_option_box(self):
+        '''
+        Fills the option box with only the rows that are scrolled into
+        view, rather than every option, and updates the scrollbar to match.
+        '''
+        rows = self.option_rows
+        page_size = self.option_page_size
+        row_count = len(rows)
+        top = self.option_top = max(0, min(self.option_top,
+                                           row_count - page_size))
+
+        visible = rows[top: top + page_size]
+        box = self.option_box
+        box.delete(0, tk.END)
+        if visible:
+            box.insert(tk.END, *(self.get_option_string(i) for i in visible))
+
+        box.select_clear(0, tk.END)
+        row = self.get_option_row(self.sel_index)
+        if row is not None and top <= row < top + page_size:
+            box.select_set(row - top)
+
+        if row_count:
+            self.option_bar.set(top / row_count,
+                                min(1.0, (top + page_size) / row_count))
+        else:
+            self.option_bar.set(0.0, 1.0)
+
+    def scroll_option_box(self, *args):
+        '''The scrollbar command for the virtualized option box.'''
+        if not args:
+            return
+
+        page_size = self.option_page_size
+        if args[0] == "moveto":
+            self.option_top = int(float(args[1])*len(self.option_rows) + 0.5)
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            if len(args) > 2 and args[2] == "pages":
+                amount *= page_size
+            self.option_top += amount
+
+        self.render_option_box()
+
+    def _option_box_mousewheel_scroll(self, e):
+        if self.option_box_visible:
+            delta = get_mouse_delta(e)
+            if delta:
+                self.scroll_option_box("scroll", delta, "units")
+        return "break"
+
+    def set_option_filter(self, new_filter):
+        '''
+        Filters the rows of the option box down to the options matching
+        the given string. An empty string shows every option.
+        '''
+        option_cnt = self.max_index + 1
+        self.option_filter = new_filter
+        self.option_top = 0
+        if not new_filter:
+            self.option_rows = range(option_cnt)
+            self.filter_label.pack_forget()
+        else:
+            if self.option_search_index is None:
+                self.option_search_index = OptionSearchIndex(
+                    [self.get_option_string(i) for i in range(option_cnt)])
+            self.option_rows = self.option_search_index.search(new_filter)
+            self.filter_label.config(
+                text="%s  (%s matches)" % (new_filter, len(self.option_rows)))
+            if not self.filter_label.winfo_manager():
+                self.filter_label.pack(side='top', fill='x',
+                                       before=self.option_box)
+
+        row = self.get_option_row(self.sel_index)
+        if row is not None:
+            self.see_option_row(row)
+        self.render_option_box()
+
+    def type_option_filter(self, e):
+        if not self.option_box_visible or e.state & 0x4:
+            # dont eat keypresses with control held so hotkeys still work
+            return
+        elif len(e.char) == 1 and e.char.isprintable():
+            self.set_option_filter(self.option_filter + e.char)
+            return "break"
+
+    def backspace_option_filter(self, e=None):
+        if self.option_box_visible and self.option_filter:
+            self.set_option_filter(self.option_filter[: -1])
+        return "break"
+
+    def space_option_box(self, e=None):
+        # spaces are part of the filter once something has been typed
+        if self.option_box_visible and self.option_filter:
+            self.set_option_filter(self.option_filter + " ")
+        else:
+            self.select_menu()
+        return "break"
+
+    def escape_option_box(self, e=None):
+        if self.option_filter:
+            self.set_option_filter("")
+        else:
+            self.deselect_option_box()
+        return "break"
+
     def update_label(self, text=''):
         if not text:
             text = self.sel_name
@@ -21,8 +21,9 @@ class ToolTipHandler(BinillaWidget):
 
     curr_tip_text = ''
 
-    # run the check 15 times a second
-    schedule_rate = int(1000/15)
+    # the id of the after() timer that will display the tooltip
+    # of the focus_widget once the mouse has hovered long enough.
+    pending_tip_id = None
     last_mouse_x = 0
     last_mouse_y = 0
 
@@ -34,65 +35,107 @@ def __init__(self, app_root, *args, **kwargs):
         self.app_root = app_root
         self.hover_start = time()
 
-        # begin the looping
-        app_root.after(int(self.schedule_rate), self.check_loop)
-
-    def check_loop(self):
-        # get the widget under the mouse
-        root = self.app_root
-        mouse_x, mouse_y = root.winfo_pointerx(), root.winfo_pointery()
-
-        mouse_dx = mouse_x - self.last_mouse_x
-        mouse_dy = mouse_y - self.last_mouse_y
+        # the "all" bindtag is on every widget, so these are called whenever
+        # the mouse moves over any widget with or without a tooltip_string.
+        # nothing runs at all while the mouse isn't moving over the app.
+        for sequence in ('<Enter>', '<Motion>'):
+            app_root.bind_all(sequence, self.mouse_moved, '+')
+        app_root.bind_all('<Leave>', self.mouse_left, '+')
 
+    def mouse_moved(self, e):
+        mouse_x, mouse_y = e.x_root, e.y_root
+        moved = (mouse_x, mouse_y) != (self.last_mouse_x, self.last_mouse_y)
         self.last_mouse_x = mouse_x
         self.last_mouse_y = mouse_y
 
-        # move the tip_window to where it needs to be
-        if self.tip_window and mouse_dx or mouse_dy:
-            try:
-                self.tip_window.geometry("+%s+%s" % (mouse_x + self.tip_offset_x,
-                                                     mouse_y + self.tip_offset_y))
-            except Exception:
-                pass
-
-        try:
-            focus = root.winfo_containing(mouse_x, mouse_y)
-        except KeyError:
-            self.app_root.after(self.schedule_rate, self.check_loop)
-            return
-
+        # e.widget is the widget under the mouse. it may be a
+        # string if the widget was made outside of tkinter.
+        focus = e.widget
         try:
             tip_text = focus.tooltip_string
         except Exception:
             tip_text = None
 
         curr_time = time()
+        if self.tip_window:
+            if self.curr_tip_text == tip_text:
+                # move the tip_window to where it needs to be
+                if moved:
+                    self.move_tip(mouse_x + self.tip_offset_x,
+                                  mouse_y + self.tip_offset_y)
+                return
 
-        if self.curr_tip_text != tip_text and self.tip_window:
             # a tip window is displayed and the focus is different
             self.hide_tip()
             self.rehover_start = curr_time
 
-        if self.tip_window is None:
-            # no tip window is displayed, so start trying to display one
-
-            can_display = (curr_time >= self.hover_time + self.hover_start or
-                           curr_time <= self.rehover_time + self.rehover_start)
-            
-            if not tip_text or not self.show_tooltips:
-                # reset the hover counter cause nothing is under focus
-                self.hover_start = curr_time
-            elif focus is not self.focus_widget:
-                # start counting how long this widget has been in focus
-                self.hover_start = curr_time
-                self.focus_widget = focus
-            elif can_display:
-                # reached the hover time! display the tooltip window
-                self.show_tip(mouse_x + self.tip_offset_x,
-                              mouse_y + self.tip_offset_y, tip_text)
-                self.curr_tip_text = tip_text
-        self.app_root.after(self.schedule_rate, self.check_loop)
+        if not tip_text or not self.show_tooltips:
+            # nothing is under focus, so cancel displaying a tip
+            self.cancel_tip()
+        elif focus is not self.focus_widget or tip_text != self.curr_tip_text:
+            # start counting how long this widget has been in focus
+            self.cancel_tip()
+            self.hover_start = curr_time
+            self.focus_widget = focus
+            self.curr_tip_text = tip_text
+
+            delay = self.hover_time
+            if curr_time <= self.rehover_time + self.rehover_start:
+                # a tip was just displayed, so display this one right away
+                delay = 0
+
+            self.pending_tip_id = self.app_root.after(
+                int(delay * 1000), self.show_pending_tip)
+
+    def mouse_left(self, e):
+        if e.widget is not self.focus_widget:
+            return
+
+        try:
+            # leaving one widget for another calls mouse_moved
+            # for that widget, so only handle leaving the app.
+            if self.app_root.winfo_containing(e.x_root, e.y_root):
+                return
+        except Exception:
+            pass
+
+        if self.tip_window:
+            self.hide_tip()
+            self.rehover_start = time()
+        self.cancel_tip()
+
+    def show_pending_tip(self):
+        # reached the hover time! display the tooltip window
+        self.pending_tip_id = None
+        try:
+            tip_text = self.focus_widget.tooltip_string
+        except Exception:
+            tip_text = None
+
+        if not tip_text or not self.show_tooltips:
+            return
+
+        self.show_tip(self.last_mouse_x + self.tip_offset_x,
+                      self.last_mouse_y + self.tip_offset_y, tip_text)
+        self.curr_tip_text = tip_text
+
+    def cancel_tip(self):
+        '''Cancels displaying the tooltip of the widget being hovered over.'''
+        if self.pending_tip_id is not None:
+            try:
+                self.app_root.after_cancel(self.pending_tip_id)
+            except Exception:
+                pass
+
+        self.pending_tip_id = None
+        self.focus_widget = None
+        self.curr_tip_text = ''
+
+    def move_tip(self, pos_x, pos_y):
+        try:
+            self.tip_window.geometry("+%s+%s" % (pos_x, pos_y))
+        except Exception:
+            pass
 
     @property
     def widget_flags(self):
@@ -12,8 +12,12 @@
 from traceback import format_exc
 
 from binilla import constants
+from binilla.dyn_name_path import DynNameCache
+from binilla import editor_constants as e_c
 from binilla.edit_manager import EditManager
-from binilla.widgets.field_widgets import FieldWidget
+from binilla.widgets.field_widgets import FieldWidget, FieldWidgetPool,\
+     DirtyWidgetTracker
+from binilla.widgets.field_widgets.layout_plan import LayoutPlan
 from binilla.widgets.field_widget_picker import def_widget_picker
 from binilla.widgets.binilla_widget import BinillaWidget
 from binilla.widgets import get_mouse_delta
@@ -92,6 +96,15 @@ class TagWindow(tk.Toplevel, BinillaWidget):
     #                                    the widget to build when populating
     # The tag handler that built the tag this window is displaying
     handler = None
+    # The FieldWidgetPool that released FieldWidgets are held in for reuse
+    widget_pool = None
+    # The DynNameCache holding the names generated from DYN_NAME_PATHs
+    dyn_name_cache = None
+    # The DirtyWidgetTracker of the FieldWidgets with edits or unflushed changes
+    dirty_widgets = None
+    # The LayoutPlan of the FieldWidgets being built while populating.
+    # Discarded once they're all built, or when the tag is edited.
+    layout_plan = None
 
     can_scroll = True
 
@@ -112,12 +125,24 @@ class TagWindow(tk.Toplevel, BinillaWidget):
     _resizing_window = False
     _saving = False
     _initialized = False
-    _scrolling = False
+    _scroll_pending = False
+    _last_scroll_time = 0.0
+    _virtual_view_update_pending = False
     _last_saved_edit_index = 0
-    _pending_scroll_counts = ()
+    # the mousewheel deltas waiting to be applied on the x and y axis
+    _pending_scroll_deltas = ()
+    # (x_root, y_root, time, should_scroll) of the last scroll check
+    _scroll_target = None
+    # Whether containers being populated should leave their fields
+    # as placeholders for this window to build while idle.
+    _realizing = False
+    _realize_pending = False
+    _realize_stack = ()
+    _realized_count = 0
 
     def __init__(self, master, tag=None, *args, **kwargs):
-        self._pending_scroll_counts = [0, 0]
+        self._pending_scroll_deltas = [0, 0]
+        self._realize_stack = []
         self.tag = tag
         self.is_new_tag = kwargs.pop("is_new_tag", self.is_new_tag)
 
@@ -133,6 +158,9 @@ def __init__(self, master, tag=None, *args, **kwargs):
 
         self.app_root = kwargs.pop('app_root', master)
         self.handler = kwargs.pop('handler', None)
+        self.widget_pool = FieldWidgetPool()
+        self.dyn_name_cache = DynNameCache()
+        self.dirty_widgets = DirtyWidgetTracker()
 
         kwargs.update(bg=self.default_bg_color)
 
@@ -169,6 +197,8 @@ def __init__(self, master, tag=None, *args, **kwargs):
             self.apply_style()
 
         self._initialized = True
+        if self.virtualize_widgets:
+            self.schedule_virtual_view_update()
 
     def post_toplevel_init(self):
         self.update_title()
@@ -192,13 +222,14 @@ def post_toplevel_init(self):
         self.root_vsb = tk.Scrollbar(
             self, orient='vertical', command=rc.yview)
         rc.config(xscrollcommand=self.root_hsb.set, xscrollincrement=1,
-                  yscrollcommand=self.root_vsb.set, yscrollincrement=1)
+                  yscrollcommand=self._set_yscroll, yscrollincrement=1)
         self.root_frame_id = rc.create_window((0, 0), window=rf, anchor='nw')
 
         # make it so if this window is selected it changes the
         # selected_tag attribute of self.app_root to self.tag
         self.bind('<Button>', self.select_window)
         self.bind('<FocusIn>', self.select_window)
+        self.bind('<Map>', self._restyle_on_map)
 
         rf.bind('<Configure>', self._resize_canvas)
         rc.bind('<Configure>', self._resize_frame)
@@ -312,6 +343,31 @@ def use_gui_names(self):
         except Exception:
             return True
 
+    @property
+    def virtualize_widgets(self):
+        try:
+            return bool(self.widget_flags.virtualize_widgets)
+        except Exception:
+            return False
+
+    @property
+    def show_arrays_as_tables(self):
+        try:
+            return bool(self.widget_flags.show_arrays_as_tables)
+        except Exception:
+            return False
+
+    @property
+    def preview_large_text(self):
+        try:
+            return bool(self.widget_flags.preview_large_text)
+        except Exception:
+            return False
+
+    @property
+    def defer_widgets(self):
+        return self._realizing and not self.virtualize_widgets
+
     @property
     def is_config(self):
         try:
@@ -429,50 +485,123 @@ def _resize_frame(self, e):
         if rc_w != rf.winfo_reqwidth() or rc_h != rf.winfo_reqheight():
             rc.itemconfigure(rf_id, width=rc_w, height=rc_h)
 
+    def _set_yscroll(self, first, last):
+        '''
+        Updates the vertical scrollbar when the root_canvas view changes,
+        and updates which field widgets exist if virtualizing them.
+        '''
+        self.root_vsb.set(first, last)
+        if self.virtualize_widgets:
+            self.schedule_virtual_view_update()
+
+    def schedule_virtual_view_update(self):
+        if self._virtual_view_update_pending:
+            return
+
+        self._virtual_view_update_pending = True
+        self.after_idle(self.update_virtual_view)
+
+    def update_virtual_view(self):
+        '''
+        Builds the field widgets that are scrolled into view(plus a margin)
+        and destroys the ones scrolled out of it, leaving placeholders.
+        '''
+        self._virtual_view_update_pending = False
+        if self.field_widget is None or not self._initialized:
+            return
+
+        try:
+            rc = self.root_canvas
+            # make sure the geometry of the widgets is up to date
+            self.root_frame.update_idletasks()
+            top = rc.canvasy(0) - e_c.VIRTUAL_VIEW_MARGIN
+            bottom = (rc.canvasy(0) + rc.winfo_height() +
+                      e_c.VIRTUAL_VIEW_MARGIN)
+            y = self.field_widget.winfo_y()
+            if self.field_widget.update_virtual_fields(top - y, bottom - y):
+                # the layout changed, so positions need to be rechecked
+                self.schedule_virtual_view_update()
+        except Exception:
+            print(format_exc())
+
     def mousewheel_scroll_x(self, e):
         if self.should_scroll(e):
-            self.after_idle(
-                lambda func=self.mousewheel_scroll, event=e: func(0, event))
+            self.mousewheel_scroll(0, e)
 
     def mousewheel_scroll_y(self, e):
         if self.should_scroll(e):
-            self.after_idle(
-                lambda func=self.mousewheel_scroll, event=e: func(1, event))
+            self.mousewheel_scroll(1, e)
 
     def mousewheel_scroll(self, axis, event):
-        bbox = self.root_canvas.bbox(tk.ALL)
-        dims = (self.root_canvas.winfo_width(),
-                self.root_canvas.winfo_height())
-        if not bbox or (dims[axis] >= (bbox[2 + axis] - bbox[axis])):
+        '''
+        Adds the events mousewheel delta to the scroll pending on the axis.
+        Pending scrolls are applied together at most once every
+        SCROLL_FRAME_MS, so fast scrolling doesn't queue up redraws.
+        '''
+        self._pending_scroll_deltas[axis] += get_mouse_delta(event)
+        if self._scroll_pending:
             return
 
-        self._pending_scroll_counts[axis] += 1
-        if self._scrolling:
-            return
+        self._scroll_pending = True
+        elapsed = int((time.perf_counter() - self._last_scroll_time) * 1000)
+        self.after(max(0, e_c.SCROLL_FRAME_MS - elapsed),
+                   self.apply_pending_scroll)
 
-        self._scrolling = True
+    def apply_pending_scroll(self):
+        '''Scrolls the root_canvas by the mousewheel deltas added up so far.'''
+        self._scroll_pending = False
+        self._last_scroll_time = time.perf_counter()
+        deltas = self._pending_scroll_deltas
         try:
-            axis_char = "xy"[axis]
-            scroll_func = getattr(self.root_canvas, axis_char + "view_scroll")
-            scroll_inc = (getattr(self.app_root, "scroll_increment_" + axis_char, 20) *
-                          self._pending_scroll_counts[axis] * get_mouse_delta(event))
-            self._pending_scroll_counts[axis] = 0
-            scroll_func(int(scroll_inc), "units")
-            self.root_canvas.update()
-            self._scrolling = False
+            rc = self.root_canvas
+            bbox = rc.bbox(tk.ALL)
+            dims = (rc.winfo_width(), rc.winfo_height())
+            scrolled = False
+            for axis in (0, 1):
+                delta, deltas[axis] = deltas[axis], 0
+                if (not delta or not bbox or
+                        dims[axis] >= (bbox[2 + axis] - bbox[axis])):
+                    continue
+
+                axis_char = "xy"[axis]
+                scroll_func = getattr(rc, axis_char + "view_scroll")
+                scroll_inc = getattr(
+                    self.app_root, "scroll_increment_" + axis_char, 20)
+                scroll_func(int(scroll_inc * delta), "units")
+                scrolled = True
+
+            if scrolled:
+                rc.update_idletasks()
         except Exception:
-            self._scrolling = False
-            raise
+            deltas[:] = (0, 0)
+            print(format_exc())
 
     def should_scroll(self, e):
         '''
         Returns True if, when given a tkinter event, this TagWindow should
         have its scrolling method follow through when it is invoked.
         Returns False otherwise.
+
+        The answer is remembered while the mouse stays still and
+        keeps scrolling, as finding it requires climbing the widgets
+        under the mouse. This also keeps the scrolling from switching
+        to a widget that scrolls under the mouse mid-scroll.
         '''
         if not self.can_scroll:
             return False
 
+        now = time.perf_counter()
+        target = self._scroll_target
+        if (target is not None and target[:2] == (e.x_root, e.y_root) and
+                now - target[2] < e_c.SCROLL_TARGET_TIMEOUT):
+            self._scroll_target = (e.x_root, e.y_root, now, target[3])
+            return target[3]
+
+        should_scroll = self._should_scroll(e)
+        self._scroll_target = (e.x_root, e.y_root, now, should_scroll)
+        return should_scroll
+
+    def _should_scroll(self, e):
         try:
             hover = self.winfo_containing(e.x_root, e.y_root)
             if not hover.can_scroll:
@@ -546,9 +675,9 @@ def destroy(self):
             print("Still initializing window. Please wait.")
             return True
 
+        app_root = self.app_root
+        tag = self.tag
         try:
-            app_root = self.app_root
-            tag = self.tag
             try:
                 if self.needs_flushing:
                     self.field_widget.flush()
@@ -585,6 +714,12 @@ def destroy(self):
         except Exception:
             print(format_exc())
 
+        # let the app_root hold onto this window to display another
+        # tag with the same definition, rather than destroying it.
+        recycle = getattr(app_root, "recycle_tag_window", None)
+        if recycle is not None and tag is not None and recycle(self):
+            return
+
         # call pack_forget so destroying doesn't keep redrawing the widgets
         self.field_widget.pack_forget()
         tk.Toplevel.destroy(self)
@@ -710,6 +845,20 @@ def exit_style_change(self):
         self.styling_label.pack_forget()
         self.root_canvas.pack(side='left', fill='both', expand=True)
 
+    def should_defer_style(self):
+        # hidden and minimized windows are restyled when they're shown
+        try:
+            return self._initialized and not self.winfo_viewable()
+        except Exception:
+            return False
+
+    def _restyle_on_map(self, e):
+        if e.widget is not self or self.style_is_current:
+            return
+
+        with self.style_change_lock:
+            self.apply_style()
+
     def apply_style(self, seen=None):
         BinillaWidget.apply_style(self, seen)
         self.root_canvas.config(bg=self.default_bg_color)
@@ -720,27 +869,201 @@ def populate(self):
         Destroys the FieldWidget attached to this TagWindow and remakes it.
         '''
         # Destroy everything
+        self.cancel_realizing()
         if hasattr(self.field_widget, 'destroy'):
             self.field_widget.destroy()
             self.field_widget = None
+        self.dirty_widgets.clear()
 
         if self.tag is None:
             return
 
         # Get the desc of the top block in the tag
-        root_block = self.tag.data
+        tag = self.tag
+        root_block = tag.data
 
         # Get the widget to build
         widget_cls = self.widget_picker.get_widget(root_block.desc)
 
-        # Rebuild everything
+        # plan out the widgets in a separate thread so the ui doesn't freeze
+        layout_plan = self.plan_layout(root_block)
+        if self.tag is not tag or layout_plan.cancelled:
+            # the tag was closed or changed while planning
+            return
+
+        self.layout_plan = layout_plan
+
+        # Rebuild everything. Only the top level widgets are built here.
+        # The rest are built a few at a time when the ui is idle.
+        self._realizing = True
+        self._realized_count = 0
         self.field_widget = widget_cls(self.root_frame, node=root_block,
                                        show_frame=True, tag_window=self)
         self.field_widget.pack(expand=True, fill='both')
+        if self.virtualize_widgets:
+            self.schedule_virtual_view_update()
+
+        if not self._realize_stack:
+            self.finish_realizing()
+
+    def plan_layout(self, root_node):
+        '''
+        Returns a LayoutPlan of the widgets to build to display the given node.
+        The plan is made in a separate thread while this one keeps updating.
+        '''
+        self.layout_plan = layout_plan = LayoutPlan(
+            self.get_visible, self.widget_picker, self.use_gui_names,
+            self.show_arrays_as_tables)
+
+        plan_thread = Thread(target=layout_plan.plan, args=(root_node, ),
+                             daemon=True)
+        plan_thread.start()
+        # do this threaded so it doesn't freeze the ui
+        while True:
+            plan_thread.join(0.05)
+            if not plan_thread.is_alive():
+                break
+            self.update()
+
+        return layout_plan
+
+    def queue_realize(self, container):
+        '''
+        Queues the fields the container left as placeholders
+        when populating to be built a few at a time while idle.
+        '''
+        if self.virtualize_widgets:
+            return
+
+        self._realize_stack.append(
+            [container, container.virtual_field_indices, 0])
+        if not self._realize_pending:
+            self._realize_pending = True
+            self.after_idle(self.realize_widgets)
+
+    def cancel_realizing(self):
+        '''Stops building any queued placeholder fields.'''
+        del self._realize_stack[:]
+        self.finish_realizing()
+
+    def realize_widgets(self):
+        '''
+        Builds queued placeholder fields until REALIZE_TIME_BUDGET runs out,
+        then lets the ui update before building more. Containers built here
+        queue their own fields, so the fields are built from the top down.
+        '''
+        self._realize_pending = False
+        stack = self._realize_stack
+        end = time.perf_counter() + e_c.REALIZE_TIME_BUDGET
+        while stack and time.perf_counter() < end:
+            entry = stack[-1]
+            container, field_indices, i = entry
+            if (container.node is None or container.tag_window is not self
+                    or container.virtual_field_indices is not field_indices):
+                # released, destroyed or repopulated since being queued
+                stack.pop()
+                continue
+            elif i >= len(field_indices):
+                stack.pop()
+                container.finish_realizing()
+                continue
+
+            entry[2] += 1
+            try:
+                if container.realize_field(field_indices[i]) is not None:
+                    self._realized_count += 1
+            except Exception:
+                print(format_exc())
+
+        if stack:
+            self.update_realize_progress()
+            self._realize_pending = True
+            self.after_idle(self.realize_widgets)
+        else:
+            self.finish_realizing()
+
+    def update_realize_progress(self):
+        '''Shows how many of the planned widgets have been built.'''
+        try:
+            total = max(1, self.layout_plan.widget_count)
+        except AttributeError:
+            total = max(1, self._realized_count)
+
+        percent = min(99, (100 * self._realized_count) // total)
+        self.creating_label.config(
+            text="Creating widgets... %s%%" % percent)
+        if not self.creating_label.winfo_manager():
+            self.creating_label.pack(side=t_c.BOTTOM, fill='x')
+
+    def finish_realizing(self):
+        if self.layout_plan is not None:
+            self.layout_plan.cancel()
+
+        self._realizing = False
+        self.layout_plan = None
+        if self.creating_label.winfo_manager():
+            self.creating_label.pack_forget()
+        self.creating_label.config(text="Creating widgets. Please wait...")
 
     def reload(self, e=None):
         self.field_widget.reload()
 
+    def load_tag(self, tag, app_root=None, is_new_tag=False):
+        '''
+        Rebinds this TagWindow and its FieldWidgets to display the given tag.
+        Meant for reusing a window that displayed a tag of the same definition.
+        '''
+        if app_root is not None:
+            self.app_root = app_root
+
+        self.tag = tag
+        self.tag_def = tag.definition
+        self.is_new_tag = is_new_tag
+        self.resize_declined = False
+        self._last_saved_edit_index = 0
+
+        try:
+            max_undos = self.app_root.max_undos
+        except AttributeError:
+            max_undos = 100
+
+        self.edit_manager = EditManager(max_undos)
+        self.dyn_name_cache.clear()
+        self.dirty_widgets.clear()
+
+        root_block = tag.data
+        if (self.field_widget is None or
+            self.field_widget.load_node_data(None, root_block, None)):
+            self.populate()
+        else:
+            self.field_widget.reload()
+
+        # if this tag doesnt exist at the given filepath, it's new.
+        try:
+            new = not self.tag.filepath.is_file()
+        except Exception:
+            new = True
+
+        self.field_widget.set_edited(new)
+        self.update_title()
+        self.deiconify()
+        if self.virtualize_widgets:
+            self.schedule_virtual_view_update()
+
+    def unload_tag(self):
+        '''
+        Withdraws this TagWindow and unloads the tag it is displaying
+        so the window can be kept around to display another tag later.
+        '''
+        self.withdraw()
+        self.tag = None
+        self.edit_manager = None
+        self.dyn_name_cache.clear()
+        self.dirty_widgets.clear()
+        self.cancel_realizing()
+        if self.field_widget is not None:
+            self.field_widget.unload_node_data()
+
     def select_window(self, e):
         '''Makes this windows tag the selected tag in self.app_root'''
         if self.app_root:
@@ -784,6 +1107,9 @@ def edit_undo(self, e=None):
         try:
             state = self.edit_manager.undo()
             if state is not None:
+                # invalidated first so the edit can patch the names
+                # of an array it only added to, removed from or moved
+                self.invalidate_dyn_names(state.nodepath)
                 state.apply_func(edit_state=state, undo=True)
             self._applying_edit_state = False
 
@@ -813,6 +1139,9 @@ def edit_redo(self, e=None):
         try:
             state = self.edit_manager.redo()
             if state is not None:
+                # invalidated first so the edit can patch the names
+                # of an array it only added to, removed from or moved
+                self.invalidate_dyn_names(state.nodepath)
                 state.apply_func(edit_state=state, undo=False)
             self._applying_edit_state = False
 
@@ -828,7 +1157,11 @@ def edit_redo(self, e=None):
     def edit_state_add(self, edit_state):
         if self.edit_manager is None: return
         # make this a separate check to make it more likely to hold
-        if self._applying_edit_state: return
+        if self._applying_edit_state:
+            # the edit isn't added to the history, but it can
+            # still change what the cached dynamic names resolve to
+            self.invalidate_dyn_names(edit_state.nodepath, False)
+            return
         self._applying_edit_state = True
         try:
             em = self.edit_manager
@@ -863,6 +1196,9 @@ def edit_state_add(self, edit_state):
                         self.resize_declined = True
 
             em.add_state(edit_state)
+            self.invalidate_dyn_names(edit_state.nodepath)
+            # the edit may have changed what the plan was made from
+            self.layout_plan = None
             self._applying_edit_state = False
             self.title(self.title())
         except Exception:
@@ -876,6 +1212,7 @@ def edit_clear(self):
         self._applying_edit_state = True
         try:
             self.edit_manager.clear()
+            self.dyn_name_cache.clear()
             self.resize_declined = False
             self._applying_edit_state = False
             self.title(self.title())
@@ -883,6 +1220,29 @@ def edit_clear(self):
             self._applying_edit_state = False
             raise
 
+    def invalidate_dyn_names(self, nodepath, set_aside=True):
+        '''
+        Drops any dynamic names cached for the nodes along the nodepath,
+        since an edit to any of them may have changed what they resolve to.
+        Names whose DYN_NAME_PATH can lead outside the array element they
+        name are dropped no matter which nodes were edited. If set_aside is
+        False, the names set aside by the last invalidation are kept so the
+        edit being applied can still patch them. See DynNameCache.invalidate
+        '''
+        nodes = []
+        try:
+            node = self.tag.data
+            nodes.append(node)
+            for attr_index in nodepath:
+                node = node[attr_index]
+                nodes.append(node)
+        except Exception:
+            # couldn't follow the path, so there's no telling what changed
+            self.dyn_name_cache.clear()
+            return
+
+        self.dyn_name_cache.invalidate(nodes, set_aside)
+
     def edit_resize(self, maxlen):
         if self.edit_manager is None: return
         # make this a separate check to make it more likely to hold
@@ -0,0 +1,47 @@
+import array
+import unittest
+
+from binilla.widgets import bitmap_display_frame
+from binilla.widgets.bitmap_display_frame import PhotoImageHandler,\
+     get_callable_key
+
+arbytmap_imported = bitmap_display_frame.import_arbytmap()
+
+
+def make_handler(**tex_info):
+    ab = bitmap_display_frame.arbytmap
+    tex_info.update(width=4, height=4, depth=1, format=ab.FORMAT_A8R8G8B8,
+                    texture_type=ab.TYPE_2D, mipmap_count=0,
+                    sub_bitmap_count=1, packed=True)
+    return PhotoImageHandler([array.array("I", range(16))], tex_info)
+
+
+class TestCallableKey(unittest.TestCase):
+    def test_lambdas_with_different_code(self):
+        self.assertNotEqual(get_callable_key(lambda w: w*4),
+                            get_callable_key(lambda w: w*2))
+        self.assertEqual(get_callable_key(lambda w: w*4),
+                         get_callable_key(lambda w: w*4))
+
+    def test_closures_are_unkeyable(self):
+        scale = 4
+        self.assertIsNone(get_callable_key(lambda w: w*scale))
+        self.assertIsNone(get_callable_key(len))
+
+
+@unittest.skipUnless(arbytmap_imported, "arbytmap isn't installed")
+class TestTextureHash(unittest.TestCase):
+    def test_packed_calcs_change_hash(self):
+        hash_a = make_handler(packed_width_calc=lambda w, *a: w*4).texture_hash
+        hash_b = make_handler(packed_width_calc=lambda w, *a: w*2).texture_hash
+        self.assertIsNotNone(hash_a)
+        self.assertNotEqual(hash_a, hash_b)
+
+    def test_closure_calcs_arent_hashed(self):
+        scale = 4
+        handler = make_handler(packed_width_calc=lambda w, *a: w*scale)
+        self.assertIsNone(handler.texture_hash)
+
+
+if __name__ == "__main__":
+    unittest.main()
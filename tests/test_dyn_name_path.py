@@ -0,0 +1,90 @@
+import unittest
+
+from supyr_struct.defs.block_def import BlockDef
+from supyr_struct.field_types import Struct, Array, UInt32, StrAscii
+
+from binilla import dyn_name_path, editor_constants as e_c
+from binilla.dyn_name_path import DynNameCache, compile_dyn_name_path
+
+
+test_def = BlockDef("test",
+    StrAscii("label", SIZE=8),
+    UInt32("element_count"),
+    Array("array", SIZE=".element_count",
+        SUB_STRUCT=Struct("element", UInt32("number"), StrAscii("name", SIZE=8))
+        ),
+    )
+
+
+def make_block():
+    block = test_def.build()
+    block.label = "old"
+    block.array.extend(3)
+    for i, element in enumerate(block.array):
+        element.number = i
+        element.name = "elem %d" % i
+    return block
+
+
+class TestDynNamePath(unittest.TestCase):
+    def test_element_relative(self):
+        self.assertTrue(compile_dyn_name_path(".name").element_relative)
+        self.assertTrue(compile_dyn_name_path(".name..number").element_relative)
+        self.assertFalse(compile_dyn_name_path("..[0].name").element_relative)
+        self.assertFalse(compile_dyn_name_path("...label").element_relative)
+        self.assertFalse(compile_dyn_name_path("label").element_relative)
+
+    def test_compiled_paths_are_capped(self):
+        for i in range(e_c.MAX_COMPILED_DYN_NAME_PATHS + 10):
+            compile_dyn_name_path(".name%d" % i)
+        self.assertLessEqual(len(dyn_name_path._compiled_paths),
+                             e_c.MAX_COMPILED_DYN_NAME_PATHS)
+
+
+class TestDynNameCache(unittest.TestCase):
+    def setUp(self):
+        self.block = make_block()
+        self.cache = DynNameCache()
+
+    def test_relative_names_kept_after_unrelated_edit(self):
+        names = self.cache.get_names(self.block.array, ".name")
+        self.cache.invalidate([self.block])
+        self.assertIs(self.cache.get_names(self.block.array, ".name"), names)
+
+    def test_names_outside_element_regenerated_after_any_edit(self):
+        array = self.block.array
+        self.assertEqual(self.cache.get_names(array, "...label"),
+                         ["old"] * 3)
+        self.assertEqual(self.cache.get_names(array, "..[0].name"),
+                         ["elem 0"] * 3)
+
+        self.block.label = "new"
+        array[0].name = "first"
+        # the edited nodes aren't the array or any node above it
+        self.cache.invalidate([array[0]])
+        self.assertEqual(self.cache.get_names(array, "...label"),
+                         ["new"] * 3)
+        self.assertEqual(self.cache.get_names(array, "..[0].name"),
+                         ["first"] * 3)
+
+    def test_patch_after_nested_invalidation(self):
+        array = self.block.array
+        self.cache.get_names(array, ".name")
+        self.cache.invalidate([self.block, array])
+
+        # an edit made while the first one is being applied
+        self.cache.invalidate([self.block, array[1]], set_aside=False)
+        array.insert(0)
+        array[0].name = "added"
+        self.assertTrue(self.cache.patch_names(array, ".name", "insert", 0))
+        self.assertEqual(self.cache.get_names(array, ".name"),
+                         ["added", "elem 0", "elem 1", "elem 2"])
+
+        # an edit to the array itself drops the names that were set aside
+        self.cache.invalidate([self.block, array])
+        self.cache.invalidate([self.block, array], set_aside=False)
+        self.assertFalse(self.cache.patch_names(array, ".name", "delete", 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
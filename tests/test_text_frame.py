@@ -0,0 +1,116 @@
+import unittest
+
+from supyr_struct.field_types import StrUtf8
+
+from binilla import editor_constants as e_c
+from binilla.widgets.field_widgets.text_frame import TextFrame,\
+     get_text_escaper
+
+
+class FakeText:
+    def __init__(self):
+        self.text = ""
+
+    def __bool__(self):
+        return True
+
+    def config(self, **kwargs):
+        pass
+
+    def insert(self, index, text):
+        if index == 1.0:
+            self.text = text + self.text
+        else:
+            self.text += text
+
+    def delete(self, start, end):
+        self.text = ""
+
+    def edit_reset(self):
+        pass
+
+    def edit_modified(self, modified=None):
+        return False
+
+
+class FakeWidget:
+    def pack(self, **kwargs):
+        pass
+
+    def pack_forget(self):
+        pass
+
+    def config(self, **kwargs):
+        pass
+
+
+class PreviewingTextFrame(TextFrame):
+    preview_large_text = True
+    show_sidetips = False
+    disabled = False
+
+    def after_idle(self, func):
+        # queue the chunk inserts so the tests can run them
+        self._pending_jobs.append(func)
+        return len(self._pending_jobs)
+
+    def after_cancel(self, job_id):
+        pass
+
+
+def make_text_frame(text):
+    desc = {'TYPE': StrUtf8, 'NAME': 'text'}
+    frame = PreviewingTextFrame.__new__(PreviewingTextFrame)
+    frame._pending_jobs = []
+    frame._desc = desc
+    frame.node = text
+    frame.text_escaper = get_text_escaper(desc)
+    frame.data_text = FakeText()
+    frame.preview_button = FakeWidget()
+    frame.sidetip_label = frame.title_label = frame.content = FakeWidget()
+    frame.hsb = FakeWidget()
+    return frame
+
+
+def run_jobs(frame):
+    while frame._pending_jobs:
+        frame._pending_jobs.pop(0)()
+
+
+class TestTextFramePreview(unittest.TestCase):
+    def setUp(self):
+        self.text = "a" * (e_c.TEXT_PREVIEW_THRESHOLD + 1)
+
+    def test_large_text_is_previewed(self):
+        frame = make_text_frame(self.text)
+        frame.reload()
+        self.assertTrue(frame.is_preview)
+        self.assertLess(len(frame.data_text.text), len(self.text))
+
+    def test_load_full_text_stays_loaded(self):
+        frame = make_text_frame(self.text)
+        frame.reload()
+        frame.load_full_text()
+        run_jobs(frame)
+        self.assertFalse(frame.is_preview)
+        self.assertEqual(frame.data_text.text, self.text)
+
+        # reloading the same node shouldn't go back to the preview
+        frame.reload()
+        run_jobs(frame)
+        self.assertFalse(frame.is_preview)
+        self.assertEqual(frame.data_text.text, self.text)
+
+    def test_new_node_data_is_previewed_again(self):
+        frame = make_text_frame(self.text)
+        frame.reload()
+        frame.load_full_text()
+        run_jobs(frame)
+
+        frame.load_node_data(None, self.text + "b", None, frame._desc)
+        frame.reload()
+        self.assertTrue(frame.is_preview)
+
+
+if __name__ == "__main__":
+    unittest.main()